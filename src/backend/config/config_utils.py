@@ -53,6 +53,30 @@ _CONFIG_KEYS: tuple[str, ...] = (
     "RSP_SMTP_SENDER",
     "RSP_SMTP_PASSWORD",
     "RSP_MODERATOR_EMAILS",
+    "RSP_AUTH_CACHE_TTL_SECONDS",
+    "RSP_AUTH_CACHE_MAX_ENTRIES",
+    "RSP_TOKEN_REVOCATION_BACKEND",
+    "RSP_ARGON2_TIME_COST",
+    "RSP_ARGON2_MEMORY_COST",
+    "RSP_ARGON2_PARALLELISM",
+    "RSP_PASSWORD_HASH_WORKERS",
+    "RSP_PASSWORD_HASH_MAX_QUEUE",
+    "RSP_SMTP_STARTTLS",
+    "RSP_EMAIL_OUTBOX_INTERVAL_SECONDS",
+    "RSP_EMAIL_MAX_ATTEMPTS",
+    "RSP_EMAIL_RETRY_BASE_SECONDS",
+    "RSP_DB_POOL_SIZE",
+    "RSP_DB_POOL_MAX_OVERFLOW",
+    "RSP_DB_POOL_TIMEOUT_SECONDS",
+    "RSP_DB_POOL_RECYCLE_SECONDS",
+    "RSP_DB_POOL_PRE_PING",
+    "RSP_RESPONSE_CACHE_BACKEND",
+    "RSP_RESPONSE_CACHE_TTL_SECONDS",
+    "RSP_RESPONSE_CACHE_MAX_ENTRIES",
+    "RSP_ATTACHMENT_MAX_BYTES",
+    "RSP_ATTACHMENT_GC_INTERVAL_MINUTES",
+    "RSP_ATTACHMENT_GC_GRACE_HOURS",
+    "RSP_ATTACHMENT_ACCEL_REDIRECT_PREFIX",
 )
 
 _REQUIRED_KEYS: tuple[str, ...] = (
@@ -87,6 +111,25 @@ def read_config(*, default: dict[str, Any] | None = None, required: bool = True)
             "RSP_TOKEN_EMAIL_EXPIRE_MINUTES",
             "RSP_SCHED_DELETE_EXPIRED_USERS_INTERVAL_MINUTES",
             "RSP_SMTP_PORT",
+            "RSP_AUTH_CACHE_TTL_SECONDS",
+            "RSP_AUTH_CACHE_MAX_ENTRIES",
+            "RSP_ARGON2_TIME_COST",
+            "RSP_ARGON2_MEMORY_COST",
+            "RSP_ARGON2_PARALLELISM",
+            "RSP_PASSWORD_HASH_WORKERS",
+            "RSP_PASSWORD_HASH_MAX_QUEUE",
+            "RSP_EMAIL_OUTBOX_INTERVAL_SECONDS",
+            "RSP_EMAIL_MAX_ATTEMPTS",
+            "RSP_EMAIL_RETRY_BASE_SECONDS",
+            "RSP_DB_POOL_SIZE",
+            "RSP_DB_POOL_MAX_OVERFLOW",
+            "RSP_DB_POOL_TIMEOUT_SECONDS",
+            "RSP_DB_POOL_RECYCLE_SECONDS",
+            "RSP_RESPONSE_CACHE_TTL_SECONDS",
+            "RSP_RESPONSE_CACHE_MAX_ENTRIES",
+            "RSP_ATTACHMENT_MAX_BYTES",
+            "RSP_ATTACHMENT_GC_INTERVAL_MINUTES",
+            "RSP_ATTACHMENT_GC_GRACE_HOURS",
         ):
             value = _env_int(key)
         elif key == "RSP_MODERATOR_EMAILS":
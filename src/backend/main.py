@@ -1,13 +1,28 @@
+import asyncio
+import ipaddress
+import json
+import math
 import os
 import time
-import asyncio
-from collections import defaultdict, deque
-from fastapi import FastAPI, Request
+from typing import Annotated
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
-from src.backend.services import user_service, post_service, review_service, report_service
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from src.backend.services import (
+    attachment_store,
+    user_service,
+    post_service,
+    review_service,
+    report_service,
+    response_cache,
+    revisions,
+)
+from src.backend.services.change_feed import RESYNC, ChangeEvent, broker as change_broker
 from src.backend.services.paths import ATTACHMENTS_DIR
+from src.backend.services.rate_limit import DatabaseRateLimiter, GCRARateLimiter
+from src.database.db import get_db, pool_stats
 
 app = FastAPI(title="Research Showcase Portal API")
 
@@ -16,53 +31,113 @@ BACK_PORT = 8000
 FRONT_PORT = 3000
 RATE_LIMIT_MAX_REQUESTS = int(os.getenv("RSP_RATE_LIMIT_MAX", "180"))
 RATE_LIMIT_WINDOW_SECONDS = int(os.getenv("RSP_RATE_LIMIT_WINDOW_SECONDS", "60"))
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RSP_RATE_LIMIT_MAX_CLIENTS", "100000"))
+RATE_LIMIT_BACKEND = os.getenv("RSP_RATE_LIMIT_BACKEND", "memory").strip().lower()
+# Reverse proxies (IPs or CIDRs, comma-separated) whose X-Forwarded-For is believed; none by default.
+TRUSTED_PROXIES = tuple(
+    ipaddress.ip_network(proxy.strip(), strict=False)
+    for proxy in os.getenv("RSP_TRUSTED_PROXIES", "").split(",")
+    if proxy.strip()
+)
+EVENTS_HEARTBEAT_SECONDS = 15
+EVENTS_RETRY_MILLISECONDS = 3000
+ATTACHMENT_UPLOAD_PATH = "/posts/attachments/upload"
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def _rate_limit_session():
+    return next(get_db())
+
+
+def _build_rate_limiter() -> GCRARateLimiter | DatabaseRateLimiter:
+    if RATE_LIMIT_BACKEND == "database":
+        return DatabaseRateLimiter(
+            RATE_LIMIT_MAX_REQUESTS,
+            RATE_LIMIT_WINDOW_SECONDS,
+            _rate_limit_session,
+        )
+    if RATE_LIMIT_BACKEND != "memory":
+        raise ValueError(
+            f"Unknown RSP_RATE_LIMIT_BACKEND '{RATE_LIMIT_BACKEND}' (expected 'memory' or 'database')"
+        )
+    return GCRARateLimiter(
+        RATE_LIMIT_MAX_REQUESTS,
+        RATE_LIMIT_WINDOW_SECONDS,
+        max_clients=RATE_LIMIT_MAX_CLIENTS,
+    )
+
 
-_rate_limit_lock = asyncio.Lock()
-_rate_limit_buckets: dict[str, deque[float]] = defaultdict(deque)
+_rate_limiter = _build_rate_limiter()
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
 
 
 def _get_client_ip(request: Request) -> str:
-    forwarded_for = request.headers.get("x-forwarded-for")
-    if forwarded_for:
-        return forwarded_for.split(",")[0].strip()
-    if request.client:
-        return request.client.host
-    return "unknown"
+    """
+    The address the rate limiter keys on.
+
+    That is the TCP peer, unless the peer is a trusted proxy. Then it is the
+    right-most X-Forwarded-For hop that no trusted proxy added: everything to
+    its left was written by the client and can say anything.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted_proxy(peer):
+        return peer
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
 
 
 @app.middleware("http")
 async def rate_limit_middleware(request: Request, call_next):
-    now = time.time()
     ip = _get_client_ip(request)
-    async with _rate_limit_lock:
-        bucket = _rate_limit_buckets[ip]
-        window_start = now - RATE_LIMIT_WINDOW_SECONDS
-        while bucket and bucket[0] < window_start:
-            bucket.popleft()
-        if len(bucket) >= RATE_LIMIT_MAX_REQUESTS:
-            retry_after = int(bucket[0] + RATE_LIMIT_WINDOW_SECONDS - now) + 1
-            headers = {
-                "Retry-After": str(max(retry_after, 1)),
-                "X-RateLimit-Limit": str(RATE_LIMIT_MAX_REQUESTS),
-                "X-RateLimit-Remaining": "0",
-                "X-RateLimit-Reset": str(int(bucket[0] + RATE_LIMIT_WINDOW_SECONDS)),
-            }
-            return JSONResponse(
-                status_code=429,
-                content={"detail": "Rate limit exceeded. Try again later."},
-                headers=headers,
-            )
+    if _rate_limiter.runs_in_threadpool:
+        decision = await run_in_threadpool(_rate_limiter.hit, ip)
+    else:
+        decision = _rate_limiter.hit(ip)
+    reset_at = str(int(time.time() + decision.reset_after))
 
-        bucket.append(now)
-        remaining = max(RATE_LIMIT_MAX_REQUESTS - len(bucket), 0)
-        reset_at = int(bucket[0] + RATE_LIMIT_WINDOW_SECONDS)
+    if not decision.allowed:
+        headers = {
+            "Retry-After": str(max(math.ceil(decision.retry_after), 1)),
+            "X-RateLimit-Limit": str(decision.limit),
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": reset_at,
+        }
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Rate limit exceeded. Try again later."},
+            headers=headers,
+        )
 
     response = await call_next(request)
-    response.headers["X-RateLimit-Limit"] = str(RATE_LIMIT_MAX_REQUESTS)
-    response.headers["X-RateLimit-Remaining"] = str(remaining)
-    response.headers["X-RateLimit-Reset"] = str(reset_at)
+    response.headers["X-RateLimit-Limit"] = str(decision.limit)
+    response.headers["X-RateLimit-Remaining"] = str(decision.remaining)
+    response.headers["X-RateLimit-Reset"] = reset_at
     return response
 
+
+@app.middleware("http")
+async def upload_size_limit_middleware(request: Request, call_next):
+    # Refuse uploads that announce an oversized body before the multipart parser spools them to disk.
+    if request.method == "POST" and request.url.path == ATTACHMENT_UPLOAD_PATH:
+        declared = request.headers.get("content-length", "")
+        limit = attachment_store.MAX_ATTACHMENT_BYTES + MULTIPART_OVERHEAD_BYTES
+        if declared.isdigit() and int(declared) > limit:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"Attachments are limited to {attachment_store.MAX_ATTACHMENT_BYTES} bytes."},
+            )
+    return await call_next(request)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -73,21 +148,149 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[post_service.NEXT_CURSOR_HEADER],
 )
 app.include_router(user_service.router, prefix="/users")
 app.include_router(post_service.router, prefix="/posts")
 app.include_router(review_service.router)
 app.include_router(report_service.router, prefix="/reports")
-app.mount("/attachments", StaticFiles(directory=ATTACHMENTS_DIR), name="attachments")
+
+
+class AttachmentFileResponse(FileResponse):
+    # Larger reads for multi-megabyte PDFs when the server cannot take the file via `pathsend`.
+    chunk_size = attachment_store.CHUNK_SIZE
+
+
+@app.api_route("/attachments/{name}", methods=["GET", "HEAD"])
+def serve_attachment(
+    name: str,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """
+    Serve an attachment by public name; content-addressed names resolve to
+    their shared blob. Names never change content, so responses are immutable
+    with a strong ETag. Range requests get 206 from `FileResponse`, which also
+    hands the file to the server via `pathsend` when the server supports it.
+    With `RSP_ATTACHMENT_ACCEL_REDIRECT_PREFIX` set, the front proxy sends the
+    file instead.
+    """
+    path = attachment_store.resolve(ATTACHMENTS_DIR, name)
+    try:
+        stat_result = path.stat() if path is not None else None
+    except FileNotFoundError:
+        stat_result = None
+    if stat_result is None:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+
+    headers = {
+        "ETag": attachment_store.strong_etag(name, stat_result),
+        "Cache-Control": attachment_store.IMMUTABLE_CACHE_CONTROL,
+        "X-Content-Type-Options": "nosniff",
+    }
+    if revisions.etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    media_type = attachment_store.guess_mime_type(name)
+    if attachment_store.ACCEL_REDIRECT_PREFIX:
+        headers["X-Accel-Redirect"] = attachment_store.accel_redirect_path(
+            attachment_store.ACCEL_REDIRECT_PREFIX, ATTACHMENTS_DIR, path
+        )
+        return Response(headers=headers, media_type=media_type)
+    return AttachmentFileResponse(
+        path,
+        stat_result=stat_result,
+        media_type=media_type,
+        headers=headers,
+        filename=attachment_store.display_name(name),
+        content_disposition_type="inline",
+    )
+
+
+@app.exception_handler(PoolTimeoutError)
+async def _database_pool_exhausted(_request: Request, _exc: PoolTimeoutError) -> JSONResponse:
+    # Every connection stayed checked out for the whole pool timeout; shed load instead of a 500.
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy. Please try again shortly."},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.get("/metrics")
+def read_metrics() -> dict:
+    return {
+        "auth_cache": user_service.auth_cache_stats(),
+        "password_hashing": user_service.password_hashing_stats(),
+        "database_pool": pool_stats(),
+        "change_feed": change_broker.stats(),
+        "response_cache": response_cache.cache.stats(),
+        "attachment_gc": user_service.attachment_gc_stats(),
+    }
+
+
+def _sse_message(change: ChangeEvent) -> str:
+    if change is RESYNC:
+        return "event: resync\ndata: {}\n\n"
+    return f"id: {change.id}\nevent: change\ndata: {json.dumps(change.as_dict())}\n\n"
+
+
+@app.get("/events")
+async def stream_changes(
+    request: Request,
+    post_id: int | None = None,
+    last_event_id: str | None = Header(default=None),
+) -> StreamingResponse:
+    """
+    Server-Sent Events: one `change` event per committed post, comment, vote,
+    review or report change (optionally only for `post_id`). A reconnecting
+    client sends `Last-Event-ID` and gets what it missed, or a `resync` event
+    if that is no longer known.
+    """
+    subscription = change_broker.subscribe(post_id)
+    missed: list[ChangeEvent] | None = []
+    if last_event_id and last_event_id.isdigit():
+        missed = change_broker.replay(int(last_event_id), post_id)
+
+    async def stream():
+        try:
+            yield f"retry: {EVENTS_RETRY_MILLISECONDS}\n\n"
+            replayed_up_to = 0
+            if missed is None:
+                yield _sse_message(RESYNC)
+            else:
+                for change in missed:
+                    yield _sse_message(change)
+                    replayed_up_to = change.id
+            while not await request.is_disconnected():
+                try:
+                    change = await asyncio.wait_for(subscription.get(), EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                # Published between subscribing and replaying: already sent from the history.
+                if change is not RESYNC and change.id <= replayed_up_to:
+                    continue
+                yield _sse_message(change)
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.on_event("startup")
 def _start_background_scheduler() -> None:
     user_service.start_cleanup_scheduler()
+    user_service.start_email_outbox_worker()
+    user_service.start_attachment_gc()
 
 
 @app.on_event("shutdown")
 def _stop_background_scheduler() -> None:
+    user_service.stop_attachment_gc()
+    user_service.stop_email_outbox_worker()
     user_service.stop_cleanup_scheduler()
 
 
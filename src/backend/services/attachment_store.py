@@ -0,0 +1,350 @@
+"""Streaming, content-addressed storage for uploaded attachments.
+
+Uploads are copied in fixed-size chunks into a temporary file, hashed on the
+way, and renamed into place only once complete, so memory use does not grow
+with the file and readers never see a partial file. Disk writes run on the
+threadpool, never on the event loop.
+
+Files are stored once per content, as `<root>/ab/cd/<sha256>`. The two
+shard levels keep each directory small. Public names are
+`<stem>__<sha256><ext>`: the stem and extension are only for display and
+content type, and the digest selects the blob. Uploading the same bytes again
+only adds a name. A blob's references are the `attachments` rows with its
+`sha256`.
+
+Files nothing references any more (deleted posts, uploads never attached to a
+post, temp files of interrupted uploads) are removed by `sweep_orphans` once
+they are older than a grace period.
+
+A name's bytes never change, so downloads are cacheable for good: the
+digest doubles as a strong ETag, and a front proxy can be told to send the
+blob itself via `X-Accel-Redirect`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Protocol
+from urllib.parse import urlparse
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.backend.config.config_utils import read_config
+from src.database import models
+
+ATTACHMENT_PREFIX = "/attachments/"
+CHUNK_SIZE = 1024 * 1024
+_TEMP_PREFIX = ".upload-"
+_TEMP_SUFFIX = ".part"
+_PUBLIC_NAME_DIGEST = re.compile(r"__([0-9a-f]{64})(?:\.[^./]*)?$")
+_SHARD = re.compile(r"^[0-9a-f]{2}$")
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+SWEEP_BATCH_SIZE = 500
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+cfg = read_config(required=False)
+MAX_ATTACHMENT_BYTES = int(cfg.get("RSP_ATTACHMENT_MAX_BYTES", 50 * 1024 * 1024))
+ACCEL_REDIRECT_PREFIX = (cfg.get("RSP_ATTACHMENT_ACCEL_REDIRECT_PREFIX") or "").rstrip("/")
+
+
+class AsyncReadable(Protocol):
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+class AttachmentTooLarge(ValueError):
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__(f"Attachment exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+class EmptyAttachment(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    path: Path
+    size: int
+    sha256: str
+    deduplicated: bool
+
+
+def guess_mime_type(name: str) -> str:
+    guessed_mime_type, _ = mimetypes.guess_type(name)
+    return guessed_mime_type or "application/octet-stream"
+
+
+def normalize_reference(raw_value: str | None) -> str | None:
+    """The `/attachments/<name>` path a client-supplied attachment value refers to, or None if it names none."""
+    if not raw_value:
+        return None
+
+    candidate = raw_value.strip()
+    if not candidate:
+        return None
+
+    if candidate.startswith("{") and candidate.endswith("}"):
+        target_from_dict: str | None = None
+        try:
+            parsed_json = json.loads(candidate)
+            if isinstance(parsed_json, dict):
+                for key in ("file_path", "path"):
+                    value = parsed_json.get(key)
+                    if isinstance(value, str) and value.strip():
+                        target_from_dict = value.strip()
+                        break
+        except json.JSONDecodeError:
+            target_from_dict = None
+
+        if target_from_dict:
+            candidate = target_from_dict
+
+    try:
+        parsed = urlparse(candidate)
+        candidate = parsed.path or candidate
+    except ValueError:
+        pass
+
+    normalized = candidate.replace("\\", "/")
+    if normalized.startswith(ATTACHMENT_PREFIX):
+        return normalized
+
+    parts = [segment for segment in normalized.split("/") if segment]
+    if not parts:
+        return None
+
+    return f"{ATTACHMENT_PREFIX}{parts[-1]}"
+
+
+def blob_path(root: Path, sha256: str) -> Path:
+    return root / sha256[:2] / sha256[2:4] / sha256
+
+
+def digest_of(name: str) -> str | None:
+    """The content digest in a public attachment name, or None for names from before content addressing."""
+    match = _PUBLIC_NAME_DIGEST.search(name)
+    return match.group(1) if match else None
+
+
+def resolve(root: Path, name: str) -> Path | None:
+    """The file behind public name `name`, or None if there is none."""
+    if not name or "/" in name or "\\" in name or name.startswith("."):
+        return None
+    digest = digest_of(name)
+    path = blob_path(root, digest) if digest else root / name
+    return path if path.is_file() else None
+
+
+def strong_etag(name: str, stat_result: os.stat_result) -> str:
+    """The digest for content-addressed names; size and mtime for legacy files, which are never rewritten either."""
+    digest = digest_of(name)
+    if digest:
+        return f'"{digest}"'
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def display_name(name: str) -> str:
+    """The filename offered on download: `paper__<id>.pdf` becomes `paper.pdf`."""
+    stem, separator, rest = name.rpartition("__")
+    if not separator or not stem:
+        return name
+    return stem + Path(rest).suffix
+
+
+def accel_redirect_path(prefix: str, root: Path, path: Path) -> str:
+    """The proxy-internal URI of stored file `path` under the `X-Accel-Redirect` location `prefix`."""
+    return f"{prefix}/{path.relative_to(root).as_posix()}"
+
+
+def reference_counts(db: Session, digests: Iterable[str]) -> dict[str, int]:
+    """How many attachment rows use each blob; unreferenced digests are left out."""
+    digests = list(digests)
+    if not digests:
+        return {}
+    rows = db.execute(
+        select(models.Attachment.sha256, func.count(models.Attachment.id))
+        .where(models.Attachment.sha256.in_(digests))
+        .group_by(models.Attachment.sha256)
+    ).all()
+    return {digest: count for digest, count in rows}
+
+
+def _open_temp(directory: Path) -> tuple[Any, Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix=_TEMP_PREFIX, suffix=_TEMP_SUFFIX)
+    return os.fdopen(fd, "wb"), Path(temp_name)
+
+
+def _write_chunk(handle, digest, chunk: bytes) -> None:
+    digest.update(chunk)
+    handle.write(chunk)
+
+
+def _commit(handle, temp_path: Path, destination: Path) -> bool:
+    """Move the finished upload to `destination`; True if identical content was already there."""
+    if destination.is_file():
+        _discard(handle, temp_path)
+        # Restart the blob's grace period so the orphan sweep cannot take it before the post is saved.
+        os.utime(destination)
+        return True
+    handle.flush()
+    os.fsync(handle.fileno())
+    handle.close()
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(temp_path, destination)
+    return False
+
+
+def _discard(handle, temp_path: Path) -> None:
+    handle.close()
+    temp_path.unlink(missing_ok=True)
+
+
+async def store_upload(
+    upload: AsyncReadable,
+    root: Path,
+    *,
+    max_bytes: int = MAX_ATTACHMENT_BYTES,
+    chunk_size: int = CHUNK_SIZE,
+) -> StoredFile:
+    """
+    Stream `upload` into the content-addressed store under `root`. The blob
+    only appears once the whole file is written, and identical content is kept
+    once. Raises `AttachmentTooLarge` as soon as more than `max_bytes` arrive
+    and `EmptyAttachment` for a zero-byte upload; nothing is left on disk in
+    either case.
+    """
+    handle, temp_path = await run_in_threadpool(_open_temp, root)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        while chunk := await upload.read(chunk_size):
+            size += len(chunk)
+            if size > max_bytes:
+                raise AttachmentTooLarge(max_bytes)
+            await run_in_threadpool(_write_chunk, handle, digest, chunk)
+        if size == 0:
+            raise EmptyAttachment("Uploaded file is empty")
+        sha256 = digest.hexdigest()
+        destination = blob_path(root, sha256)
+        deduplicated = await run_in_threadpool(_commit, handle, temp_path, destination)
+    except BaseException:
+        await run_in_threadpool(_discard, handle, temp_path)
+        raise
+    return StoredFile(path=destination, size=size, sha256=sha256, deduplicated=deduplicated)
+
+
+@dataclass
+class SweepResult:
+    scanned: int = 0
+    deleted: int = 0
+    reclaimed_bytes: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {"scanned": self.scanned, "deleted": self.deleted, "reclaimed_bytes": self.reclaimed_bytes}
+
+
+@dataclass(frozen=True)
+class _Candidate:
+    path: Path
+    size: int
+    digest: str | None = None
+    legacy_path: str | None = None
+
+
+def _stored_files(root: Path) -> Iterator[tuple[os.DirEntry, str | None]]:
+    """Every file the store owns, as (entry, digest); digest is None for legacy and temp files."""
+    with os.scandir(root) as top:
+        for entry in top:
+            if entry.is_file(follow_symlinks=False):
+                yield entry, None
+            elif entry.is_dir(follow_symlinks=False) and _SHARD.match(entry.name):
+                with os.scandir(entry.path) as shards:
+                    for shard in shards:
+                        if not (shard.is_dir(follow_symlinks=False) and _SHARD.match(shard.name)):
+                            continue
+                        with os.scandir(shard.path) as blobs:
+                            for blob in blobs:
+                                if blob.is_file(follow_symlinks=False) and _DIGEST.match(blob.name):
+                                    yield blob, blob.name
+
+
+def _referenced(db: Session, batch: list[_Candidate]) -> tuple[set[str], set[str]]:
+    digests = {candidate.digest for candidate in batch if candidate.digest}
+    legacy_paths = {candidate.legacy_path for candidate in batch if candidate.legacy_path}
+    used_digests = set(reference_counts(db, digests))
+    used_paths: set[str] = set()
+    if legacy_paths:
+        used_paths = set(
+            db.scalars(
+                select(models.Attachment.file_path).where(models.Attachment.file_path.in_(legacy_paths))
+            )
+        )
+    return used_digests, used_paths
+
+
+def _delete_unreferenced(db: Session, batch: list[_Candidate], result: SweepResult) -> None:
+    used_digests, used_paths = _referenced(db, batch)
+    for candidate in batch:
+        if candidate.digest in used_digests or candidate.legacy_path in used_paths:
+            continue
+        try:
+            candidate.path.unlink()
+        except FileNotFoundError:
+            continue
+        result.deleted += 1
+        result.reclaimed_bytes += candidate.size
+
+
+def sweep_orphans(
+    db: Session,
+    root: Path,
+    *,
+    grace_seconds: float,
+    batch_size: int = SWEEP_BATCH_SIZE,
+    now: float | None = None,
+) -> SweepResult:
+    """
+    Delete stored files older than `grace_seconds` that no attachment row
+    references, plus leftover temp files of interrupted uploads.
+
+    The directory is walked lazily and references are looked up `batch_size`
+    files at a time, so neither the file list nor the attachments table is
+    ever held in memory as a whole.
+    """
+    result = SweepResult()
+    if not root.is_dir():
+        return result
+    cutoff = (time.time() if now is None else now) - grace_seconds
+    batch: list[_Candidate] = []
+    for entry, digest in _stored_files(root):
+        result.scanned += 1
+        stat = entry.stat(follow_symlinks=False)
+        if stat.st_mtime > cutoff:
+            continue
+        path = Path(entry.path)
+        if digest is None and entry.name.startswith(_TEMP_PREFIX) and entry.name.endswith(_TEMP_SUFFIX):
+            path.unlink(missing_ok=True)
+            result.deleted += 1
+            result.reclaimed_bytes += stat.st_size
+            continue
+        if digest is None and entry.name.startswith("."):
+            continue
+        legacy_path = None if digest else f"/attachments/{entry.name}"
+        batch.append(_Candidate(path, stat.st_size, digest, legacy_path))
+        if len(batch) >= batch_size:
+            _delete_unreferenced(db, batch, result)
+            batch = []
+    if batch:
+        _delete_unreferenced(db, batch, result)
+    return result
@@ -0,0 +1,139 @@
+"""Bounded TTL cache of authenticated principals, keyed by bearer token.
+
+An entry holds only the user's id and role and the token's revocation key,
+never a copy of the user row: password hashes, counters and profile fields
+stay in the database, and a handler that needs them loads the row.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable
+
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+
+@dataclass(frozen=True)
+class Principal:
+    user_id: int
+    role: Any
+    revocation_key: str
+
+    def attach(self, session: Session, model: type) -> Any:
+        """
+        A `model` instance bound to `session` without a SELECT.
+
+        Only the id and role are loaded; reading any other attribute loads the
+        row on first access.
+        """
+        stub = model(id=self.user_id, role=self.role)
+        make_transient_to_detached(stub)
+        return session.merge(stub, load=False)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    principal: Principal
+    expires_at: float
+
+
+class PrincipalCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._tokens_by_user: dict[int, set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, token: str) -> Principal | None:
+        """Return the cached principal for `token`, or None on a miss or expired entry."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= self._clock():
+                self._drop(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry.principal
+
+    def put(self, token: str, principal: Principal, *, token_expires_at: float | None = None) -> None:
+        if not self.enabled:
+            return
+        expires_at = self._clock() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        entry = _Entry(principal=principal, expires_at=expires_at)
+        with self._lock:
+            self._drop(token)
+            self._entries[token] = entry
+            self._tokens_by_user.setdefault(principal.user_id, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate_token(self, token: str) -> None:
+        with self._lock:
+            if self._drop(token):
+                self.invalidations += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._drop(token)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, token: str) -> bool:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return False
+        user_id = entry.principal.user_id
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+        return True
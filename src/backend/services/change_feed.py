@@ -0,0 +1,245 @@
+"""In-process change feed for posts, comments, votes, reviews and reports.
+
+Session commit hooks collect which posts were touched and publish one small
+event per (kind, action, post) to a `ChangeBroker`, which fans them out to
+Server-Sent Events subscribers on the event loop. Events say *what* changed,
+never the data itself, so clients refetch only when something did change.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from src.database import models
+
+SUBSCRIBER_QUEUE_SIZE = 64
+HISTORY_SIZE = 1024
+
+_PENDING_CHANGES_KEY = "_change_feed_pending"
+_PARENT_POST_IDS_KEY = "_change_feed_parent_post_ids"
+
+_KINDS: dict[type, str] = {
+    models.Post: "post",
+    models.Comment: "comment",
+    models.Review: "review",
+    models.Report: "report",
+    models.PostVote: "vote",
+    models.CommentVote: "vote",
+    models.ReviewVote: "vote",
+}
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    id: int
+    kind: str
+    action: str
+    post_id: int | None
+
+    def as_dict(self) -> dict:
+        return {"id": self.id, "kind": self.kind, "action": self.action, "post_id": self.post_id}
+
+
+RESYNC = ChangeEvent(id=0, kind="resync", action="resync", post_id=None)
+
+
+class Subscription:
+    """One client's bounded queue; on overflow it is replaced by a single resync marker."""
+
+    def __init__(self, broker: ChangeBroker, post_id: int | None) -> None:
+        self.broker = broker
+        self.post_id = post_id
+        self.queue: asyncio.Queue[ChangeEvent] = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def push(self, change: ChangeEvent) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            # A client this far behind refetches everything instead of replaying the backlog.
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self) -> ChangeEvent:
+        change = await self.queue.get()
+        if change is RESYNC:
+            self.overflowed = False
+        return change
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class ChangeBroker:
+    """
+    Thread-safe publish, event-loop fan-out.
+
+    `publish` may be called from threadpool handlers; it numbers the events,
+    keeps the last `history_size` for `Last-Event-ID` replay, and schedules a
+    single fan-out callback on the loop that owns the subscribers. Subscribers
+    are indexed by post id (`None` = everything), so a post-scoped event only
+    visits the subscribers that asked for that post.
+    """
+
+    def __init__(self, *, history_size: int = HISTORY_SIZE) -> None:
+        self._lock = threading.Lock()
+        self._history: deque[ChangeEvent] = deque(maxlen=history_size)
+        self._last_id = 0
+        self._subscribers: dict[int | None, set[Subscription]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.published = 0
+        self.delivered = 0
+
+    @property
+    def last_id(self) -> int:
+        with self._lock:
+            return self._last_id
+
+    def subscribe(self, post_id: int | None = None) -> Subscription:
+        """Must be called on the event loop that will consume the subscription."""
+        subscription = Subscription(self, post_id)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers.setdefault(post_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            bucket = self._subscribers.get(subscription.post_id)
+            if bucket is not None:
+                bucket.discard(subscription)
+                if not bucket:
+                    del self._subscribers[subscription.post_id]
+
+    def publish(self, changes: Iterable[tuple[str, str, int | None]]) -> list[ChangeEvent]:
+        with self._lock:
+            published = []
+            for kind, action, post_id in changes:
+                self._last_id += 1
+                change = ChangeEvent(self._last_id, kind, action, post_id)
+                self._history.append(change)
+                published.append(change)
+            self.published += len(published)
+            loop = self._loop if self._subscribers else None
+        if published and loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._fan_out, published)
+        return published
+
+    def replay(self, after_id: int, post_id: int | None = None) -> list[ChangeEvent] | None:
+        """Events newer than `after_id`, or None when some of them already fell out of the history."""
+        with self._lock:
+            if after_id >= self._last_id:
+                return []
+            oldest = self._history[0].id if self._history else self._last_id + 1
+            if after_id < oldest - 1:
+                return None
+            return [
+                change
+                for change in self._history
+                if change.id > after_id and _matches(change, post_id)
+            ]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "subscribers": sum(len(bucket) for bucket in self._subscribers.values()),
+                "published": self.published,
+                "delivered": self.delivered,
+                "last_id": self._last_id,
+            }
+
+    def _fan_out(self, changes: list[ChangeEvent]) -> None:
+        with self._lock:
+            everything = tuple(self._subscribers.get(None, ()))
+            scoped = {
+                change.post_id: tuple(self._subscribers.get(change.post_id, ()))
+                for change in changes
+                if change.post_id is not None
+            }
+        delivered = 0
+        for change in changes:
+            targets = everything + scoped.get(change.post_id, ()) if change.post_id is not None else everything
+            for subscription in targets:
+                subscription.push(change)
+            delivered += len(targets)
+        with self._lock:
+            self.delivered += delivered
+
+
+def _matches(change: ChangeEvent, post_id: int | None) -> bool:
+    return post_id is None or change.post_id == post_id
+
+
+broker = ChangeBroker()
+
+
+def post_id_of(session: Session, instance) -> int | None:
+    """The post a changed row belongs to (None for users' own rows and comment reports)."""
+    if isinstance(instance, models.Post):
+        return inspect(instance).dict.get("id")
+    if isinstance(instance, models.Report):
+        state = inspect(instance).dict
+        return state.get("target_id") if state.get("target_type") == "POST" else None
+    if isinstance(instance, models.CommentVote):
+        return _parent_post_id(session, models.Comment, inspect(instance).dict.get("comment_id"))
+    if isinstance(instance, models.ReviewVote):
+        return _parent_post_id(session, models.Review, inspect(instance).dict.get("review_id"))
+    return inspect(instance).dict.get("post_id")
+
+
+def _parent_post_id(session: Session, model, parent_id: int | None) -> int | None:
+    if parent_id is None:
+        return None
+    # Handlers usually load the comment/review before voting on it, so this is rarely more than a dict lookup.
+    parent = session.identity_map.get(inspect(model).identity_key_from_primary_key((parent_id,)))
+    if parent is not None and "post_id" in inspect(parent).dict:
+        return inspect(parent).dict["post_id"]
+    # Comments and reviews never move between posts, so a lookup holds for the session's lifetime.
+    known: dict[tuple[type, int], int | None] = session.info.setdefault(_PARENT_POST_IDS_KEY, {})
+    if (model, parent_id) not in known:
+        # A Core SELECT on the flush's connection: it cannot re-enter the ORM flush.
+        table = model.__table__
+        known[(model, parent_id)] = session.connection().scalar(
+            select(table.c.post_id).where(table.c.id == parent_id)
+        )
+    return known[(model, parent_id)]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, _flush_context) -> None:
+    pending: dict[tuple[str, str, int | None], None] = session.info.setdefault(_PENDING_CHANGES_KEY, {})
+    for action, instances in (
+        ("created", session.new),
+        ("updated", session.dirty),
+        ("deleted", session.deleted),
+    ):
+        for instance in instances:
+            kind = _KINDS.get(type(instance))
+            if kind is None:
+                continue
+            # Adding or withdrawing a vote is an update of the voted-on counters.
+            change_action = "updated" if kind == "vote" else action
+            pending[(kind, change_action, post_id_of(session, instance))] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_changes(session: Session) -> None:
+    pending = session.info.pop(_PENDING_CHANGES_KEY, None)
+    if pending:
+        broker.publish(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_changes(session: Session) -> None:
+    session.info.pop(_PENDING_CHANGES_KEY, None)
@@ -0,0 +1,103 @@
+"""Materialized paths for comment threads.
+
+Every comment stores its `ancestry` and its `depth`. The ancestry lists the
+ids of the comment's ancestors from the root down, each followed by "/": it
+is "" for a top-level comment and "12/34/" for a reply to comment 34 under 12.
+The depth is the number of ancestors.
+
+A comment's subtree is the comments of the same post whose ancestry starts
+with the comment's own ancestry plus "<id>/". Reading a subtree, counting
+descendants and deleting a thread are therefore single statements, whatever
+the depth of the thread.
+
+The ancestry depends only on the parent, so it is filled in when the comment
+is built (`child_fields`), before the comment has an id.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import String, and_, case, cast, func, select, update
+from sqlalchemy.orm import Session, aliased
+
+from src.database import models
+
+
+def child_fields(parent: models.Comment | None) -> dict:
+    """`ancestry` and `depth` for a new reply to `parent` (a top-level comment when None)."""
+    if parent is None:
+        return {"ancestry": "", "depth": 0}
+    return {"ancestry": subtree_prefix(parent), "depth": parent.depth + 1}
+
+
+def subtree_prefix(comment: models.Comment) -> str:
+    """The ancestry prefix shared by every descendant of `comment`."""
+    return f"{comment.ancestry}{comment.id}/"
+
+
+def in_subtree(comment: models.Comment):
+    """SQL condition matching the descendants of `comment`, not the comment itself."""
+    return and_(
+        models.Comment.post_id == comment.post_id,
+        models.Comment.ancestry.startswith(subtree_prefix(comment), autoescape=True),
+    )
+
+
+def descendant_counts(db: Session, comment_ids: Iterable[int]) -> dict[int, int]:
+    """How many comments sit anywhere below each of `comment_ids`; comments without replies are left out."""
+    comment_ids = list(comment_ids)
+    if not comment_ids:
+        return {}
+    root = aliased(models.Comment)
+    descendant = aliased(models.Comment)
+    prefix = root.ancestry + cast(root.id, String) + "/"
+    rows = db.execute(
+        select(root.id, func.count(descendant.id))
+        .join(
+            descendant,
+            and_(
+                descendant.post_id == root.post_id,
+                descendant.ancestry.like(prefix + "%"),
+            ),
+        )
+        .where(root.id.in_(comment_ids))
+        .group_by(root.id)
+    ).all()
+    return {comment_id: count for comment_id, count in rows}
+
+
+def backfill(db: Session) -> int:
+    """
+    Recompute `ancestry` and `depth` for every comment, one level of the
+    threads per UPDATE, starting from the top-level comments. Returns the
+    number of levels; run it once after adding the columns.
+    """
+    comments = models.Comment.__table__
+    parent = comments.alias("parent")
+    # depth = -1 marks replies whose path is not known yet.
+    db.execute(
+        update(comments)
+        .values(
+            ancestry="",
+            depth=case((comments.c.parent_comment_id.is_(None), 0), else_=-1),
+        )
+    )
+    levels = 0
+    while True:
+        parents_at_level = select(parent.c.id).where(parent.c.depth == levels)
+        result = db.execute(
+            update(comments)
+            .where(comments.c.depth == -1, comments.c.parent_comment_id.in_(parents_at_level))
+            .values(
+                ancestry=select(parent.c.ancestry + cast(parent.c.id, String) + "/")
+                .where(parent.c.id == comments.c.parent_comment_id)
+                .scalar_subquery(),
+                depth=levels + 1,
+            )
+        )
+        if not result.rowcount:
+            break
+        levels += 1
+    db.commit()
+    return levels
@@ -1,7 +1,9 @@
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 import logging
 from src.database import models
 from src.database.models import Comment, User
+from src.backend.services import comment_paths, vote_service
 from src.backend.services.schemas import CommentCreate, CommentRead
 from fastapi import HTTPException, APIRouter
 
@@ -42,6 +44,7 @@ def reply(db: Session, comment_id: int, reply_in: CommentCreate, user: User) ->
         post_id=parent_comment.post_id,
         commenter_id=user.id,
         parent_comment_id=parent_comment.id,
+        **comment_paths.child_fields(parent_comment),
     )
     db.add(new_reply)
     db.commit()
@@ -93,6 +96,9 @@ def delete_comment(db: Session, comment_id: int, user: User) -> None:
         raise HTTPException(
             status_code=403, detail="Not authorized to delete this comment")
 
+    vote_service.retract_reputation(
+        db, models.Comment, or_(models.Comment.id == comment_id, comment_paths.in_subtree(db_comment))
+    )
     db.delete(db_comment)
     db.commit()
 
@@ -0,0 +1,185 @@
+"""Durable outbox for outbound mail, drained in batches over one reused SMTP connection."""
+
+from __future__ import annotations
+
+import logging
+import smtplib
+import time
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from typing import Callable
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from src.database.models import EmailStatus, OutboundEmail
+
+BATCH_SIZE = 50
+MAX_RETRY_DELAY = timedelta(hours=1)
+SENT_RETENTION = timedelta(days=7)
+
+
+def enqueue_email(db: Session, *, recipient: str, subject: str, body: str) -> OutboundEmail:
+    """Add a message to the outbox; it is persisted by the caller's commit, together with its other changes."""
+    email = OutboundEmail(recipient=recipient, subject=subject, body=body)
+    db.add(email)
+    return email
+
+
+def retry_delay(attempts: int, base_seconds: float) -> timedelta:
+    """Exponential backoff after the `attempts`-th failure: base, 2*base, 4*base, ... capped at an hour."""
+    return min(timedelta(seconds=base_seconds * 2 ** (attempts - 1)), MAX_RETRY_DELAY)
+
+
+class PooledSMTP:
+    """
+    Keeps one authenticated SMTP connection open between batches.
+
+    The connection is checked with NOOP before reuse once it has been idle for
+    `idle_check_seconds`, and dropped after `idle_timeout_seconds` without use.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        username: str | None,
+        password: str | None,
+        use_starttls: bool = True,
+        timeout: float = 30.0,
+        idle_check_seconds: float = 10.0,
+        idle_timeout_seconds: float = 300.0,
+        smtp_factory: Callable[..., smtplib.SMTP] = smtplib.SMTP,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_starttls = use_starttls
+        self.timeout = timeout
+        self.idle_check_seconds = idle_check_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._smtp_factory = smtp_factory
+        self._clock = clock
+        self._smtp: smtplib.SMTP | None = None
+        self._last_used = 0.0
+        self.connections_opened = 0
+
+    def send(self, message: EmailMessage) -> None:
+        smtp = self._connection()
+        try:
+            smtp.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # The server dropped a connection we thought was alive; retry once on a fresh one.
+            self.close()
+            smtp = self._connection()
+            smtp.send_message(message)
+        except (smtplib.SMTPException, OSError):
+            # A rejected recipient leaves the connection usable; a broken socket does not.
+            self._drop_if_broken()
+            raise
+        self._last_used = self._clock()
+
+    def close(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+    def _connection(self) -> smtplib.SMTP:
+        idle = self._clock() - self._last_used
+        if self._smtp is not None and idle > self.idle_timeout_seconds:
+            self.close()
+        elif self._smtp is not None and idle > self.idle_check_seconds:
+            self._drop_if_broken()
+        if self._smtp is None:
+            smtp = self._smtp_factory(self.host, self.port, timeout=self.timeout)
+            try:
+                if self.use_starttls:
+                    smtp.starttls()
+                if self.username and self.password:
+                    smtp.login(self.username, self.password)
+            except Exception:
+                smtp.close()
+                raise
+            self._smtp = smtp
+            self._last_used = self._clock()
+            self.connections_opened += 1
+        return self._smtp
+
+    def _drop_if_broken(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            status, _ = self._smtp.noop()
+        except (smtplib.SMTPException, OSError):
+            status = None
+        if status != 250:
+            self._smtp.close()
+            self._smtp = None
+
+
+def _to_message(email: OutboundEmail, sender: str) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = email.subject
+    message["From"] = sender
+    message["To"] = email.recipient
+    message.set_content(email.body)
+    return message
+
+
+def deliver_pending(
+    db: Session,
+    smtp: PooledSMTP,
+    *,
+    sender: str,
+    max_attempts: int,
+    retry_base_seconds: float,
+    now: datetime | None = None,
+) -> dict[str, int]:
+    """Send one batch of due messages; returns how many were sent, rescheduled and given up on."""
+    now = now or datetime.now(timezone.utc)
+    due = db.scalars(
+        select(OutboundEmail)
+        .where(OutboundEmail.status == EmailStatus.PENDING, OutboundEmail.next_attempt_at <= now)
+        .order_by(OutboundEmail.next_attempt_at, OutboundEmail.id)
+        .limit(BATCH_SIZE)
+        # Lets several workers drain the outbox without sending a message twice (PostgreSQL).
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    outcome = {"sent": 0, "retrying": 0, "failed": 0}
+    for email in due:
+        try:
+            smtp.send(_to_message(email, sender))
+        except Exception as exc:
+            email.attempts += 1
+            email.last_error = f"{type(exc).__name__}: {exc}"[:1000]
+            if email.attempts >= max_attempts:
+                email.status = EmailStatus.FAILED
+                outcome["failed"] += 1
+                logging.error(f"❌ Giving up on email {email.id} to {email.recipient} after {email.attempts} attempts")
+            else:
+                email.next_attempt_at = now + retry_delay(email.attempts, retry_base_seconds)
+                outcome["retrying"] += 1
+                logging.warning(f"⏳ Email {email.id} failed ({email.last_error}); retrying at {email.next_attempt_at}")
+            continue
+        email.status = EmailStatus.SENT
+        email.sent_at = now
+        outcome["sent"] += 1
+
+    db.execute(
+        delete(OutboundEmail).where(
+            OutboundEmail.status == EmailStatus.SENT,
+            OutboundEmail.sent_at < now - SENT_RETENTION,
+        )
+    )
+    db.commit()
+    if outcome["sent"]:
+        logging.info(f"✅ Sent {outcome['sent']} queued email(s)")
+    return outcome
@@ -0,0 +1,84 @@
+"""Dedicated, bounded pool for argon2 work so login bursts cannot occupy the request threadpool."""
+
+from __future__ import annotations
+
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class HashingPoolSaturated(Exception):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"Password hashing pool is saturated; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class HashingPool:
+    """
+    Runs argon2 calls on `max_workers` threads (argon2-cffi releases the GIL).
+
+    At most `max_workers + max_queue` calls may be running or waiting; further
+    calls fail fast with `HashingPoolSaturated` instead of piling up request threads.
+    Sync handlers block a request thread on every call they make, so keep that
+    sum a small fraction of the request threadpool (AnyIO's default is 40).
+    """
+
+    def __init__(self, *, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="argon2")
+        self._slots = BoundedSemaphore(max_workers + max_queue)
+        self._lock = Lock()
+        self._in_flight = 0
+        self._avg_seconds = 0.0
+        self.completed = 0
+        self.rejected = 0
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingPoolSaturated(self.retry_after())
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._executor.submit(self._timed, fn, *args).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained, from the running average cost."""
+        with self._lock:
+            backlog = self._in_flight / self.max_workers
+            return max(math.ceil(backlog * self._avg_seconds), 1)
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_seconds": round(self._avg_seconds, 4),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _timed(self, fn: Callable[..., T], *args: Any) -> T:
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.completed += 1
+                # Exponential moving average; the first sample seeds it.
+                self._avg_seconds = elapsed if self.completed == 1 else 0.8 * self._avg_seconds + 0.2 * elapsed
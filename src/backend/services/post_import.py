@@ -0,0 +1,318 @@
+"""Bulk import of posts from NDJSON or BibTeX.
+
+Input is parsed one record at a time and each record is validated with
+`PostCreate`. Valid records are written `batch_size` at a time, with one
+multi-row INSERT per table: posts (with RETURNING for the new ids), tags
+(through `tag_service.upsert_tags`), `post_tags` and attachments. Each batch
+is one transaction. Memory is bounded by the batch size, and the statement
+count grows with the number of batches, not the number of posts. Invalid
+records are skipped and reported with the line they start on.
+
+Bulk inserts bypass the ORM flush hooks. Each batch therefore invalidates the
+response cache, the feed's ETag and the search index and publishes a
+change-feed event itself.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from src.backend.services import attachment_store, response_cache, revisions, search_index, tag_service
+from src.backend.services.change_feed import broker as change_broker
+from src.backend.services.schemas import PostCreate
+from src.database import models
+
+FORMATS = ("ndjson", "bibtex")
+BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+
+# A parsed record and the line it starts on; a string instead of a dict is a parse error.
+Record = tuple[int, "dict | str"]
+
+_BIBTEX_ENTRY = re.compile(r"@\s*([A-Za-z]+)\s*\{\s*([^,\s]*)\s*,?", re.DOTALL)
+_BIBTEX_FIELD = re.compile(r"[\s,]*([A-Za-z][\w:.-]*)\s*=\s*")
+_BIBTEX_BARE_VALUE = re.compile(r"[^,}\s]+")
+_BIBTEX_SKIPPED_TYPES = frozenset({"comment", "preamble", "string"})
+_AUTHOR_SEPARATOR = re.compile(r"\s+and\s+", re.IGNORECASE)
+_KEYWORD_SEPARATOR = re.compile(r"[,;]")
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    rejected: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def reject(self, line: int, message: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    def as_dict(self) -> dict:
+        return {
+            "imported": self.imported,
+            "rejected": self.rejected,
+            "rows": self.rows,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": [{"line": line, "message": message} for line, message in self.errors],
+        }
+
+
+def format_for(filename: str | None) -> str:
+    """`bibtex` for `.bib` files, otherwise `ndjson`."""
+    return "bibtex" if (filename or "").lower().endswith(".bib") else "ndjson"
+
+
+def parse_ndjson(lines: Iterable[str]) -> Iterator[Record]:
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield number, f"Invalid JSON: {exc.msg}"
+
+
+def parse_bibtex(lines: Iterable[str]) -> Iterator[Record]:
+    """One record per entry, read up to its closing brace; `@comment`, `@preamble` and `@string` are skipped."""
+    buffer: list[str] = []
+    start = depth = 0
+    opened = False
+    for number, line in enumerate(lines, start=1):
+        if not buffer:
+            at = line.find("@")
+            if at < 0:
+                continue
+            line, start, depth, opened = line[at:], number, 0, False
+        buffer.append(line)
+        depth += line.count("{") - line.count("}")
+        opened = opened or "{" in line
+        if opened and depth <= 0:
+            entry = "".join(buffer).strip()
+            buffer = []
+            record = _bibtex_record(entry)
+            if record is not None:
+                yield start, record
+    if buffer:
+        yield start, "Unterminated BibTeX entry"
+
+
+def _bibtex_value(text: str, position: int) -> tuple[str, int]:
+    if position >= len(text):
+        return "", position
+    opener = text[position]
+    if opener in "{\"":
+        closer = "}" if opener == "{" else "\""
+        depth = 0
+        for index in range(position + 1, len(text)):
+            char = text[index]
+            if char == "{":
+                depth += 1
+            elif char == "}" and depth > 0:
+                depth -= 1
+            elif char == closer and depth == 0:
+                return text[position + 1:index], index + 1
+        return text[position + 1:], len(text)
+    match = _BIBTEX_BARE_VALUE.match(text, position)
+    return (match.group(0), match.end()) if match else ("", position)
+
+
+def _clean(value: str) -> str:
+    return " ".join(value.replace("{", "").replace("}", "").split())
+
+
+def _bibtex_record(entry: str) -> dict | str | None:
+    match = _BIBTEX_ENTRY.match(entry)
+    if match is None:
+        return "Malformed BibTeX entry"
+    if match.group(1).lower() in _BIBTEX_SKIPPED_TYPES:
+        return None
+    fields: dict[str, str] = {}
+    body = entry[match.end():entry.rfind("}")]
+    position = 0
+    while (name := _BIBTEX_FIELD.match(body, position)) is not None:
+        value, position = _bibtex_value(body, name.end())
+        fields[name.group(1).lower()] = _clean(value)
+
+    title = fields.get("title")
+    abstract = fields.get("abstract") or None
+    record: dict = {"title": title, "body": abstract or title, "abstract": abstract, "bibtex": entry}
+    if "author" in fields:
+        record["authors_text"] = ", ".join(_AUTHOR_SEPARATOR.split(fields["author"]))
+    keywords = [keyword.strip() for keyword in _KEYWORD_SEPARATOR.split(fields.get("keywords", ""))]
+    record["tags"] = [keyword for keyword in keywords if keyword]
+    return record
+
+
+def parse(format: str, lines: Iterable[str]) -> Iterator[Record]:
+    if format == "bibtex":
+        return parse_bibtex(lines)
+    if format == "ndjson":
+        return parse_ndjson(lines)
+    raise ValueError(f"Unknown import format '{format}' (expected one of {', '.join(FORMATS)})")
+
+
+def _validate(record: dict | str) -> tuple[PostCreate, str | None] | str:
+    if isinstance(record, str):
+        return record
+    if not isinstance(record, dict):
+        return "Record is not a JSON object"
+    username = record.get("poster_username") or None
+    if username is not None and not isinstance(username, str):
+        return "poster_username must be a string"
+    try:
+        post = PostCreate(**record)
+    except ValidationError as exc:
+        error = exc.errors()[0]
+        location = ".".join(str(part) for part in error["loc"])
+        return f"{location}: {error['msg']}" if location else error["msg"]
+    return post, username
+
+
+@dataclass
+class _Pending:
+    line: int
+    post: PostCreate
+    username: str | None
+
+
+def _resolve_posters(db: Session, batch: list[_Pending], posters: dict[str, int | None]) -> None:
+    missing = {pending.username for pending in batch if pending.username and pending.username not in posters}
+    if missing:
+        posters.update(dict.fromkeys(missing))
+        posters.update(
+            db.execute(select(models.User.username, models.User.id).where(models.User.username.in_(missing))).all()
+        )
+
+
+def _write_batch(
+    db: Session,
+    batch: list[_Pending],
+    default_poster_id: int,
+    posters: dict[str, int | None],
+    result: ImportResult,
+) -> None:
+    _resolve_posters(db, batch, posters)
+    accepted: list[tuple[PostCreate, int]] = []
+    for pending in batch:
+        poster_id = default_poster_id if pending.username is None else posters[pending.username]
+        if poster_id is None:
+            result.reject(pending.line, f"Unknown poster_username '{pending.username}'")
+        else:
+            accepted.append((pending.post, poster_id))
+    if not accepted:
+        return
+
+    # Core inserts on the tables: ORM bulk inserts would split a batch by which values are None.
+    posts = models.Post.__table__
+    post_ids = db.scalars(
+        insert(posts).returning(posts.c.id, sort_by_parameter_order=True),
+        [
+            {
+                "title": post.title,
+                "body": post.body,
+                "abstract": post.abstract or "",
+                "authors_text": post.authors_text,
+                "bibtex": post.bibtex,
+                "poster_id": poster_id,
+                "phase": models.PostPhase.PUBLISHED,
+            }
+            for post, poster_id in accepted
+        ],
+    ).all()
+
+    tag_names = [name for post, _ in accepted for name in post.tags or []]
+    tag_ids = {tag.name: tag.id for tag in tag_service.upsert_tags(db, tag_names)}
+    post_tag_rows = [
+        {"post_id": post_id, "tag_id": tag_ids[name]}
+        for post_id, (post, _) in zip(post_ids, accepted)
+        for name in dict.fromkeys(name for name in post.tags or [] if name)
+    ]
+    attachment_rows = [
+        {
+            "post_id": post_id,
+            "file_path": path,
+            "mime_type": attachment_store.guess_mime_type(path),
+            "sha256": attachment_store.digest_of(path),
+        }
+        for post_id, (post, _) in zip(post_ids, accepted)
+        for path in map(attachment_store.normalize_reference, post.attachments or [])
+        if path
+    ]
+    if post_tag_rows:
+        db.execute(insert(models.post_tags), post_tag_rows)
+    if attachment_rows:
+        db.execute(insert(models.Attachment.__table__), attachment_rows)
+
+    response_cache.invalidate(db, {response_cache.POSTS})
+    revisions.mark_feed_changed(db)
+    db.commit()
+    search_index.mark_posts_changed(db, post_ids)
+    change_broker.publish([("post", "created", None)])
+
+    result.imported += len(post_ids)
+    result.rows += len(post_ids) + len(post_tag_rows) + len(attachment_rows)
+
+
+def import_posts(
+    db: Session,
+    records: Iterable[Record],
+    *,
+    default_poster_id: int,
+    batch_size: int = BATCH_SIZE,
+    clock: Callable[[], float] = time.perf_counter,
+) -> ImportResult:
+    """
+    Validate and insert `records`, committing every `batch_size` posts. A
+    record's `poster_username` attributes it to that user, otherwise it goes
+    to `default_poster_id`. Rejected records are counted and the first
+    `MAX_REPORTED_ERRORS` are kept with their line numbers.
+    """
+    result = ImportResult()
+    started = clock()
+    posters: dict[str, int | None] = {}
+    batch: list[_Pending] = []
+    try:
+        for line, record in records:
+            validated = _validate(record)
+            if isinstance(validated, str):
+                result.reject(line, validated)
+                continue
+            batch.append(_Pending(line, *validated))
+            if len(batch) >= batch_size:
+                _write_batch(db, batch, default_poster_id, posters, result)
+                batch = []
+        if batch:
+            _write_batch(db, batch, default_poster_id, posters, result)
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        result.seconds = clock() - started
+    return result
+
+
+def import_file(
+    db: Session,
+    stream: TextIO,
+    format: str,
+    *,
+    default_poster_id: int,
+    batch_size: int = BATCH_SIZE,
+) -> ImportResult:
+    return import_posts(db, parse(format, stream), default_poster_id=default_poster_id, batch_size=batch_size)
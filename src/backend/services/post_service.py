@@ -1,24 +1,27 @@
 from typing import Annotated
-import mimetypes
+import base64
+import binascii
 import logging
 import re
-import uuid
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+import io
 import json
-from urllib.parse import urlparse
 
-from fastapi import Depends, APIRouter, HTTPException, UploadFile, File, Body
+from fastapi import Depends, APIRouter, HTTPException, UploadFile, File, Body, Header, Query, Response
 from pydantic import ValidationError
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, func
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import delete, func, or_, select, tuple_, update
 
 from src.database.db import get_db
 from src.database import models
 from src.backend.services.schemas import (
     PostCreate,
     PostRead,
+    PostSort,
     AttachmentUploadResponse,
+    PostImportResult,
+    CommentNode,
     CommentThreadRead,
     CommentWrite,
     VoteRequest,
@@ -27,7 +30,16 @@ from src.backend.services.schemas import (
     ReportRead,
     ReportStatusUpdate
 )
-from src.backend.services import vote_service
+from src.backend.services import (
+    attachment_store,
+    comment_paths,
+    post_import,
+    response_cache,
+    revisions,
+    search_index,
+    tag_service,
+    vote_service,
+)
 from src.backend.services.user_service import get_current_user
 from src.backend.services.paths import ATTACHMENTS_DIR
 
@@ -35,13 +47,16 @@ logging.basicConfig(level=logging.INFO)
 
 router = APIRouter()
 
-ATTACHMENT_PREFIX = "/attachments/"
 
 _ATTACHMENT_NAME_SEPARATOR = "__"
 
-def _guess_mime_type(path: str) -> str:
-    guessed_mime_type, _ = mimetypes.guess_type(path)
-    return guessed_mime_type or "application/octet-stream"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 100
+_RELEVANCE_CURSOR_KEY = "relevance"
+_COMMENT_CURSOR_KEY = "comments"
+COMMENT_PAGE_SIZE = 20
+MAX_REPLIES_PER_NODE = 10
+MAX_COMMENT_DEPTH = 4
 
 def _sanitize_attachment_stem(filename: str) -> str:
     stem = Path(filename).stem.strip()
@@ -58,67 +73,7 @@ def _sanitize_attachment_stem(filename: str) -> str:
     return stem[:80]
 
 
-def _escape(query: str) -> str:
-    MAX_LEN = 128
-    if query is None:
-        return ""
-
-    q = query.strip()
-    q = q[:MAX_LEN]
-
-    q = (
-        q.replace("\\", "\\\\")
-         .replace("%", "\\%")
-         .replace("_", "\\_")
-    )
-    return q
-
-
-def _normalize_attachment_value(raw_value: str | None) -> str | None:
-    if not raw_value:
-        return None
-
-    candidate = raw_value.strip()
-    if not candidate:
-        return None
-
-    if candidate.startswith("{") and candidate.endswith("}"):
-        target_from_dict: str | None = None
-        try:
-            parsed_json = json.loads(candidate)
-            if isinstance(parsed_json, dict):
-                for key in ("file_path", "path"):
-                    value = parsed_json.get(key)
-                    if isinstance(value, str) and value.strip():
-                        target_from_dict = value.strip()
-                        break
-        except json.JSONDecodeError:
-            target_from_dict = None
-
-        if target_from_dict:
-            candidate = target_from_dict
-
-    try:
-        parsed = urlparse(candidate)
-        candidate = parsed.path or candidate
-    except ValueError:
-        pass
-
-    normalized = candidate.replace("\\", "/")
-    if normalized.startswith(ATTACHMENT_PREFIX):
-        return normalized
-
-    parts = [segment for segment in normalized.split("/") if segment]
-    if not parts:
-        return None
-
-    return f"{ATTACHMENT_PREFIX}{parts[-1]}"
-
-
 def _to_post_read(post: models.Post) -> PostRead:
-    upvotes = sum(1 for vote in post.post_votes if vote.value == 1) if post.post_votes else 0
-    downvotes = sum(1 for vote in post.post_votes if vote.value == -1) if post.post_votes else 0
-    
     return PostRead(
         id=post.id,
         abstract=post.abstract,
@@ -128,7 +83,7 @@ def _to_post_read(post: models.Post) -> PostRead:
         attachments=[
             normalized
             for attachment in (post.attachments or [])
-            for normalized in [_normalize_attachment_value(attachment.file_path)]
+            for normalized in [attachment_store.normalize_reference(attachment.file_path)]
             if normalized is not None
         ],
         title=post.title,
@@ -138,8 +93,8 @@ def _to_post_read(post: models.Post) -> PostRead:
         poster_role=post.poster.role.value if post.poster and post.poster.role else "user",
         created_at=post.created_at,
         phase=post.phase,
-        upvotes=upvotes,
-        downvotes=downvotes,
+        upvotes=post.upvotes,
+        downvotes=post.downvotes,
     )
 
 
@@ -177,131 +132,215 @@ async def upload_post_attachment(
     mime_type = file.content_type or "application/octet-stream"
     extension = Path(file.filename).suffix
     safe_stem = _sanitize_attachment_stem(file.filename)
-    destination_name = f"{safe_stem}{_ATTACHMENT_NAME_SEPARATOR}{uuid.uuid4().hex}{extension}"
-    ATTACHMENTS_DIR.mkdir(parents=True, exist_ok=True)
-    destination_path = ATTACHMENTS_DIR / destination_name
 
-    file_contents = await file.read()
-    if not file_contents:
+    try:
+        stored = await attachment_store.store_upload(file, ATTACHMENTS_DIR)
+    except attachment_store.EmptyAttachment:
         raise HTTPException(
             status_code=400,
             detail="Uploaded file is empty.",
         )
+    except attachment_store.AttachmentTooLarge as error:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Attachments are limited to {error.max_bytes} bytes.",
+        )
 
-    with destination_path.open("wb") as buffer:
-        buffer.write(file_contents)
-
+    destination_name = f"{safe_stem}{_ATTACHMENT_NAME_SEPARATOR}{stored.sha256}{extension}"
     logging.info(
-        "User %s uploaded attachment %s saved as %s",
+        "User %s uploaded attachment %s as %s (%s)",
         current_user.id,
         file.filename,
         destination_name,
+        "already stored" if stored.deduplicated else f"{stored.size} bytes written",
     )
 
     return AttachmentUploadResponse(
         file_path=f"/attachments/{destination_name}",
         mime_type=mime_type,
         original_filename=file.filename,
+        size_bytes=stored.size,
+        sha256=stored.sha256,
+    )
+
+
+def _post_read_options() -> tuple:
+    """
+    Loaders for everything `_to_post_read` touches. Tags and attachments come
+    in one batched query each rather than one per post, and are not joined
+    into the post rows, where they would multiply each other.
+    """
+    return (
+        joinedload(models.Post.poster),
+        selectinload(models.Post.tags),
+        selectinload(models.Post.attachments),
     )
 
 
+def _published_posts_query(db: Session):
+    return (
+        db.query(models.Post)
+        .options(*_post_read_options())
+        .filter(models.Post.phase == models.PostPhase.PUBLISHED)
+    )
+
+
+def _encode_cursor(sort_key: str, values: list) -> str:
+    serialized = [
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps([sort_key, *serialized], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_key: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        decoded = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(decoded, list) or len(decoded) != size + 1 or decoded[0] != sort_key:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return decoded[1:]
+
+
+def _parse_cursor_datetime(value) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _parse_cursor_int(value) -> int:
+    # bool is an int subclass, and JSON true/false would compare as 1/0.
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value
+
+
+def _parse_cursor_float(value) -> float:
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return float(value)
+
+
+def _post_sort_keys(sort: PostSort) -> list:
+    metrics = []
+    if sort == PostSort.TOP:
+        metrics.append(models.Post.upvotes - models.Post.downvotes)
+    elif sort == PostSort.MOST_REVIEWED:
+        metrics.append(models.Post.review_count)
+    return [*metrics, models.Post.created_at, models.Post.id]
+
+
+def _posts_in_order(db: Session, post_ids: list[int]) -> list[models.Post]:
+    if not post_ids:
+        return []
+    posts_by_id = {
+        post.id: post
+        for post in _published_posts_query(db).filter(models.Post.id.in_(post_ids)).all()
+    }
+    return [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id]
+
+
+def _feed_page(
+    db: Session,
+    sort: PostSort,
+    limit: int | None,
+    cursor: str | None,
+) -> tuple[list[models.Post], str | None]:
+    keys = _post_sort_keys(sort)
+    statement = select(*keys).where(models.Post.phase == models.PostPhase.PUBLISHED)
+    if cursor:
+        *metrics, created_at, post_id = _decode_cursor(cursor, sort.value, len(keys))
+        values = [
+            *(_parse_cursor_int(metric) for metric in metrics),
+            _parse_cursor_datetime(created_at),
+            _parse_cursor_int(post_id),
+        ]
+        statement = statement.where(tuple_(*keys) < tuple_(*values))
+    statement = statement.order_by(*(key.desc() for key in keys))
+    if limit is not None:
+        statement = statement.limit(limit + 1)
+
+    rows = db.execute(statement).all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(sort.value, list(rows[-1]))
+
+    return _posts_in_order(db, [row[-1] for row in rows]), next_cursor
+
+
+def _search_page(
+    db: Session,
+    query: str,
+    limit: int | None,
+    cursor: str | None,
+) -> tuple[list[models.Post], str | None]:
+    ranked = search_index.search_posts(db, query)
+    if cursor:
+        after_score, after_id = _decode_cursor(cursor, _RELEVANCE_CURSOR_KEY, 2)
+        after_score, after_id = _parse_cursor_float(after_score), _parse_cursor_int(after_id)
+        ranked = [
+            (post_id, score)
+            for post_id, score in ranked
+            if (score, post_id) < (after_score, after_id)
+        ]
+
+    next_cursor = None
+    if limit is not None and len(ranked) > limit:
+        ranked = ranked[:limit]
+        last_id, last_score = ranked[-1]
+        next_cursor = _encode_cursor(_RELEVANCE_CURSOR_KEY, [last_score, last_id])
+
+    return _posts_in_order(db, [post_id for post_id, _score in ranked]), next_cursor
+
+
 @router.get("/", response_model=list[PostRead])
 def find_research_posts(
     db: Annotated[Session, Depends(get_db)],
     query: str | None = None,
+    sort: PostSort = PostSort.NEWEST,
+    limit: Annotated[int | None, Query(gt=0, le=MAX_PAGE_SIZE)] = None,
+    cursor: str | None = None,
+    response: Response = None,  # type: ignore[assignment]
+    if_none_match: Annotated[str | None, Header()] = None,
 ) -> list[PostRead]:
-    if not query:
-        db_posts = (
-            db.query(models.Post)
-            .options(
-                joinedload(models.Post.poster),
-                joinedload(models.Post.tags),
-                joinedload(models.Post.attachments),
-                joinedload(models.Post.post_votes)
-            )
-            .filter(models.Post.phase == models.PostPhase.PUBLISHED)
-            .all()
-        )
-    else:
-        raw_query = query.strip()
-        if not raw_query:
-            db_posts = (
-                db.query(models.Post)
-                .options(
-                    joinedload(models.Post.poster),
-                    joinedload(models.Post.tags),
-                    joinedload(models.Post.attachments),
-                    joinedload(models.Post.post_votes)
-                )
-                .filter(models.Post.phase == models.PostPhase.PUBLISHED)
-                .all()
-            )
+    """
+    List published posts in `sort` order, or by relevance when `query` is given.
+
+    With `limit`, the opaque cursor for the next page (if any) is returned in
+    the `X-Next-Cursor` response header.
+    """
+    etag = revisions.make_etag("feed", revisions.feed_stamp(db))
+    not_modified = revisions.conditional(if_none_match, etag, response)
+    if not_modified is not None:
+        return not_modified  # type: ignore[return-value]
+
+    raw_query = (query or "").strip()
+
+    def compute() -> list[PostRead]:
+        if raw_query:
+            db_posts, next_cursor = _search_page(db, raw_query, limit, cursor)
         else:
-            query_lower = raw_query.lower()
-
-            escaped = _escape(raw_query)
-            pattern = f"%{escaped}%"
-
-            posts_by_text = (
-                db.query(models.Post)
-                .options(
-                    joinedload(models.Post.poster),
-                    joinedload(models.Post.tags),
-                    joinedload(models.Post.attachments),
-                    joinedload(models.Post.post_votes)
-                )
-                .filter(
-                    or_(
-                        models.Post.title.ilike(pattern, escape="\\"),
-                        models.Post.body.ilike(pattern, escape="\\"),
-                        models.Post.abstract.ilike(pattern, escape="\\"),
-                    )
-                )
-                .filter(models.Post.phase == models.PostPhase.PUBLISHED)
-                .all()
-            )
+            db_posts, next_cursor = _feed_page(db, sort, limit, cursor)
 
-            posts_by_tags = (
-                db.query(models.Post)
-                .options(
-                    joinedload(models.Post.poster),
-                    joinedload(models.Post.tags),
-                    joinedload(models.Post.attachments),
-                    joinedload(models.Post.post_votes)
-                )
-                .join(models.Post.tags)
-                .filter(models.Tag.name.ilike(pattern, escape="\\"))
-                .filter(models.Post.phase == models.PostPhase.PUBLISHED)
-                .all()
-            )
-
-            posts_by_authors = (
-                db.query(models.Post)
-                .filter(
-                    models.Post.authors_text.ilike(pattern, escape="\\")
-                )
-                .filter(models.Post.phase == models.PostPhase.PUBLISHED)
-                .all()
-            )
+        if next_cursor and response is not None:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
-            combined = {
-                post.id: post for post in posts_by_text + posts_by_tags + posts_by_authors
-            }
-            db_posts = list(combined.values())
-
-            db_posts = [
-                post for post in db_posts
-                if (query_lower in (post.title or "").lower())
-                or (query_lower in (post.body or "").lower())
-                or (query_lower in (post.abstract or "").lower())
-                or any(
-                    query_lower in (tag.name or "").lower()
-                    for tag in post.tags
-                )
-                or (query_lower in (post.authors_text or "").lower())
-            ]
+        return [_to_post_read(post) for post in db_posts]
 
-    return [_to_post_read(post) for post in db_posts]
+    key = response_cache.cache_key(
+        "posts.feed",
+        query=raw_query or None,
+        sort=None if raw_query else sort.value,
+        limit=limit,
+        cursor=cursor,
+    )
+    return response_cache.cache.serve(key, (response_cache.POSTS,), compute, response, db=db)
 
 
 @router.get("/count", response_model=int)
@@ -309,13 +348,18 @@ def get_published_post_count(
     db: Annotated[Session, Depends(get_db)],
 ) -> int:
     """Return the total number of published research posts."""
-    return int(
-        db.query(models.Post).filter(models.Post.phase == models.PostPhase.PUBLISHED).count()
+    return response_cache.cache.serve(
+        response_cache.cache_key("posts.count"),
+        (response_cache.POSTS,),
+        lambda: int(
+            db.query(models.Post).filter(models.Post.phase == models.PostPhase.PUBLISHED).count()
+        ),
+        db=db,
     )
 
 
 @router.post("/create")
-async def create_research_post(
+def create_research_post(
     raw_body: Annotated[str, Body(...)],
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[models.User, Depends(get_current_user)],
@@ -355,6 +399,7 @@ async def create_research_post(
         logging.error(
             "Unsupported payload type %s for post creation", type(payload))
         raise HTTPException(status_code=422, detail="Invalid post payload")
+    # Post, tags and attachments are written in one transaction with a fixed number of statements.
     db_post = models.Post(
         title=post.title,
         body=post.body,
@@ -366,21 +411,7 @@ async def create_research_post(
         phase=models.PostPhase.PUBLISHED,
     )
     db.add(db_post)
-    db.commit()
-    db.refresh(db_post)
-
-    logging.info(f"Post created with ID: {db_post.id}")
-
-    if post.tags:
-        for tag_name in post.tags:
-            tag = db.query(models.Tag).filter(
-                models.Tag.name == tag_name).first()
-            if not tag:
-                tag = models.Tag(name=tag_name)
-                db.add(tag)
-                db.commit()
-                db.refresh(tag)
-            db_post.tags.append(tag)
+    db_post.tags = tag_service.upsert_tags(db, post.tags or [])
 
     if post.attachments:
         for attachment_item in post.attachments:
@@ -391,7 +422,7 @@ async def create_research_post(
                 )
                 continue
 
-            normalized = _normalize_attachment_value(attachment_item)
+            normalized = attachment_store.normalize_reference(attachment_item)
             if not normalized:
                 logging.warning(
                     "Attachment skipped because file_path is invalid: %s",
@@ -399,51 +430,109 @@ async def create_research_post(
                 )
                 continue
 
-            mime_type = _guess_mime_type(normalized)
-            attachment = models.Attachment(
-                file_path=normalized,
-                mime_type=mime_type,
-                post_id=db_post.id,
+            mime_type = attachment_store.guess_mime_type(normalized)
+            db_post.attachments.append(
+                models.Attachment(
+                    file_path=normalized,
+                    mime_type=mime_type,
+                    sha256=attachment_store.digest_of(normalized),
+                )
             )
-            db.add(attachment)
 
     db.commit()
+    logging.info(f"Post created with ID: {db_post.id}")
 
     return _to_post_read(db_post)
 
 
+@router.post("/import", response_model=PostImportResult)
+def import_research_posts(
+    file: Annotated[UploadFile, File(...)],
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[models.User, Depends(get_current_user)],
+    format: Annotated[str | None, Query()] = None,
+    batch_size: Annotated[int, Query(ge=1, le=5000)] = post_import.BATCH_SIZE,
+) -> PostImportResult:
+    """
+    Bulk-create posts from an NDJSON (one `PostCreate` object per line) or
+    BibTeX file. Only moderators can import. Posts belong to the caller unless
+    an NDJSON record names a `poster_username`. Invalid records are skipped
+    and listed in the result.
+    """
+    if current_user.role != models.UserRole.MODERATOR:
+        raise HTTPException(status_code=403, detail="Only moderators can import posts")
+    format = format or post_import.format_for(file.filename)
+    if format not in post_import.FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported import format '{format}'")
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", errors="replace", newline="")
+    try:
+        result = post_import.import_file(
+            db, stream, format, default_poster_id=current_user.id, batch_size=batch_size
+        )
+    finally:
+        stream.detach()
+    logging.info(
+        "User %s imported %s posts (%s rejected) at %.0f rows/s",
+        current_user.id,
+        result.imported,
+        result.rejected,
+        result.rows_per_second,
+    )
+    return PostImportResult(**result.as_dict())
+
+
 @router.get("/by/{username}", response_model=list[PostRead])
 def get_posts_by_username(
     username: str,
     db: Annotated[Session, Depends(get_db)],
 ) -> list[PostRead]:
-    user = (
-        db.query(models.User)
-        .filter(models.User.username == username)
-        .first()
-    )
-    if not user:
-        logging.error("User %s not found when listing posts", username)
-        raise HTTPException(status_code=404, detail="User not found")
-
-    posts = (
-        db.query(models.Post)
-        .filter(
-            models.Post.poster_id == user.id,
-            models.Post.phase == models.PostPhase.PUBLISHED,
+    def compute() -> list[PostRead]:
+        user = (
+            db.query(models.User)
+            .filter(models.User.username == username)
+            .first()
         )
-        .order_by(models.Post.created_at.desc())
-        .all()
+        if not user:
+            logging.error("User %s not found when listing posts", username)
+            raise HTTPException(status_code=404, detail="User not found")
+
+        posts = (
+            _published_posts_query(db)
+            .filter(models.Post.poster_id == user.id)
+            .order_by(models.Post.created_at.desc(), models.Post.id.desc())
+            .all()
+        )
+        return [_to_post_read(post) for post in posts]
+
+    return response_cache.cache.serve(
+        response_cache.cache_key("posts.by_username", username=username),
+        (response_cache.POSTS,),
+        compute,
+        db=db,
     )
-    return [_to_post_read(post) for post in posts]
 
 
 @router.get("/{post_id}", response_model=PostRead)
 def get_research_post(
     post_id: int,
     db: Annotated[Session, Depends(get_db)],
+    response: Response = None,  # type: ignore[assignment]
+    if_none_match: Annotated[str | None, Header()] = None,
 ) -> PostRead:
-    db_post = db.query(models.Post).filter(models.Post.id == post_id).first()
+    stamp = revisions.post_stamp(db, post_id)
+    if stamp is not None:
+        etag = revisions.make_etag("post", post_id, *stamp)
+        not_modified = revisions.conditional(if_none_match, etag, response)
+        if not_modified is not None:
+            return not_modified  # type: ignore[return-value]
+
+    db_post = (
+        db.query(models.Post)
+        .options(*_post_read_options())
+        .filter(models.Post.id == post_id)
+        .first()
+    )
     if not db_post:
         logging.error(f"Post with ID {post_id} not found")
         raise HTTPException(status_code=404, detail="Post not found")
@@ -456,21 +545,24 @@ def get_research_post(
 def get_post_comments(
     post_id: int,
     db: Annotated[Session, Depends(get_db)],
+    response: Response = None,  # type: ignore[assignment]
+    if_none_match: Annotated[str | None, Header()] = None,
 ) -> list[CommentThreadRead]:
-    post_exists = (
-        db.query(models.Post.id)
-        .filter(models.Post.id == post_id)
-        .first()
-    )
-    if not post_exists:
+    stamp = revisions.post_stamp(db, post_id)
+    if stamp is None:
         logging.error(
             "Post with ID %s not found when listing comments", post_id)
         raise HTTPException(status_code=404, detail="Post not found")
 
+    # Commenter usernames never change, so the post's own revision covers the thread.
+    etag = revisions.make_etag("comments", post_id, stamp[0])
+    not_modified = revisions.conditional(if_none_match, etag, response)
+    if not_modified is not None:
+        return not_modified  # type: ignore[return-value]
+
     db_comments = (
         db.query(models.Comment)
         .options(joinedload(models.Comment.commenter))
-        .options(joinedload(models.Comment.comment_votes))
         .filter(models.Comment.post_id == post_id)
         .order_by(models.Comment.created_at.asc())
         .all()
@@ -485,15 +577,257 @@ def get_post_comments(
             parent_comment_id=comment.parent_comment_id,
             body=comment.body,
             created_at=comment.created_at,
-            upvotes=sum(
-                1 for vote in comment.comment_votes if vote.value == 1),
-            downvotes=sum(
-                1 for vote in comment.comment_votes if vote.value == -1),
+            upvotes=comment.upvotes,
+            downvotes=comment.downvotes,
         )
         for comment in db_comments
     ]
 
 
+def _comment_columns() -> tuple:
+    return (
+        models.Comment.id,
+        models.Comment.post_id,
+        models.Comment.commenter_id,
+        models.User.username,
+        models.Comment.parent_comment_id,
+        models.Comment.body,
+        models.Comment.created_at,
+        models.Comment.upvotes,
+        models.Comment.downvotes,
+    )
+
+
+def _comment_fields(row) -> dict:
+    return dict(
+        id=row.id,
+        post_id=row.post_id,
+        commenter_id=row.commenter_id,
+        commenter_username=row.username or "Unknown",
+        parent_comment_id=row.parent_comment_id,
+        body=row.body,
+        created_at=row.created_at,
+        upvotes=row.upvotes,
+        downvotes=row.downvotes,
+    )
+
+
+def _comment_node(row) -> CommentNode:
+    return CommentNode(**_comment_fields(row))
+
+
+def _comment_cursor(node: CommentNode) -> str:
+    return _encode_cursor(_COMMENT_CURSOR_KEY, [node.created_at, node.id])
+
+
+def _comment_page(
+    db: Session,
+    post_id: int,
+    parent_id: int | None,
+    limit: int,
+    cursor: str | None,
+) -> tuple[list[CommentNode], str | None]:
+    """One page of `parent_id`'s direct replies (top-level comments for None), oldest first."""
+    parent = (
+        models.Comment.parent_comment_id.is_(None)
+        if parent_id is None
+        else models.Comment.parent_comment_id == parent_id
+    )
+    statement = (
+        select(*_comment_columns())
+        .outerjoin(models.User, models.User.id == models.Comment.commenter_id)
+        .where(models.Comment.post_id == post_id, parent)
+    )
+    if cursor:
+        created_at, comment_id = _decode_cursor(cursor, _COMMENT_CURSOR_KEY, 2)
+        statement = statement.where(
+            tuple_(models.Comment.created_at, models.Comment.id)
+            > tuple_(_parse_cursor_datetime(created_at), _parse_cursor_int(comment_id))
+        )
+    statement = statement.order_by(models.Comment.created_at, models.Comment.id).limit(limit + 1)
+
+    nodes = [_comment_node(row) for row in db.execute(statement)]
+    next_cursor = None
+    if len(nodes) > limit:
+        nodes = nodes[:limit]
+        next_cursor = _comment_cursor(nodes[-1])
+    return nodes, next_cursor
+
+
+def _expand_replies(db: Session, post_id: int, nodes: list[CommentNode], replies: int, depth: int) -> None:
+    """
+    Attach the first `replies` replies of every node, `depth` levels down,
+    with one windowed query per level, so the query count does not depend on
+    the size of the thread. Nodes on the last level only get their
+    `reply_count`, from one grouped count.
+    """
+    level = nodes
+    for _ in range(depth if replies else 0):
+        if not level:
+            return
+        by_id = {node.id: node for node in level}
+        order = (models.Comment.created_at, models.Comment.id)
+        ranked = (
+            select(
+                *_comment_columns(),
+                func.row_number().over(partition_by=models.Comment.parent_comment_id, order_by=order).label("rank"),
+                func.count().over(partition_by=models.Comment.parent_comment_id).label("total"),
+            )
+            .outerjoin(models.User, models.User.id == models.Comment.commenter_id)
+            .where(models.Comment.post_id == post_id, models.Comment.parent_comment_id.in_(by_id))
+            .subquery()
+        )
+        rows = db.execute(
+            select(ranked).where(ranked.c.rank <= replies).order_by(ranked.c.parent_comment_id, ranked.c.rank)
+        )
+        level = []
+        for row in rows:
+            parent = by_id[row.parent_comment_id]
+            parent.reply_count = row.total
+            child = _comment_node(row)
+            parent.replies.append(child)
+            level.append(child)
+        for parent in by_id.values():
+            if parent.reply_count > len(parent.replies):
+                parent.replies_cursor = _comment_cursor(parent.replies[-1])
+
+    if level:
+        counts = dict(
+            db.execute(
+                select(models.Comment.parent_comment_id, func.count(models.Comment.id))
+                .where(
+                    models.Comment.post_id == post_id,
+                    models.Comment.parent_comment_id.in_([node.id for node in level]),
+                )
+                .group_by(models.Comment.parent_comment_id)
+            ).all()
+        )
+        for node in level:
+            node.reply_count = counts.get(node.id, 0)
+
+
+def _count_descendants(db: Session, nodes: list[CommentNode]) -> None:
+    """Fill in every node's `descendant_count` with one query over the materialized paths."""
+    every_node: list[CommentNode] = []
+    level = nodes
+    while level:
+        every_node.extend(level)
+        level = [reply for node in level for reply in node.replies]
+    counts = comment_paths.descendant_counts(db, (node.id for node in every_node))
+    for node in every_node:
+        node.descendant_count = counts.get(node.id, 0)
+
+
+def _comment_tree(
+    db: Session,
+    post_id: int,
+    parent_id: int | None,
+    if_none_match: str | None,
+    response: Response | None,
+    limit: int,
+    cursor: str | None,
+    replies: int,
+    depth: int,
+) -> list[CommentNode] | Response:
+    stamp = revisions.post_stamp(db, post_id)
+    if stamp is None:
+        logging.error("Post with ID %s not found when listing comments", post_id)
+        raise HTTPException(status_code=404, detail="Post not found")
+    if parent_id is not None:
+        parent_exists = db.scalar(
+            select(models.Comment.id).where(models.Comment.id == parent_id, models.Comment.post_id == post_id)
+        )
+        if parent_exists is None:
+            raise HTTPException(status_code=404, detail="Comment not found")
+
+    etag = revisions.make_etag("comment-tree", post_id, parent_id or 0, stamp[0])
+    not_modified = revisions.conditional(if_none_match, etag, response)
+    if not_modified is not None:
+        return not_modified
+
+    nodes, next_cursor = _comment_page(db, post_id, parent_id, limit, cursor)
+    _expand_replies(db, post_id, nodes, replies, depth)
+    _count_descendants(db, nodes)
+    if next_cursor and response is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return nodes
+
+
+@router.get("/{post_id}/comments/tree", response_model=list[CommentNode])
+def get_post_comment_tree(
+    post_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    limit: Annotated[int, Query(gt=0, le=MAX_PAGE_SIZE)] = COMMENT_PAGE_SIZE,
+    cursor: str | None = None,
+    replies: Annotated[int, Query(ge=0, le=MAX_REPLIES_PER_NODE)] = 3,
+    depth: Annotated[int, Query(ge=0, le=MAX_COMMENT_DEPTH)] = 2,
+    response: Response = None,  # type: ignore[assignment]
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> list[CommentNode]:
+    """
+    A page of top-level comments, oldest first, each with its first `replies`
+    replies nested `depth` levels deep. The next page's cursor is returned in
+    `X-Next-Cursor`. A node whose `reply_count` exceeds its included replies
+    continues at `GET /posts/{post_id}/comments/{id}/replies?cursor=<replies_cursor>`.
+    """
+    return _comment_tree(db, post_id, None, if_none_match, response, limit, cursor, replies, depth)  # type: ignore[return-value]
+
+
+@router.get("/{post_id}/comments/{comment_id}/replies", response_model=list[CommentNode])
+def get_comment_replies(
+    post_id: int,
+    comment_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    limit: Annotated[int, Query(gt=0, le=MAX_PAGE_SIZE)] = COMMENT_PAGE_SIZE,
+    cursor: str | None = None,
+    replies: Annotated[int, Query(ge=0, le=MAX_REPLIES_PER_NODE)] = 3,
+    depth: Annotated[int, Query(ge=0, le=MAX_COMMENT_DEPTH)] = 2,
+    response: Response = None,  # type: ignore[assignment]
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> list[CommentNode]:
+    """The next page of one comment's replies, shaped like `get_post_comment_tree`."""
+    return _comment_tree(db, post_id, comment_id, if_none_match, response, limit, cursor, replies, depth)  # type: ignore[return-value]
+
+
+@router.get("/{post_id}/comments/{comment_id}/thread", response_model=list[CommentThreadRead])
+def get_comment_thread(
+    post_id: int,
+    comment_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    max_depth: Annotated[int | None, Query(ge=0)] = None,
+    response: Response = None,  # type: ignore[assignment]
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> list[CommentThreadRead]:
+    """
+    A comment and everything below it, at most `max_depth` levels down, as a
+    flat list ordered by depth then age. One query over the materialized
+    paths, however deep the thread.
+    """
+    root = (
+        db.query(models.Comment)
+        .filter(models.Comment.id == comment_id, models.Comment.post_id == post_id)
+        .first()
+    )
+    if root is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+
+    stamp = revisions.post_stamp(db, post_id)
+    etag = revisions.make_etag("comment-thread", post_id, comment_id, stamp[0] if stamp else 0)
+    not_modified = revisions.conditional(if_none_match, etag, response)
+    if not_modified is not None:
+        return not_modified  # type: ignore[return-value]
+
+    statement = (
+        select(*_comment_columns())
+        .outerjoin(models.User, models.User.id == models.Comment.commenter_id)
+        .where(or_(models.Comment.id == root.id, comment_paths.in_subtree(root)))
+        .order_by(models.Comment.depth, models.Comment.created_at, models.Comment.id)
+    )
+    if max_depth is not None:
+        statement = statement.where(models.Comment.depth <= root.depth + max_depth)
+    return [CommentThreadRead(**_comment_fields(row)) for row in db.execute(statement)]
+
+
 @router.post("/{post_id}/comments", response_model=CommentThreadRead, status_code=201)
 def create_post_comment(
     post_id: int,
@@ -528,6 +862,7 @@ def create_post_comment(
         raise HTTPException(status_code=404, detail="Post not found")
 
     parent_comment_id = parsed_payload.parent_comment_id
+    parent_comment = None
     if parent_comment_id is not None:
         parent_comment = (
             db.query(models.Comment)
@@ -556,6 +891,7 @@ def create_post_comment(
         commenter_id=current_user.id,
         parent_comment_id=parent_comment_id,
         body=body,
+        **comment_paths.child_fields(parent_comment),
     )
     db.add(db_comment)
     db.commit()
@@ -646,7 +982,11 @@ def delete_research_post(
     ).all()
     for report in related_reports:
         report.status = models.ReportStatus.CLOSED
-    
+
+    # The post's comments and reviews go with it, and so do the votes on all of them.
+    vote_service.retract_reputation(db, models.Post, models.Post.id == post_id)
+    vote_service.retract_reputation(db, models.Comment, models.Comment.post_id == post_id)
+    vote_service.retract_reputation(db, models.Review, models.Review.post_id == post_id)
     db.delete(db_post)
     db.commit()
     logging.info(f"Post with ID {post_id} deleted successfully, closed {len(related_reports)} related reports")
@@ -658,11 +998,9 @@ def get_my_research_posts(
     current_user: Annotated[models.User, Depends(get_current_user)],
 ) -> list[PostRead]:
     db_posts = (
-        db.query(models.Post)
-        .filter(
-            models.Post.poster_id == current_user.id,
-            models.Post.phase == models.PostPhase.PUBLISHED,
-        )
+        _published_posts_query(db)
+        .filter(models.Post.poster_id == current_user.id)
+        .order_by(models.Post.created_at.desc(), models.Post.id.desc())
         .all()
     )
 
@@ -673,8 +1011,7 @@ def get_my_research_posts(
         logging.info(f"No posts found for user ID {current_user.id}")
         return []
 
-    return sorted([_to_post_read(post) for post in db_posts],
-                  key=lambda x: x.created_at, reverse=True)
+    return [_to_post_read(post) for post in db_posts]
 
 
 @router.get("/{post_id}/reports", response_model=list[ReportRead])
@@ -774,13 +1111,31 @@ def delete_comment(
             f"User {current_user.id} not authorized to delete comment ID {comment_id}")
         raise HTTPException(status_code=403, detail="Not authorized to delete this comment")
     
-    related_reports = db.query(models.Report).filter(
-        models.Report.target_type == "COMMENT",
-        models.Report.target_id == comment_id
-    ).all()
-    for report in related_reports:
-        report.status = models.ReportStatus.CLOSED
-    
+    # The whole thread below the comment goes with it: one statement per table, whatever its depth.
+    descendant_ids = select(models.Comment.id).where(comment_paths.in_subtree(db_comment)).scalar_subquery()
+    closed_reports = db.execute(
+        update(models.Report)
+        .where(
+            models.Report.target_type == "COMMENT",
+            or_(models.Report.target_id == comment_id, models.Report.target_id.in_(descendant_ids)),
+        )
+        .values(status=models.ReportStatus.CLOSED)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    vote_service.retract_reputation(
+        db, models.Comment, or_(models.Comment.id == comment_id, comment_paths.in_subtree(db_comment))
+    )
+    db.execute(
+        delete(models.CommentVote)
+        .where(models.CommentVote.comment_id.in_(descendant_ids))
+        .execution_options(synchronize_session=False)
+    )
+    deleted_replies = db.execute(
+        delete(models.Comment).where(comment_paths.in_subtree(db_comment)).execution_options(synchronize_session=False)
+    ).rowcount
+
     db.delete(db_comment)
     db.commit()
-    logging.info(f"Comment with ID {comment_id} deleted successfully, closed {len(related_reports)} related reports")
+    logging.info(
+        f"Comment with ID {comment_id} deleted with {deleted_replies} replies, closed {closed_reports} related reports"
+    )
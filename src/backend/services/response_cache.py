@@ -0,0 +1,308 @@
+"""Response cache for the public hot reads (feed, counts, latest users, posts by user, profile summaries).
+
+These endpoints answer the same for every caller, so their results are kept
+per route and query parameters in a bounded LRU with a TTL. Each entry is
+tagged with the data it was built from (`posts`, `users`, `discussion`). Session hooks work
+out which tags a transaction touched and bump a generation counter per tag
+once it commits. An entry is served only while the generations it was
+computed under are still current, so a write shows up on the next read, and
+a result computed concurrently with a write is never stored as fresh.
+
+With the `database` backend the generations live in the
+`response_cache_generations` table, so a write on one worker invalidates
+every worker's copy. They are read on the request's own session and bumped
+once the write has committed and released its connection, in a short
+transaction of their own: a request never holds two pool connections, writers
+never hold a lock on a shared tag row, and other workers may serve the old
+entry only until that bump lands.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Iterable
+from urllib.parse import urlencode
+
+from fastapi import Response
+from sqlalchemy import event, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from src.backend.config.config_utils import read_config
+from src.backend.services.schemas import UserRead
+from src.database import models
+
+POSTS = "posts"
+USERS = "users"
+DISCUSSION = "discussion"
+
+_PENDING_TAGS_KEY = "_response_cache_pending"
+_COMMITTED_TAGS_KEY = "_response_cache_committed"
+
+# Rows that show up in (or reorder) post listings: reviews drive the `most_reviewed` sort.
+_POST_ROWS = (models.Post, models.Attachment, models.PostVote, models.Review)
+# Comments and the votes on comments and reviews: they change comment counts and authors' reputation.
+_DISCUSSION_ROWS = (models.Comment, models.CommentVote, models.ReviewVote)
+_USER_FIELDS = frozenset(UserRead.model_fields)
+_POSTER_FIELDS = frozenset({"username", "role"})
+
+
+@dataclass(frozen=True)
+class _Entry:
+    value: Any
+    headers: dict[str, str]
+    generations: tuple[int, ...]
+    expires_at: float
+
+
+class MemoryGenerations:
+    """Per-process counters, bumped after commit."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._generations: dict[str, int] = {}
+
+    def current(self, tags: tuple[str, ...], db: Session | None = None) -> tuple[int, ...]:
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def bump_committed(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+
+class DatabaseGenerations:
+    """
+    Counters shared by every worker through `response_cache_generations`.
+
+    The bump is one upsert per tag in its own transaction, run once the
+    write has committed and given its connection back, so the hot tag rows
+    are locked only for that moment. Reading them costs one primary-key
+    lookup per cache hit, on the caller's session.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]) -> None:
+        self._session_factory = session_factory
+
+    def current(self, tags: tuple[str, ...], db: Session | None = None) -> tuple[int, ...]:
+        """The tags' generations, read on `db`; a session of our own only outside a request (scripts, tests)."""
+        table = models.ResponseCacheGeneration.__table__
+        query = select(table.c.tag, table.c.generation).where(table.c.tag.in_(tags))
+        if db is not None:
+            rows = dict(db.execute(query).all())
+        else:
+            with self._session_factory() as own:
+                rows = dict(own.execute(query).all())
+        return tuple(rows.get(tag, 0) for tag in tags)
+
+    def bump_committed(self, tags: Iterable[str]) -> None:
+        table = models.ResponseCacheGeneration.__table__
+        with self._session_factory() as db, db.begin():
+            connection = db.connection()
+            insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+            for tag in sorted(tags):
+                statement = insert(table).values(tag=tag, generation=1)
+                connection.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=[table.c.tag],
+                        set_={"generation": table.c.generation + 1},
+                    )
+                )
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_entries: int,
+        generations: MemoryGenerations | DatabaseGenerations | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.generations = generations or MemoryGenerations()
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def serve(
+        self,
+        key: str,
+        tags: tuple[str, ...],
+        compute: Callable[[], Any],
+        response: Response | None = None,
+        db: Session | None = None,
+    ) -> Any:
+        """
+        The cached result for `key`, or `compute()`'s result after caching it.
+
+        Headers that `compute` sets on `response` are stored with the entry and
+        replayed on hits. Exceptions (404s and the like) are never cached.
+        Pass the request's session as `db`: the `database` backend reads the
+        generations on it rather than checking out a second connection.
+        """
+        if not self.enabled:
+            return compute()
+
+        generations = self.generations.current(tags, db)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.generations == generations and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                if entry is not None:
+                    self.stale += 1
+                entry = None
+                self.misses += 1
+
+        if entry is not None:
+            if response is not None:
+                response.headers.update(entry.headers)
+            return entry.value
+
+        before = dict(response.headers) if response is not None else {}
+        value = compute()
+        headers = {
+            name: header
+            for name, header in (response.headers.items() if response is not None else ())
+            if before.get(name) != header
+        }
+        self._store(key, _Entry(value, headers, generations, now + self.ttl_seconds))
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float | int | str]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "database" if isinstance(self.generations, DatabaseGenerations) else "memory",
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "stale": self.stale,
+                "evictions": self.evictions,
+            }
+
+    def _store(self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+def cache_key(route: str, **params: object) -> str:
+    """`route?sorted&params`, skipping the ones left at None."""
+    query = urlencode(sorted((name, str(value)) for name, value in params.items() if value is not None))
+    return f"{route}?{query}"
+
+
+def _cache_session() -> Session:
+    from src.database.db import SessionLocal
+
+    return SessionLocal()
+
+
+def _build_cache() -> ResponseCache:
+    cfg = read_config(required=False)
+    backend = str(cfg.get("RSP_RESPONSE_CACHE_BACKEND") or "memory").strip().lower()
+    if backend == "database":
+        generations: MemoryGenerations | DatabaseGenerations = DatabaseGenerations(_cache_session)
+    elif backend == "memory":
+        generations = MemoryGenerations()
+    else:
+        raise ValueError(
+            f"Unknown RSP_RESPONSE_CACHE_BACKEND '{backend}' (expected 'memory' or 'database')"
+        )
+    return ResponseCache(
+        ttl_seconds=int(cfg.get("RSP_RESPONSE_CACHE_TTL_SECONDS", 30)),
+        max_entries=int(cfg.get("RSP_RESPONSE_CACHE_MAX_ENTRIES", 1000)),
+        generations=generations,
+    )
+
+
+cache = _build_cache()
+
+
+def _changed_fields(instance) -> set[str]:
+    return {attr.key for attr in inspect(instance).attrs if attr.history.has_changes()}
+
+
+def _touched_tags(session: Session) -> set[str]:
+    tags: set[str] = set()
+    for instance in (*session.new, *session.deleted):
+        if isinstance(instance, _POST_ROWS):
+            tags.add(POSTS)
+        elif isinstance(instance, _DISCUSSION_ROWS):
+            tags.add(DISCUSSION)
+        elif isinstance(instance, models.User):
+            tags.add(USERS)
+    for instance in session.dirty:
+        if isinstance(instance, _POST_ROWS):
+            tags.add(POSTS)
+        elif isinstance(instance, _DISCUSSION_ROWS):
+            tags.add(DISCUSSION)
+        elif isinstance(instance, models.User):
+            changed = _changed_fields(instance)
+            if changed & _USER_FIELDS:
+                tags.add(USERS)
+            # Post listings embed the poster's username and role.
+            if changed & _POSTER_FIELDS:
+                tags.add(POSTS)
+    return tags
+
+
+def invalidate(session: Session, tags: Iterable[str]) -> None:
+    """Invalidate `tags` when `session` commits; for writes the flush hooks cannot see (bulk inserts, raw SQL)."""
+    session.info.setdefault(_PENDING_TAGS_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_tags(session: Session, _flush_context) -> None:
+    tags = _touched_tags(session)
+    if tags:
+        invalidate(session, tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _tags_committed(session: Session) -> None:
+    tags = session.info.pop(_PENDING_TAGS_KEY, None)
+    if tags:
+        session.info.setdefault(_COMMITTED_TAGS_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_tags(session: Session) -> None:
+    session.info.pop(_PENDING_TAGS_KEY, None)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _invalidate_committed(session: Session, transaction) -> None:
+    # Fires after the session has returned its connection, so the bump never holds a second one.
+    if transaction.parent is None:
+        tags = session.info.pop(_COMMITTED_TAGS_KEY, None)
+        if tags:
+            cache.generations.bump_committed(tags)
@@ -1,17 +1,38 @@
 from typing import Annotated
-from fastapi import Depends, APIRouter, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import Depends, APIRouter, Header, HTTPException, Response, status
+from sqlalchemy.orm import Session, joinedload
 
 from src.database.db import get_db
 from src.database import models
 from src.backend.services.schemas import ReviewCreate, ReviewRead, VoteRequest
-from src.backend.services.user_service import get_current_user
+from src.backend.services.user_service import get_current_user, invalidate_cached_user
+from src.backend.services import revisions, vote_service
 
 router = APIRouter()
 
 
+def _to_review_read(review: models.Review) -> ReviewRead:
+    return ReviewRead(
+        id=review.id,
+        post_id=review.post_id,
+        reviewer_id=review.reviewer_id,
+        reviewer_username=review.reviewer.username if review.reviewer else "Unknown",
+        body=review.body,
+        is_positive=review.is_positive,
+        strengths=review.strengths,
+        weaknesses=review.weaknesses,
+        upvotes=review.upvotes,
+        downvotes=review.downvotes,
+        created_at=review.created_at,
+    )
+
+
+def _reviews_query(db: Session):
+    return db.query(models.Review).options(joinedload(models.Review.reviewer))
+
+
 @router.post("/posts/{post_id}/reviews", response_model=ReviewRead, status_code=status.HTTP_201_CREATED)
-async def create_review(
+def create_review(
     post_id: int,
     review_data: ReviewCreate,
     current_user: models.User = Depends(get_current_user),
@@ -59,6 +80,7 @@ async def create_review(
     )
 
     db.add(review)
+    vote_service.adjust_review_count(db, post_id, 1)
     db.commit()
     db.refresh(review)
 
@@ -74,99 +96,48 @@ async def create_review(
         if post_author and post_author.role == models.UserRole.USER:
             post_author.role = models.UserRole.RESEARCHER
             db.commit()
+            invalidate_cached_user(post_author.id)
 
-    upvotes = sum(1 for vote in review.review_votes if vote.value == 1)
-    downvotes = sum(1 for vote in review.review_votes if vote.value == -1)
-
-    return ReviewRead(
-        id=review.id,
-        post_id=review.post_id,
-        reviewer_id=review.reviewer_id,
-        reviewer_username=current_user.username,
-        body=review.body,
-        is_positive=review.is_positive,
-        strengths=review.strengths,
-        weaknesses=review.weaknesses,
-        upvotes=upvotes,
-        downvotes=downvotes,
-        created_at=review.created_at,
-    )
+    return _to_review_read(review)
 
 
 @router.get("/posts/{post_id}/reviews", response_model=list[ReviewRead])
-async def get_post_reviews(
+def get_post_reviews(
     post_id: int,
     db: Session = Depends(get_db),
+    response: Response = None,  # type: ignore[assignment]
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
     """Get all reviews for a post"""
-    from sqlalchemy.orm import joinedload
+    stamp = revisions.post_stamp(db, post_id)
+    if stamp is not None:
+        etag = revisions.make_etag("reviews", post_id, stamp[0])
+        not_modified = revisions.conditional(if_none_match, etag, response)
+        if not_modified is not None:
+            return not_modified
     reviews = (
-        db.query(models.Review)
-        .options(joinedload(models.Review.review_votes))
+        _reviews_query(db)
         .filter(models.Review.post_id == post_id)
+        .order_by(models.Review.created_at, models.Review.id)
         .all()
     )
-    
-    result = []
-    for review in reviews:
-        reviewer = db.query(models.User).filter(models.User.id == review.reviewer_id).first()
-        upvotes = sum(1 for vote in review.review_votes if vote.value == 1)
-        downvotes = sum(1 for vote in review.review_votes if vote.value == -1)
-        result.append(
-            ReviewRead(
-                id=review.id,
-                post_id=review.post_id,
-                reviewer_id=review.reviewer_id,
-                reviewer_username=reviewer.username if reviewer else "Unknown",
-                body=review.body,
-                is_positive=review.is_positive,
-                strengths=review.strengths,
-                weaknesses=review.weaknesses,
-                
-                created_at=review.created_at,
-            )
-        )
-    
-    return result
+    return [_to_review_read(review) for review in reviews]
 
 
 @router.get("/reviews/{review_id}", response_model=ReviewRead)
-async def get_review(
+def get_review(
     review_id: int,
     db: Session = Depends(get_db)
 ):
     """Get a single review by ID with vote counts"""
-    from sqlalchemy.orm import joinedload
-    review = (
-        db.query(models.Review)
-        .options(joinedload(models.Review.review_votes))
-        .filter(models.Review.id == review_id)
-        .first()
-    )
+    review = _reviews_query(db).filter(models.Review.id == review_id).first()
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
-    
-    reviewer = db.query(models.User).filter(models.User.id == review.reviewer_id).first()
-    upvotes = sum(1 for vote in review.review_votes if vote.value == 1)
-    downvotes = sum(1 for vote in review.review_votes if vote.value == -1)
-    
-    return ReviewRead(
-        id=review.id,
-        post_id=review.post_id,
-        reviewer_id=review.reviewer_id,
-        reviewer_username=reviewer.username if reviewer else "Unknown",
-        body=review.body,
-        is_positive=review.is_positive,
-        strengths=review.strengths,
-        weaknesses=review.weaknesses,
-        upvotes=upvotes,
-        downvotes=downvotes,
-        created_at=review.created_at,
-    )
+    return _to_review_read(review)
 
 
 @router.post("/reviews/{review_id}/vote", response_model=ReviewRead)
-async def vote_on_review(
+def vote_on_review(
     review_id: int,
     vote: VoteRequest,
     db: Session = Depends(get_db),
@@ -178,45 +149,6 @@ async def vote_on_review(
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     
-    existing_vote = db.query(models.ReviewVote).filter(
-        models.ReviewVote.user_id == current_user.id,
-        models.ReviewVote.review_id == review_id
-    ).first()
-    
-    if existing_vote:
-        if existing_vote.value == vote.value:
-            
-            db.delete(existing_vote)
-        else:
-            
-            existing_vote.value = vote.value
-    else:
-        
-        new_vote = models.ReviewVote(
-            user_id=current_user.id,
-            review_id=review_id,
-            value=vote.value
-        )
-        db.add(new_vote)
-    
-    db.commit()
-    db.refresh(review)
-    
-    
-    reviewer = db.query(models.User).filter(models.User.id == review.reviewer_id).first()
-    upvotes = sum(1 for vote in review.review_votes if vote.value == 1)
-    downvotes = sum(1 for vote in review.review_votes if vote.value == -1)
-    
-    return ReviewRead(
-        id=review.id,
-        post_id=review.post_id,
-        reviewer_id=review.reviewer_id,
-        reviewer_username=reviewer.username if reviewer else "Unknown",
-        body=review.body,
-        is_positive=review.is_positive,
-        strengths=review.strengths,
-        weaknesses=review.weaknesses,
-        upvotes=upvotes,
-        downvotes=downvotes,
-        created_at=review.created_at,
-    )
+    vote_service.vote_review(db, current_user.id, review_id, vote.value)
+    review = _reviews_query(db).filter(models.Review.id == review_id).one()
+    return _to_review_read(review)
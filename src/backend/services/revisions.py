@@ -0,0 +1,177 @@
+"""Revision counters and ETags for conditional GETs.
+
+Every flush that touches a post, or anything rendered with it (comments,
+reviews, votes, attachments), bumps `posts.revision` in the same transaction;
+changes to a user row bump `users.revision`. The feed has one counter of its
+own, the single `feed_revision` row. Every writer would queue on that row's
+lock, so it is bumped only once the write has committed and the writer's
+connection is back in the pool, in a short transaction of its own. Read
+endpoints turn a primary-key read of these counters into a weak ETag and
+answer a matching `If-None-Match` with 304 before running their real query.
+"""
+
+from __future__ import annotations
+
+from fastapi import Response
+from sqlalchemy import Connection, event, exists, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from src.backend.services.change_feed import post_id_of
+from src.database import models
+
+_POST_CONTENT = (
+    models.Post,
+    models.Comment,
+    models.Review,
+    models.Attachment,
+    models.PostVote,
+    models.CommentVote,
+    models.ReviewVote,
+)
+# What the feed renders or sorts by: posts with their tags, attachments, votes and review counts.
+_FEED_CONTENT = (models.Post, models.Attachment, models.PostVote, models.Review)
+# The poster fields shown with each post in the feed.
+_POSTER_FIELDS = ("username", "role")
+_FEED_ROW_ID = 1
+
+_FEED_PENDING_KEY = "_revisions_feed_pending"
+_FEED_COMMITTED_KEY = "_revisions_feed_committed"
+
+
+def make_etag(*parts: object) -> str:
+    return 'W/"' + ".".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def conditional(if_none_match: str | None, etag: str, response: Response | None) -> Response | None:
+    """
+    The 304 response to return when the client's copy is current; otherwise
+    None, after putting the ETag on `response` for the full answer.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    if response is not None:
+        response.headers.update(headers)
+    return None
+
+
+def post_stamp(db: Session, post_id: int) -> tuple[int, int] | None:
+    """(post revision, poster revision), or None if the post does not exist."""
+    row = db.execute(
+        select(models.Post.revision, models.User.revision)
+        .join(models.User, models.User.id == models.Post.poster_id)
+        .where(models.Post.id == post_id)
+    ).first()
+    return None if row is None else (row[0], row[1])
+
+
+def user_stamp(db: Session, username: str) -> int | None:
+    return db.scalar(select(models.User.revision).where(models.User.username == username))
+
+
+def feed_stamp(db: Session) -> int:
+    """The feed's revision: one primary-key read, whatever the number of posts."""
+    return db.scalar(select(models.FeedRevision.revision).where(models.FeedRevision.id == _FEED_ROW_ID)) or 0
+
+
+def mark_feed_changed(session: Session) -> None:
+    """Bump the feed's revision once `session` commits; for writes the flush hook cannot see (bulk inserts, Core UPDATEs)."""
+    session.info[_FEED_PENDING_KEY] = True
+
+
+def bump_feed(connection: Connection) -> None:
+    """Move the feed's revision on, on `connection`."""
+    table = models.FeedRevision.__table__
+    insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    connection.execute(
+        insert(table)
+        .values(id=_FEED_ROW_ID, revision=1)
+        .on_conflict_do_update(index_elements=[table.c.id], set_={"revision": table.c.revision + 1})
+    )
+
+
+def bump_posts(connection: Connection, post_ids: set[int]) -> None:
+    """Move the given posts' revisions on; for Core writes the flush hook cannot see."""
+    if post_ids:
+        connection.execute(
+            update(models.Post.__table__)
+            .where(models.Post.__table__.c.id.in_(post_ids))
+            .values(revision=models.Post.__table__.c.revision + 1)
+        )
+
+
+def _renamed_poster(instance: models.User) -> bool:
+    state = inspect(instance)
+    return any(state.attrs[field].history.has_changes() for field in _POSTER_FIELDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_revisions(session: Session, _flush_context) -> None:
+    post_ids: set[int] = set()
+    user_ids: set[int] = set()
+    renamed_user_ids: set[int] = set()
+    feed_changed = False
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, models.User):
+            if instance not in session.deleted:
+                user_ids.add(inspect(instance).dict.get("id"))
+                if instance in session.dirty and _renamed_poster(instance):
+                    renamed_user_ids.add(inspect(instance).dict.get("id"))
+        elif isinstance(instance, _POST_CONTENT):
+            post_ids.add(post_id_of(session, instance))
+            feed_changed = feed_changed or isinstance(instance, _FEED_CONTENT)
+    post_ids.discard(None)  # type: ignore[arg-type]
+    user_ids.discard(None)  # type: ignore[arg-type]
+    renamed_user_ids.discard(None)  # type: ignore[arg-type]
+
+    # Core UPDATEs: they run inside the flush's transaction without re-entering the ORM flush.
+    connection = session.connection()
+    bump_posts(connection, post_ids)
+    if user_ids:
+        connection.execute(
+            update(models.User.__table__)
+            .where(models.User.__table__.c.id.in_(user_ids))
+            .values(revision=models.User.__table__.c.revision + 1)
+        )
+    if renamed_user_ids and not feed_changed:
+        posts = models.Post.__table__
+        feed_changed = bool(connection.scalar(
+            select(
+                exists().where(
+                    posts.c.poster_id.in_(renamed_user_ids),
+                    posts.c.phase == models.PostPhase.PUBLISHED,
+                )
+            )
+        ))
+    if feed_changed:
+        mark_feed_changed(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _feed_committed(session: Session) -> None:
+    if session.info.pop(_FEED_PENDING_KEY, False):
+        session.info[_FEED_COMMITTED_KEY] = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_feed_change(session: Session) -> None:
+    session.info.pop(_FEED_PENDING_KEY, None)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _bump_committed_feed(session: Session, transaction) -> None:
+    # Fires after the session has returned its connection, so the bump never holds a second one.
+    if transaction.parent is None and session.info.pop(_FEED_COMMITTED_KEY, False):
+        with session.get_bind().begin() as connection:
+            bump_feed(connection)
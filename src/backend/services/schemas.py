@@ -1,4 +1,5 @@
 import datetime
+import enum
 from typing import Optional
 from pydantic import BaseModel, EmailStr, field_validator
 from src.database.models import UserRole, PostPhase
@@ -75,6 +76,12 @@ class PostCreate(PostBase):
     model_config = {"extra": "ignore"}
 
 
+class PostSort(str, enum.Enum):
+    NEWEST = "newest"
+    TOP = "top"
+    MOST_REVIEWED = "most_reviewed"
+
+
 class PostRead(PostBase):
     id: int
     poster_id: int
@@ -95,6 +102,22 @@ class AttachmentUploadResponse(BaseModel):
     file_path: str
     mime_type: str
     original_filename: str
+    size_bytes: int
+    sha256: str
+
+
+class PostImportError(BaseModel):
+    line: int
+    message: str
+
+
+class PostImportResult(BaseModel):
+    imported: int
+    rejected: int
+    rows: int
+    seconds: float
+    rows_per_second: float
+    errors: list[PostImportError]
 
 
 class CommentBase(BaseModel):
@@ -134,6 +157,14 @@ class CommentThreadRead(BaseModel):
     downvotes: int = 0
 
 
+class CommentNode(CommentThreadRead):
+    reply_count: int = 0
+    descendant_count: int = 0
+    replies: list["CommentNode"] = []
+    # Set when `reply_count` exceeds the replies included; None means "from the first reply".
+    replies_cursor: Optional[str] = None
+
+
 class VoteRequest(BaseModel):
     value: int
 
@@ -176,6 +207,15 @@ class CommentActivityRead(BaseModel):
         from_attributes = True
 
 
+class UserSummary(BaseModel):
+    profile: UserRead
+    post_count: int
+    comment_count: int
+    review_count: int
+    score: int
+    posts: list[PostRead]
+
+
 class ReviewCreate(BaseModel):
     """
     Schema for creating a review.
@@ -0,0 +1,317 @@
+"""Full-text search over published research posts.
+
+PostgreSQL answers queries from the GIN-indexed ``tsvector`` expressions
+declared in ``src.database.models``. Other dialects (SQLite in tests and
+local runs) use an in-process inverted index that is built once per engine
+and refreshed incrementally from session commit hooks.
+"""
+
+import math
+import re
+import threading
+import weakref
+from bisect import bisect_left, insort
+
+from sqlalchemy import and_, case, event, func, inspect, literal_column, or_, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, selectinload
+
+from src.database import models
+
+MAX_QUERY_LENGTH = 128
+MAX_QUERY_TERMS = 8
+
+FIELD_WEIGHTS: dict[str, float] = {
+    "title": 3.0,
+    "tags": 2.5,
+    "authors_text": 2.0,
+    "abstract": 1.5,
+    "body": 1.0,
+}
+
+_PREFIX_MATCH_FACTOR = 0.6
+_TAG_MATCH_RANK_BONUS = 0.5
+_DIRTY_POSTS_KEY = "_search_index_dirty_post_ids"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str | None) -> list[str]:
+    if not text:
+        return []
+    return [token.lower() for token in _TOKEN_RE.findall(text)]
+
+
+def parse_query(query: str | None) -> list[str]:
+    if not query:
+        return []
+    terms: list[str] = []
+    for token in tokenize(query.strip()[:MAX_QUERY_LENGTH]):
+        if token not in terms:
+            terms.append(token)
+    return terms[:MAX_QUERY_TERMS]
+
+
+class InvertedIndex:
+    """Term -> {post_id: weight} postings with a sorted vocabulary for prefix lookups."""
+
+    def __init__(self) -> None:
+        self._postings: dict[str, dict[int, float]] = {}
+        self._vocabulary: list[str] = []
+        self._documents: dict[int, tuple[str, ...]] = {}
+        self._stale: set[int] = set()
+        self._lock = threading.RLock()
+        self.is_built = False
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(
+        self,
+        post_id: int,
+        *,
+        title: str | None = None,
+        abstract: str | None = None,
+        body: str | None = None,
+        authors_text: str | None = None,
+        tags: list[str] | None = None,
+    ) -> None:
+        fields = {
+            "title": title,
+            "abstract": abstract,
+            "body": body,
+            "authors_text": authors_text,
+            "tags": " ".join(tags or []),
+        }
+        weights: dict[str, float] = {}
+        for field_name, text in fields.items():
+            counts: dict[str, int] = {}
+            for token in tokenize(text):
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                weights[token] = weights.get(token, 0.0) + FIELD_WEIGHTS[field_name] * (
+                    1.0 + math.log(count)
+                )
+
+        with self._lock:
+            self._remove_locked(post_id)
+            for token, weight in weights.items():
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    insort(self._vocabulary, token)
+                postings[post_id] = weight
+            self._documents[post_id] = tuple(weights)
+
+    def remove(self, post_id: int) -> None:
+        with self._lock:
+            self._remove_locked(post_id)
+
+    def _remove_locked(self, post_id: int) -> None:
+        tokens = self._documents.pop(post_id, None)
+        if tokens is None:
+            return
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(post_id, None)
+            if not postings:
+                del self._postings[token]
+                position = bisect_left(self._vocabulary, token)
+                if position < len(self._vocabulary) and self._vocabulary[position] == token:
+                    del self._vocabulary[position]
+
+    def build(self, documents) -> None:
+        with self._lock:
+            if self.is_built:
+                return
+            self._stale.clear()
+            for post_id, fields in documents():
+                self.add(post_id, **fields)
+            self.is_built = True
+
+    def mark_stale(self, post_ids) -> None:
+        with self._lock:
+            self._stale.update(post_ids)
+
+    def take_stale(self) -> set[int]:
+        with self._lock:
+            stale, self._stale = self._stale, set()
+            return stale
+
+    def _matching_terms(self, term: str) -> list[str]:
+        # Walk the sorted vocabulary by index from the first candidate; slicing would copy its whole tail.
+        vocabulary = self._vocabulary
+        matches: list[str] = []
+        index = bisect_left(vocabulary, term)
+        while index < len(vocabulary) and vocabulary[index].startswith(term):
+            matches.append(vocabulary[index])
+            index += 1
+        return matches
+
+    def search(self, terms: list[str], limit: int | None = None) -> list[tuple[int, float]]:
+        """Rank documents containing every term (as a word or word prefix)."""
+        if not terms:
+            return []
+
+        with self._lock:
+            total_documents = max(len(self._documents), 1)
+            per_term_scores: list[dict[int, float]] = []
+            for term in terms:
+                scores: dict[int, float] = {}
+                for candidate in self._matching_terms(term):
+                    postings = self._postings[candidate]
+                    idf = math.log(1.0 + total_documents / len(postings))
+                    factor = 1.0 if candidate == term else _PREFIX_MATCH_FACTOR
+                    for post_id, weight in postings.items():
+                        scores[post_id] = max(scores.get(post_id, 0.0), weight * idf * factor)
+                if not scores:
+                    return []
+                per_term_scores.append(scores)
+
+        per_term_scores.sort(key=len)
+        ranked: dict[int, float] = dict(per_term_scores[0])
+        for scores in per_term_scores[1:]:
+            ranked = {
+                post_id: score + scores[post_id]
+                for post_id, score in ranked.items()
+                if post_id in scores
+            }
+            if not ranked:
+                return []
+
+        ordered = sorted(ranked.items(), key=lambda item: (-item[1], -item[0]))
+        return ordered[:limit] if limit is not None else ordered
+
+
+_indexes: "weakref.WeakKeyDictionary[Engine, InvertedIndex]" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def _index_for(bind: Engine) -> InvertedIndex:
+    with _indexes_lock:
+        index = _indexes.get(bind)
+        if index is None:
+            index = _indexes[bind] = InvertedIndex()
+        return index
+
+
+def _load_documents(db: Session, post_ids: set[int] | None = None) -> list[models.Post]:
+    query = (
+        db.query(models.Post)
+        .options(selectinload(models.Post.tags))
+        .filter(models.Post.phase == models.PostPhase.PUBLISHED)
+    )
+    if post_ids is not None:
+        query = query.filter(models.Post.id.in_(post_ids))
+    return query.all()
+
+
+def _document_fields(post: models.Post) -> dict:
+    return {
+        "title": post.title,
+        "abstract": post.abstract,
+        "body": post.body,
+        "authors_text": post.authors_text,
+        "tags": [tag.name for tag in post.tags],
+    }
+
+
+def _sync_index(db: Session, index: InvertedIndex) -> None:
+    if not index.is_built:
+        index.build(lambda: ((post.id, _document_fields(post)) for post in _load_documents(db)))
+        return
+
+    stale = index.take_stale()
+    if not stale:
+        return
+    found = {post.id: post for post in _load_documents(db, stale)}
+    for post_id in stale:
+        post = found.get(post_id)
+        if post is None:
+            index.remove(post_id)
+        else:
+            index.add(post_id, **_document_fields(post))
+
+
+def mark_posts_changed(db: Session, post_ids) -> None:
+    """Flag posts written outside the ORM unit of work (bulk inserts, raw SQL)."""
+    index = _indexes.get(db.get_bind())
+    if index is not None:
+        index.mark_stale(post_ids)
+
+
+def _postgres_search(db: Session, terms: list[str], limit: int | None) -> list[tuple[int, float]]:
+    vector = models.post_search_vector()
+    any_term = func.to_tsquery(models.SEARCH_CONFIG, " | ".join(f"{term}:*" for term in terms))
+
+    term_clauses = []
+    tag_hits = []
+    for term in terms:
+        term_query = func.to_tsquery(models.SEARCH_CONFIG, f"{term}:*")
+        tagged_posts = (
+            select(models.post_tags.c.post_id)
+            .join(models.Tag, models.Tag.id == models.post_tags.c.tag_id)
+            .where(models.tag_search_vector().op("@@")(term_query))
+        )
+        term_clauses.append(or_(vector.op("@@")(term_query), models.Post.id.in_(tagged_posts)))
+        tag_hits.append(
+            case((models.Post.id.in_(tagged_posts), literal_column(str(_TAG_MATCH_RANK_BONUS))), else_=0.0)
+        )
+
+    rank = func.ts_rank(vector, any_term)
+    for hit in tag_hits:
+        rank = rank + hit
+    rank = rank.label("rank")
+
+    statement = (
+        select(models.Post.id, rank)
+        .where(models.Post.phase == models.PostPhase.PUBLISHED, and_(*term_clauses))
+        .order_by(rank.desc(), models.Post.id.desc())
+    )
+    if limit is not None:
+        statement = statement.limit(limit)
+    return [(row.id, float(row.rank)) for row in db.execute(statement)]
+
+
+def search_posts(db: Session, query: str | None, limit: int | None = None) -> list[tuple[int, float]]:
+    """Return ``(post_id, score)`` pairs for published posts matching ``query``, best first."""
+    terms = parse_query(query)
+    if not terms:
+        return []
+
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql":
+        return _postgres_search(db, terms, limit)
+
+    index = _index_for(bind)
+    _sync_index(db, index)
+    return index.search(terms, limit)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_posts(session: Session, _flush_context) -> None:
+    changed = {
+        inspect(instance).dict.get("id")
+        for instance in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(instance, models.Post)
+    }
+    changed.discard(None)
+    if changed:
+        session.info.setdefault(_DIRTY_POSTS_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed_posts_stale(session: Session) -> None:
+    changed = session.info.pop(_DIRTY_POSTS_KEY, None)
+    if not changed:
+        return
+    index = _indexes.get(session.get_bind())
+    if index is not None:
+        index.mark_stale(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_posts(session: Session) -> None:
+    session.info.pop(_DIRTY_POSTS_KEY, None)
@@ -0,0 +1,28 @@
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from src.database.models import Tag
+
+
+def upsert_tags(db: Session, names: Iterable[str]) -> list[Tag]:
+    """
+    The `Tag` rows for `names`, creating the missing ones, in first-seen order
+    without duplicates. Two statements whatever the number of tags: one
+    `INSERT ... ON CONFLICT DO NOTHING` and one SELECT, both in the caller's
+    transaction, so a concurrent insert of the same name is not an error.
+    """
+    names = list(dict.fromkeys(name for name in names if name))
+    if not names:
+        return []
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    db.execute(
+        insert(Tag)
+        .values([{"name": name} for name in names])
+        .on_conflict_do_nothing(index_elements=[Tag.name])
+    )
+    by_name = {tag.name: tag for tag in db.scalars(select(Tag).where(Tag.name.in_(names)))}
+    return [by_name[name] for name in names]
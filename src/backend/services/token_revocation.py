@@ -0,0 +1,126 @@
+"""Revoked-token stores keyed by JWT `jti`; entries are dropped once the token's `exp` has passed."""
+
+from __future__ import annotations
+
+import heapq
+import time
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Callable, Protocol
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.database.models import RevokedToken
+
+
+class RevocationStore(Protocol):
+    def revoke(self, jti: str, expires_at: float) -> None: ...
+
+    def is_revoked(self, jti: str, db: Session | None = None) -> bool: ...
+
+    def prune(self) -> int: ...
+
+    def clear(self) -> None: ...
+
+
+class InMemoryRevocationStore:
+    """Per-process store; a min-heap on `exp` lets pruning pop only the expired entries."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = Lock()
+        self._expiry_by_jti: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._expiry_by_jti)
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            self._prune_locked(self._clock())
+            if expires_at <= self._clock():
+                return
+            if self._expiry_by_jti.get(jti, float("-inf")) >= expires_at:
+                return
+            self._expiry_by_jti[jti] = expires_at
+            heapq.heappush(self._heap, (expires_at, jti))
+
+    def is_revoked(self, jti: str, db: Session | None = None) -> bool:
+        with self._lock:
+            now = self._clock()
+            self._prune_locked(now)
+            expires_at = self._expiry_by_jti.get(jti)
+            return expires_at is not None and expires_at > now
+
+    def prune(self) -> int:
+        with self._lock:
+            return self._prune_locked(self._clock())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expiry_by_jti.clear()
+            self._heap.clear()
+
+    def _prune_locked(self, now: float) -> int:
+        pruned = 0
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, jti = heapq.heappop(self._heap)
+            # A re-revoked jti leaves an older heap entry behind; only the latest one owns the key.
+            if self._expiry_by_jti.get(jti) == expires_at:
+                del self._expiry_by_jti[jti]
+                pruned += 1
+        return pruned
+
+
+def _as_datetime(epoch_seconds: float) -> datetime:
+    return datetime.fromtimestamp(epoch_seconds, tz=timezone.utc)
+
+
+class DatabaseRevocationStore:
+    """Shared store backed by the `revoked_tokens` table, so every worker sees every logout."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._session_factory = session_factory
+        self._clock = clock
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        if expires_at <= self._clock():
+            return
+        with self._session_factory() as db:
+            db.merge(RevokedToken(jti=jti, expires_at=_as_datetime(expires_at)))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another worker revoked the same token concurrently.
+                db.rollback()
+
+    def is_revoked(self, jti: str, db: Session | None = None) -> bool:
+        """Checked on `db`, the request's session; a session of our own only when there is none."""
+        query = select(RevokedToken.jti).where(
+            RevokedToken.jti == jti,
+            RevokedToken.expires_at > _as_datetime(self._clock()),
+        )
+        if db is not None:
+            return db.execute(query).first() is not None
+        with self._session_factory() as own:
+            return own.execute(query).first() is not None
+
+    def prune(self) -> int:
+        with self._session_factory() as db:
+            result = db.execute(
+                delete(RevokedToken).where(RevokedToken.expires_at <= _as_datetime(self._clock()))
+            )
+            db.commit()
+            return result.rowcount
+
+    def clear(self) -> None:
+        with self._session_factory() as db:
+            db.execute(delete(RevokedToken))
+            db.commit()
@@ -1,14 +1,14 @@
-import smtplib
+import hashlib
+import uuid
 from datetime import datetime, timedelta, timezone
-from email.message import EmailMessage
 from typing import Annotated
-from threading import Lock
 
-from fastapi import Depends, HTTPException, status, APIRouter, Query, BackgroundTasks
+from fastapi import Depends, HTTPException, status, APIRouter, Query, BackgroundTasks, Header, Response
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, inspect, select
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from src.database.db import get_db
 from src.database import models
@@ -25,9 +25,19 @@ from src.backend.services.schemas import (
     PasswordResetConfirm,
     CommentActivityRead,
     PromotionRequest,
+    UserSummary,
 )
 
 from src.backend.config.config_utils import read_config
+from src.backend.services import attachment_store, email_outbox, response_cache, revisions
+from src.backend.services.auth_cache import Principal, PrincipalCache
+from src.backend.services.paths import ATTACHMENTS_DIR
+from src.backend.services.password_hashing import HashingPool, HashingPoolSaturated
+from src.backend.services.token_revocation import (
+    DatabaseRevocationStore,
+    InMemoryRevocationStore,
+    RevocationStore,
+)
 from src.database.models import User
 import logging
 
@@ -50,10 +60,34 @@ EMAIL_SENDER = str(cfg["RSP_SMTP_SENDER"])
 EMAIL_PASSWORD = str(cfg["RSP_SMTP_PASSWORD"])
 EMAIL_SMTP_SERVER = str(cfg["RSP_SMTP_SERVER"])
 EMAIL_SMTP_PORT = int(cfg["RSP_SMTP_PORT"])
+EMAIL_SMTP_STARTTLS = str(cfg.get("RSP_SMTP_STARTTLS") or "true").lower() not in ("0", "false", "no")
+EMAIL_OUTBOX_INTERVAL_SECONDS = int(cfg.get("RSP_EMAIL_OUTBOX_INTERVAL_SECONDS", 5))
+EMAIL_MAX_ATTEMPTS = int(cfg.get("RSP_EMAIL_MAX_ATTEMPTS", 8))
+EMAIL_RETRY_BASE_SECONDS = int(cfg.get("RSP_EMAIL_RETRY_BASE_SECONDS", 30))
+EMAIL_OUTBOX_JOB_ID = "deliver_email_outbox"
+ATTACHMENT_GC_INTERVAL_MINUTES = int(cfg.get("RSP_ATTACHMENT_GC_INTERVAL_MINUTES", 60))
+ATTACHMENT_GC_GRACE_HOURS = int(cfg.get("RSP_ATTACHMENT_GC_GRACE_HOURS", 24))
+ATTACHMENT_GC_JOB_ID = "sweep_orphaned_attachments"
 
 EMAIL_LINK_BASE = str(cfg["RSP_EMAIL_LINK_BASE"])
 RESET_PASSWORD_LINK_BASE = str(cfg["RSP_EMAIL_RESET_LINK_BASE"])
 
+AUTH_CACHE_TTL_SECONDS = int(cfg.get("RSP_AUTH_CACHE_TTL_SECONDS", 30))
+AUTH_CACHE_MAX_ENTRIES = int(cfg.get("RSP_AUTH_CACHE_MAX_ENTRIES", 10_000))
+ARGON2_SETTINGS = {
+    f"argon2__{name}": int(cfg[key])
+    for name, key in (
+        ("time_cost", "RSP_ARGON2_TIME_COST"),
+        ("memory_cost", "RSP_ARGON2_MEMORY_COST"),
+        ("parallelism", "RSP_ARGON2_PARALLELISM"),
+    )
+    if cfg.get(key) is not None
+}
+PASSWORD_HASH_WORKERS = int(cfg.get("RSP_PASSWORD_HASH_WORKERS", 2))
+# Every waiting call holds a request thread, so the default keeps the queue far below the threadpool's 40.
+PASSWORD_HASH_MAX_QUEUE = int(cfg.get("RSP_PASSWORD_HASH_MAX_QUEUE", 2 * PASSWORD_HASH_WORKERS))
+TOKEN_REVOCATION_BACKEND = str(cfg.get("RSP_TOKEN_REVOCATION_BACKEND") or "memory").lower()
+
 def _normalize_email(email: str) -> str:
     return email.strip().lower()
 
@@ -63,23 +97,79 @@ MODERATOR_EMAILS: set[str] = {
     if isinstance(email, str) and email.strip()
 }
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(schemes=["argon2"], deprecated="auto", **ARGON2_SETTINGS)
+_hashing_pool = HashingPool(max_workers=PASSWORD_HASH_WORKERS, max_queue=PASSWORD_HASH_MAX_QUEUE)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
 
 router = APIRouter()
 scheduler = BackgroundScheduler()
-_revoked_tokens: set[str] = set()
-_revoked_tokens_lock = Lock()
+
+
+def _revocation_session() -> Session:
+    return next(get_db())
+
+
+def _build_revocation_store() -> RevocationStore:
+    if TOKEN_REVOCATION_BACKEND == "database":
+        return DatabaseRevocationStore(_revocation_session)
+    if TOKEN_REVOCATION_BACKEND != "memory":
+        raise ValueError(
+            f"Unknown RSP_TOKEN_REVOCATION_BACKEND '{TOKEN_REVOCATION_BACKEND}' (expected 'memory' or 'database')"
+        )
+    return InMemoryRevocationStore()
+
+
+_revoked_tokens: RevocationStore = _build_revocation_store()
+_outbox_smtp = email_outbox.PooledSMTP(
+    EMAIL_SMTP_SERVER,
+    EMAIL_SMTP_PORT,
+    username=EMAIL_SENDER,
+    password=EMAIL_PASSWORD,
+    use_starttls=EMAIL_SMTP_STARTTLS,
+)
+_principal_cache = PrincipalCache(
+    ttl_seconds=AUTH_CACHE_TTL_SECONDS,
+    max_entries=AUTH_CACHE_MAX_ENTRIES,
+)
+_attachment_gc_totals = attachment_store.SweepResult()
+
+
+def _revocation_key(token: str, claims: dict) -> str:
+    jti = claims.get("jti")
+    if isinstance(jti, str) and jti:
+        return jti
+    # Tokens issued before `jti` was added are keyed by digest instead.
+    return hashlib.sha256(token.encode()).hexdigest()
 
 
 def revoke_token(token: str) -> None:
-    with _revoked_tokens_lock:
-        _revoked_tokens.add(token)
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        # Invalid or already expired tokens are rejected anyway.
+        return
+    expires_at = claims.get("exp")
+    if not isinstance(expires_at, (int, float)):
+        expires_at = (datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)).timestamp()
+    _revoked_tokens.revoke(_revocation_key(token, claims), float(expires_at))
+    _principal_cache.invalidate_token(token)
+
+
+def is_token_revoked(token: str, db: Session | None = None) -> bool:
+    try:
+        claims = jwt.get_unverified_claims(token)
+    except JWTError:
+        return False
+    return _revoked_tokens.is_revoked(_revocation_key(token, claims), db)
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop cached principals for `user_id`; call after committing changes to that user row."""
+    _principal_cache.invalidate_user(user_id)
 
 
-def is_token_revoked(token: str) -> bool:
-    with _revoked_tokens_lock:
-        return token in _revoked_tokens
+def auth_cache_stats() -> dict[str, float | int]:
+    return _principal_cache.stats()
 
 
 def _extract_argon_salt(hashed_password: str) -> str:
@@ -90,13 +180,34 @@ def _extract_argon_salt(hashed_password: str) -> str:
     return parts[4]
 
 
+def _run_hashing(fn, *args):
+    try:
+        return _hashing_pool.run(fn, *args)
+    except HashingPoolSaturated as exc:
+        logging.warning("⏳ Password hashing pool saturated, rejecting request")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy. Please try again shortly.",
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+
+def password_hashing_stats() -> dict[str, float | int]:
+    return _hashing_pool.stats()
+
+
 def get_password_hash(password: str) -> tuple[str, str]:
-    hashed = pwd_context.hash(password)
+    hashed = _run_hashing(pwd_context.hash, password)
     return hashed, _extract_argon_salt(hashed)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _run_hashing(pwd_context.verify, plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify, and if the hash uses outdated argon2 parameters also return a fresh hash."""
+    return _run_hashing(pwd_context.verify_and_update, plain_password, hashed_password)
 
 
 def create_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -104,6 +215,7 @@ def create_token(data: dict, expires_delta: timedelta | None = None) -> str:
     expire = datetime.now(
         timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode["exp"] = expire
+    to_encode.setdefault("jti", uuid.uuid4().hex)
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -111,7 +223,7 @@ def create_token(data: dict, expires_delta: timedelta | None = None) -> str:
 def get_user_by_username(db: Session, username: str) -> models.User | None:
     return db.query(models.User).filter(models.User.username == username).first()
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -130,7 +242,14 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    if is_token_revoked(token):
+    principal = _principal_cache.get(token)
+    if principal is not None:
+        if _revoked_tokens.is_revoked(principal.revocation_key, db):
+            logging.warning("Attempt to use revoked token")
+            raise token_revoked_exception
+        return principal.attach(db, models.User)
+
+    if is_token_revoked(token, db):
         logging.warning("Attempt to use revoked token")
         raise token_revoked_exception
 
@@ -151,6 +270,11 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     if user is None:
         logging.error(f"User not found for username: {token_data.username}")
         raise user_lost_exception
+    _principal_cache.put(
+        token,
+        Principal(user_id=user.id, role=user.role, revocation_key=_revocation_key(token, payload)),
+        token_expires_at=payload.get("exp"),
+    )
     return user
 
 
@@ -205,20 +329,16 @@ def register_user(
         created_at=datetime.now(timezone.utc),
     )
     db.add(db_user)
+    # Queued in the same transaction as the user, so neither exists without the other
+    # and the request never waits on the SMTP server.
+    email_outbox.enqueue_email(
+        db,
+        recipient=user_in.email,
+        subject=VERIFICATION_EMAIL_SUBJECT,
+        body=_verification_email_body(verification_link),
+    )
     db.commit()
-
-    try:
-        send_verification_email(user_in.email, verification_link)
-    except Exception:
-        logging.exception(
-            "❌ Failed to send verification email during registration; rolling back user creation."
-        )
-        db.delete(db_user)
-        db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Unable to send verification email. Please try again later.",
-        )
+    wake_email_outbox_worker()
 
     logging.info("✅ User created successfully.")
 
@@ -230,12 +350,12 @@ def register_user(
     )
 
 
-def send_verification_email(recipient_email: str, verification_link: str):
-    msg = EmailMessage()
-    msg['Subject'] = 'Verify your email for Research Showcase Portal'
-    msg['From'] = EMAIL_SENDER
-    msg['To'] = recipient_email
-    msg.set_content(
+VERIFICATION_EMAIL_SUBJECT = "Verify your email for Research Showcase Portal"
+PASSWORD_RESET_EMAIL_SUBJECT = "Reset your Research Showcase Portal password"
+
+
+def _verification_email_body(verification_link: str) -> str:
+    return (
         f'Hello!\n\n'
         f'Please verify your email address by clicking the link below:\n\n'
         f'{verification_link}\n\n'
@@ -246,23 +366,9 @@ def send_verification_email(recipient_email: str, verification_link: str):
         f'Research Showcase Portal Team'
     )
 
-    try:
-        with smtplib.SMTP(EMAIL_SMTP_SERVER, EMAIL_SMTP_PORT) as server: # type: ignore
-            server.starttls()
-            server.login(EMAIL_SENDER, EMAIL_PASSWORD) # type: ignore
-            server.send_message(msg)
-            logging.info(f"✅ Verification email sent to {recipient_email}")
-    except Exception:
-        logging.exception("❌ Failed to send verification email")
-        raise
-
-
-def send_password_reset_email(recipient_email: str, reset_link: str) -> None:
-    msg = EmailMessage()
-    msg["Subject"] = "Reset your Research Showcase Portal password"
-    msg["From"] = EMAIL_SENDER
-    msg["To"] = recipient_email
-    msg.set_content(
+
+def _password_reset_email_body(reset_link: str) -> str:
+    return (
         f"Hello!\n\n"
         f"We received a request to reset your password.\n\n"
         f"Reset your password using the link below:\n\n"
@@ -273,11 +379,6 @@ def send_password_reset_email(recipient_email: str, reset_link: str) -> None:
         f"Research Showcase Portal Team"
     )
 
-    with smtplib.SMTP(EMAIL_SMTP_SERVER, EMAIL_SMTP_PORT) as server: # type: ignore
-        server.starttls()
-        server.login(EMAIL_SENDER, EMAIL_PASSWORD) # type: ignore
-        server.send_message(msg)
-
 
 @router.post("/request-password-reset")
 def request_password_reset(
@@ -291,11 +392,15 @@ def request_password_reset(
             expires_delta=timedelta(minutes=EMAIL_TOKEN_EXPIRE_MINUTES),
         )
         reset_link = RESET_PASSWORD_LINK_BASE + reset_token
-        try:
-            send_password_reset_email(user.email, reset_link)
-            logging.info("Password reset email sent to %s", user.email)
-        except Exception:
-            logging.exception("Failed to send password reset email")
+        email_outbox.enqueue_email(
+            db,
+            recipient=user.email,
+            subject=PASSWORD_RESET_EMAIL_SUBJECT,
+            body=_password_reset_email_body(reset_link),
+        )
+        db.commit()
+        wake_email_outbox_worker()
+        logging.info("Password reset email queued for %s", user.email)
 
     return {
         "message": "If an account exists for that email, a reset link has been sent."
@@ -340,6 +445,7 @@ def reset_password(
     user.password_salt = password_salt
     db.add(user)
     db.commit()
+    invalidate_cached_user(user.id)
 
     return {"message": "Password updated successfully"}
 
@@ -376,6 +482,7 @@ def verify_email(token: Annotated[str, Query(...)], db: Session = Depends(get_db
 
     user.is_email_verified = True
     db.commit()
+    invalidate_cached_user(user.id)
     logging.info(f"✅ Email successfully verified for user: {email}")
 
     return {"message": "Email successfully verified"}
@@ -389,10 +496,13 @@ def delete_expired_users(db: Session):
         models.User.created_at < expiration_threshold
     ).all()
 
+    expired_user_ids = [user.id for user in expired_users]
     for user in expired_users:
         logging.info(f"Deleting expired unverified user: {user.username}")
         db.delete(user)
     db.commit()
+    for user_id in expired_user_ids:
+        invalidate_cached_user(user_id)
 
 
 def start_cleanup_scheduler():
@@ -402,6 +512,8 @@ def start_cleanup_scheduler():
         db = next(get_db())
         try:
             delete_expired_users(db)
+            pruned = _revoked_tokens.prune()
+            logging.info(f"Pruned {pruned} expired revoked token(s)")
         finally:
             logging.info("Cleanup job finished")
             db.close()
@@ -423,6 +535,94 @@ def stop_cleanup_scheduler() -> None:
     scheduler.shutdown(wait=False)
 
 
+def deliver_email_outbox() -> dict[str, int]:
+    db = next(get_db())
+    try:
+        return email_outbox.deliver_pending(
+            db,
+            _outbox_smtp,
+            sender=EMAIL_SENDER,
+            max_attempts=EMAIL_MAX_ATTEMPTS,
+            retry_base_seconds=EMAIL_RETRY_BASE_SECONDS,
+        )
+    finally:
+        db.close()
+
+
+def start_email_outbox_worker() -> None:
+    scheduler.add_job(
+        deliver_email_outbox,
+        trigger=IntervalTrigger(seconds=EMAIL_OUTBOX_INTERVAL_SECONDS),
+        id=EMAIL_OUTBOX_JOB_ID,
+        name='Deliver queued emails',
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True
+    )
+    if not getattr(scheduler, "running", False):
+        scheduler.start()
+
+
+def wake_email_outbox_worker() -> None:
+    """Run the outbox job now instead of at its next interval; a no-op when the worker is not running."""
+    if not getattr(scheduler, "running", False):
+        return
+    job = scheduler.get_job(EMAIL_OUTBOX_JOB_ID)
+    if job is not None:
+        job.modify(next_run_time=datetime.now(timezone.utc))
+
+
+def stop_email_outbox_worker() -> None:
+    if getattr(scheduler, "running", False) and scheduler.get_job(EMAIL_OUTBOX_JOB_ID) is not None:
+        scheduler.remove_job(EMAIL_OUTBOX_JOB_ID)
+    _outbox_smtp.close()
+
+
+def sweep_orphaned_attachments() -> dict[str, int]:
+    db = next(get_db())
+    try:
+        result = attachment_store.sweep_orphans(
+            db,
+            ATTACHMENTS_DIR,
+            grace_seconds=ATTACHMENT_GC_GRACE_HOURS * 3600,
+        )
+    finally:
+        db.close()
+    _attachment_gc_totals.scanned += result.scanned
+    _attachment_gc_totals.deleted += result.deleted
+    _attachment_gc_totals.reclaimed_bytes += result.reclaimed_bytes
+    logging.info(
+        "Attachment sweep: %s file(s) scanned, %s orphan(s) deleted, %s byte(s) reclaimed",
+        result.scanned,
+        result.deleted,
+        result.reclaimed_bytes,
+    )
+    return result.as_dict()
+
+
+def attachment_gc_stats() -> dict[str, int]:
+    return _attachment_gc_totals.as_dict()
+
+
+def start_attachment_gc() -> None:
+    scheduler.add_job(
+        sweep_orphaned_attachments,
+        trigger=IntervalTrigger(minutes=ATTACHMENT_GC_INTERVAL_MINUTES),
+        id=ATTACHMENT_GC_JOB_ID,
+        name='Delete orphaned attachment files',
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True
+    )
+    if not getattr(scheduler, "running", False):
+        scheduler.start()
+
+
+def stop_attachment_gc() -> None:
+    if getattr(scheduler, "running", False) and scheduler.get_job(ATTACHMENT_GC_JOB_ID) is not None:
+        scheduler.remove_job(ATTACHMENT_GC_JOB_ID)
+
+
 @router.post("/login", response_model=Token)
 def login(
         form_data: OAuth2PasswordRequestForm = Depends(),
@@ -437,7 +637,8 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not verify_password(form_data.password, user.password_hash):
+    verified, new_hash = verify_and_update_password(form_data.password, user.password_hash)
+    if not verified:
         logging.error(
             f"Login failed: Incorrect password for user '{form_data.username}'")
         raise HTTPException(
@@ -446,6 +647,13 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if new_hash is not None:
+        logging.info(f"🔁 Rehashing password for user '{user.username}' with current argon2 parameters")
+        user.password_hash = new_hash
+        user.password_salt = _extract_argon_salt(new_hash)
+        db.commit()
+        invalidate_cached_user(user.id)
+
     if not user.is_email_verified:
         logging.error(
             f"Login failed: Email not verified for user '{form_data.username}'")
@@ -460,7 +668,7 @@ def login(
 
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
-async def logout(
+def logout(
         token: str = Depends(oauth2_scheme),
         current_user: models.User = Depends(get_current_user)):
     revoke_token(token)
@@ -469,19 +677,24 @@ async def logout(
 
 
 @router.get("/me", response_model=UserRead)
-async def read_current_user(current_user: models.User = Depends(get_current_user)):
+def read_current_user(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    # A principal-cache hit carries only id and role: load the rest of the row in one SELECT, here on the threadpool.
+    if inspect(current_user).unloaded & UserRead.model_fields.keys():
+        db.refresh(current_user)
     return current_user
 
 
 @router.get("/me/comments", response_model=list[CommentActivityRead])
-async def get_my_recent_comments(
+def get_my_recent_comments(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
     n: Annotated[int, Query(gt=0, le=50)] = 5,
 ) -> list[CommentActivityRead]:
     comments = (
         db.query(models.Comment)
-        .options(joinedload(models.Comment.comment_votes))
         .options(joinedload(models.Comment.post))
         .join(models.Comment.post)
         .filter(
@@ -500,47 +713,68 @@ async def get_my_recent_comments(
             post_title=comment.post.title if comment.post and comment.post.title else "",
             body=comment.body,
             created_at=comment.created_at,
-            upvotes=sum(1 for vote in (comment.comment_votes or []) if vote.value == 1),
-            downvotes=sum(1 for vote in (comment.comment_votes or []) if vote.value == -1),
+            upvotes=comment.upvotes,
+            downvotes=comment.downvotes,
         )
         for comment in comments
     ]
 
 
 @router.get("/count", response_model=int)
-async def get_user_count(
+def get_user_count(
     db: Session = Depends(get_db)
 ):
-    return int(db.query(models.User).count())
+    return response_cache.cache.serve(
+        response_cache.cache_key("users.count"),
+        (response_cache.USERS,),
+        lambda: int(db.query(models.User).count()),
+        db=db,
+    )
 
 
 @router.get("/latest", response_model=list[UserRead])
-async def get_latest_users(
+def get_latest_users(
     db: Session = Depends(get_db),
     n: Annotated[int, Query(gt=0, le=50)] = 10,
 ):
-    users = (
-        db.query(models.User)
-        .order_by(models.User.created_at.desc())
-        .limit(n)
-        .all()
-    )
+    def compute() -> list[UserRead]:
+        users = (
+            db.query(models.User)
+            .order_by(models.User.created_at.desc())
+            .limit(n)
+            .all()
+        )
 
-    profiles: list[UserRead] = []
-    for user in users:
-        profile = UserRead.model_validate(user)
-        if not getattr(user, "is_email_public", False):
-            profile.email = None
-        profiles.append(profile)
+        profiles: list[UserRead] = []
+        for user in users:
+            profile = UserRead.model_validate(user)
+            if not getattr(user, "is_email_public", False):
+                profile.email = None
+            profiles.append(profile)
 
-    return profiles
+        return profiles
+
+    return response_cache.cache.serve(
+        response_cache.cache_key("users.latest", n=n),
+        (response_cache.USERS,),
+        compute,
+        db=db,
+    )
 
 
 @router.get("/{username}", response_model=UserRead)
-async def get_user_profile(
+def get_user_profile(
     username: str,
     db: Session = Depends(get_db),
+    response: Response = None,  # type: ignore[assignment]
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
+    revision = revisions.user_stamp(db, username)
+    if revision is not None:
+        etag = revisions.make_etag("user", username, revision)
+        not_modified = revisions.conditional(if_none_match, etag, response)
+        if not_modified is not None:
+            return not_modified
 
     user = get_user_by_username(db, username)
     if not user:
@@ -579,6 +813,7 @@ def promote_user(
     user.role = payload.role
     logging.info(f"User '{username}' promoted to {payload.role}")
     db.commit()
+    invalidate_cached_user(user.id)
     profile = UserRead.model_validate(user)
     if not getattr(user, "is_email_public", False):
         profile.email = None
@@ -587,7 +822,7 @@ def promote_user(
 
 
 @router.get("/{username}/post_count", response_model=int)
-async def get_user_post_count(
+def get_user_post_count(
     username: str,
     db: Session = Depends(get_db),
 ):
@@ -605,35 +840,90 @@ async def get_user_post_count(
 
 
 @router.get("/{username}/score", response_model=int)
-async def get_user_score(
+def get_user_score(
     username: str,
     db: Session = Depends(get_db),
 ):
-    user = get_user_by_username(db, username)
-    if not user:
+    """The user's stored reputation: one indexed read, however many votes they have received."""
+    reputation = db.query(models.User.reputation).filter(models.User.username == username).scalar()
+    if reputation is None:
         logging.error(f"User '{username}' not found for score retrieval")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
+    return reputation
 
-    post_score = db.query(models.PostVote) \
-        .join(models.Post, models.PostVote.post_id == models.Post.id) \
-        .filter(models.Post.poster_id == user.id) \
-        .with_entities(models.PostVote.value) \
-        .all()
 
-    comment_score = db.query(models.CommentVote) \
-        .join(models.Comment, models.CommentVote.comment_id == models.Comment.id) \
-        .filter(models.Comment.commenter_id == user.id) \
-        .with_entities(models.CommentVote.value) \
-        .all()
+SUMMARY_POST_LIMIT = 10
+
 
-    return sum(vote.value for vote in post_score) + sum(vote.value for vote in comment_score)
+@router.get("/{username}/summary", response_model=UserSummary)
+def get_user_summary(
+    username: str,
+    db: Session = Depends(get_db),
+):
+    """
+    Everything a profile page shows, in four queries: the user with their
+    post, comment and review counts and stored reputation, then their latest
+    published posts with tags and attachments. Cached as one entry.
+    """
+    # post_service imports this module for get_current_user.
+    from src.backend.services.post_service import _to_post_read
+
+    def compute() -> UserSummary:
+        counts = [
+            select(func.count(model.id)).where(author == models.User.id).scalar_subquery()
+            for model, author in (
+                (models.Post, models.Post.poster_id),
+                (models.Comment, models.Comment.commenter_id),
+                (models.Review, models.Review.reviewer_id),
+            )
+        ]
+        row = db.execute(select(models.User, *counts).where(models.User.username == username)).first()
+        if row is None:
+            logging.error(f"User '{username}' not found for summary")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
+        user, post_count, comment_count, review_count = row
+
+        # Each post's poster is `user`, already in the session, so only tags and attachments need loading.
+        posts = (
+            db.query(models.Post)
+            .options(selectinload(models.Post.tags), selectinload(models.Post.attachments))
+            .filter(
+                models.Post.poster_id == user.id,
+                models.Post.phase == models.PostPhase.PUBLISHED,
+            )
+            .order_by(models.Post.created_at.desc(), models.Post.id.desc())
+            .limit(SUMMARY_POST_LIMIT)
+            .all()
+        )
+
+        profile = UserRead.model_validate(user)
+        if not getattr(user, "is_email_public", False):
+            profile.email = None
+        return UserSummary(
+            profile=profile,
+            post_count=post_count,
+            comment_count=comment_count,
+            review_count=review_count,
+            score=user.reputation,
+            posts=[_to_post_read(post) for post in posts],
+        )
+
+    return response_cache.cache.serve(
+        response_cache.cache_key("users.summary", username=username),
+        (response_cache.USERS, response_cache.POSTS, response_cache.DISCUSSION),
+        compute,
+        db=db,
+    )
 
 
 @router.patch("/me", response_model=UserRead)
-async def update_current_user_profile(
+def update_current_user_profile(
     payload: ProfileUpdate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
@@ -657,6 +947,7 @@ async def update_current_user_profile(
 
     db.add(current_user)
     db.commit()
+    invalidate_cached_user(current_user.id)
     db.refresh(current_user)
 
     return current_user
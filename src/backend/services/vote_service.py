@@ -1,35 +1,106 @@
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from src.database.models import PostVote, CommentVote
+from src.backend.services import response_cache, revisions
+from src.database.models import Comment, CommentVote, Post, PostVote, Review, ReviewVote, User
+
+# Whose reputation the votes on each kind of content count towards.
+_AUTHOR_COLUMNS = {
+    Post: Post.poster_id,
+    Comment: Comment.commenter_id,
+    Review: Review.reviewer_id,
+}
+
+
+def _counter_deltas(old_value: int | None, new_value: int | None) -> dict[str, int]:
+    deltas = {"upvotes": 0, "downvotes": 0}
+    for value, step in ((old_value, -1), (new_value, 1)):
+        if value == 1:
+            deltas["upvotes"] += step
+        elif value == -1:
+            deltas["downvotes"] += step
+    return deltas
+
+
+def _apply_vote_change(db: Session, model, target_id: int, old_value: int | None, new_value: int | None) -> None:
+    """Adjust the denormalized counters and the author's reputation in the same transaction as the vote row change."""
+    deltas = _counter_deltas(old_value, new_value)
+    values = {
+        column: getattr(model, column) + delta
+        for column, delta in deltas.items()
+        if delta
+    }
+    if values:
+        db.execute(update(model).where(model.id == target_id).values(**values))
+        author_id = select(_AUTHOR_COLUMNS[model]).where(model.id == target_id).scalar_subquery()
+        db.execute(
+            update(User)
+            .where(User.id == author_id)
+            .values(reputation=User.reputation + (new_value or 0) - (old_value or 0))
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _existing_vote(db: Session, model, **criteria):
+    """The caller's vote row, locked until commit so concurrent switches and removals of it apply one at a time."""
+    return db.query(model).filter_by(**criteria).with_for_update().first()
+
+
+def _insert_vote(db: Session, vote, model, target_id: int, **criteria) -> bool:
+    """
+    Insert `vote` and count it; False when a concurrent request inserted the same vote first.
+
+    The unique constraint on (user, target) makes the losing commit fail, and
+    its rollback undoes the counter change with it, so the caller can retry
+    against the row that won.
+    """
+    db.add(vote)
+    _apply_vote_change(db, model, target_id, None, vote.value)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        if db.query(type(vote)).filter_by(**criteria).first() is None:
+            raise
+        return False
+    db.refresh(vote)
+    return True
+
+
+def _read_counters(db: Session, model, target_id: int) -> dict[str, int]:
+    row = db.query(model.upvotes, model.downvotes).filter(model.id == target_id).first()
+    if row is None:
+        return {"upvotes": 0, "downvotes": 0}
+    return {"upvotes": row.upvotes, "downvotes": row.downvotes}
 
 
 def vote_post(db: Session, user_id: int, post_id: int, value: int) -> PostVote:
-    existing_vote = db.query(PostVote).filter_by(
-        user_id=user_id, post_id=post_id).first()
+    existing_vote = _existing_vote(db, PostVote, user_id=user_id, post_id=post_id)
 
     if existing_vote:
         if existing_vote.value == value:
             return existing_vote
         else:
+            _apply_vote_change(db, Post, post_id, existing_vote.value, value)
             existing_vote.value = value
             db.commit()
             db.refresh(existing_vote)
             return existing_vote
     else:
         new_vote = PostVote(user_id=user_id, post_id=post_id, value=value)
-        db.add(new_vote)
-        db.commit()
-        db.refresh(new_vote)
-        return new_vote
+        if _insert_vote(db, new_vote, Post, post_id, user_id=user_id, post_id=post_id):
+            return new_vote
+        return vote_post(db, user_id, post_id, value)
 
 
 def vote_comment(db: Session, user_id: int, comment_id: int, value: int) -> CommentVote:
-    existing_vote = db.query(CommentVote).filter_by(
-        user_id=user_id, comment_id=comment_id).first()
+    existing_vote = _existing_vote(db, CommentVote, user_id=user_id, comment_id=comment_id)
 
     if existing_vote:
         if existing_vote.value == value:
             return existing_vote
         else:
+            _apply_vote_change(db, Comment, comment_id, existing_vote.value, value)
             existing_vote.value = value
             db.commit()
             db.refresh(existing_vote)
@@ -37,37 +108,164 @@ def vote_comment(db: Session, user_id: int, comment_id: int, value: int) -> Comm
     else:
         new_vote = CommentVote(
             user_id=user_id, comment_id=comment_id, value=value)
-        db.add(new_vote)
+        if _insert_vote(db, new_vote, Comment, comment_id, user_id=user_id, comment_id=comment_id):
+            return new_vote
+        return vote_comment(db, user_id, comment_id, value)
+
+
+def vote_review(db: Session, user_id: int, review_id: int, value: int) -> ReviewVote | None:
+    """Cast, switch or (when repeating the same value) withdraw a review vote."""
+    existing_vote = _existing_vote(db, ReviewVote, user_id=user_id, review_id=review_id)
+
+    if existing_vote:
+        if existing_vote.value == value:
+            _apply_vote_change(db, Review, review_id, existing_vote.value, None)
+            db.delete(existing_vote)
+            db.commit()
+            return None
+        _apply_vote_change(db, Review, review_id, existing_vote.value, value)
+        existing_vote.value = value
         db.commit()
-        db.refresh(new_vote)
+        db.refresh(existing_vote)
+        return existing_vote
+
+    new_vote = ReviewVote(user_id=user_id, review_id=review_id, value=value)
+    if _insert_vote(db, new_vote, Review, review_id, user_id=user_id, review_id=review_id):
         return new_vote
+    return vote_review(db, user_id, review_id, value)
+
+
+def adjust_review_count(db: Session, post_id: int, delta: int) -> None:
+    """Keep `posts.review_count` in step with a review insert (+1) or delete (-1), in the same transaction."""
+    db.execute(update(Post).where(Post.id == post_id).values(review_count=Post.review_count + delta))
 
 
 def get_post_votes(db: Session, post_id: int) -> dict[str, int]:
-    upvotes = db.query(PostVote).filter_by(post_id=post_id, value=1).count()
-    downvotes = db.query(PostVote).filter_by(post_id=post_id, value=-1).count()
-    return {"upvotes": upvotes, "downvotes": downvotes}
+    return _read_counters(db, Post, post_id)
 
 
 def get_comment_votes(db: Session, comment_id: int) -> dict[str, int]:
-    upvotes = db.query(CommentVote).filter_by(
-        comment_id=comment_id, value=1).count()
-    downvotes = db.query(CommentVote).filter_by(
-        comment_id=comment_id, value=-1).count()
-    return {"upvotes": upvotes, "downvotes": downvotes}
+    return _read_counters(db, Comment, comment_id)
+
+
+def get_review_votes(db: Session, review_id: int) -> dict[str, int]:
+    return _read_counters(db, Review, review_id)
 
 
 def remove_post_vote(db: Session, user_id: int, post_id: int) -> None:
-    existing_vote = db.query(PostVote).filter_by(
-        user_id=user_id, post_id=post_id).first()
+    existing_vote = _existing_vote(db, PostVote, user_id=user_id, post_id=post_id)
     if existing_vote:
+        _apply_vote_change(db, Post, post_id, existing_vote.value, None)
         db.delete(existing_vote)
         db.commit()
 
 
 def remove_comment_vote(db: Session, user_id: int, comment_id: int) -> None:
-    existing_vote = db.query(CommentVote).filter_by(
-        user_id=user_id, comment_id=comment_id).first()
+    existing_vote = _existing_vote(db, CommentVote, user_id=user_id, comment_id=comment_id)
     if existing_vote:
+        _apply_vote_change(db, Comment, comment_id, existing_vote.value, None)
         db.delete(existing_vote)
         db.commit()
+
+
+_COUNTER_SOURCES = (
+    (Post, PostVote, PostVote.post_id, Post.id),
+    (Comment, CommentVote, CommentVote.comment_id, Comment.post_id),
+    (Review, ReviewVote, ReviewVote.review_id, Review.post_id),
+)
+
+
+def reconcile_vote_counters(db: Session) -> dict[str, int]:
+    """Recompute every upvote/downvote counter and `posts.review_count`; returns repaired rows per table."""
+    repaired: dict[str, int] = {}
+    # Posts whose payload (or whose comments' and reviews' payload) showed a repaired counter.
+    post_ids: set[int] = set()
+    for model, vote_model, target_column, post_column in _COUNTER_SOURCES:
+        upvotes = (
+            select(func.count(vote_model.id))
+            .where(target_column == model.id, vote_model.value == 1)
+            .scalar_subquery()
+        )
+        downvotes = (
+            select(func.count(vote_model.id))
+            .where(target_column == model.id, vote_model.value == -1)
+            .scalar_subquery()
+        )
+        rows = db.execute(
+            update(model)
+            .where(or_(model.upvotes != upvotes, model.downvotes != downvotes))
+            .values(upvotes=upvotes, downvotes=downvotes)
+            .returning(post_column)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        repaired[model.__tablename__] = len(rows)
+        post_ids.update(rows)
+    review_count = select(func.count(Review.id)).where(Review.post_id == Post.id).scalar_subquery()
+    rows = db.execute(
+        update(Post)
+        .where(Post.review_count != review_count)
+        .values(review_count=review_count)
+        .returning(Post.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    repaired[Post.__tablename__] += len(rows)
+    post_ids.update(rows)
+    if post_ids:
+        # Core UPDATEs skip the flush hooks: move the ETags and cached pages on by hand.
+        revisions.bump_posts(db.connection(), post_ids)
+        revisions.mark_feed_changed(db)
+        response_cache.invalidate(db, {response_cache.POSTS, response_cache.DISCUSSION})
+    db.commit()
+    return repaired
+
+
+def retract_reputation(db: Session, model, *criteria) -> None:
+    """
+    Take the votes on the `model` rows matching `criteria` off their authors'
+    reputation. Call it before deleting those rows, in the same transaction:
+    one UPDATE however many rows and authors are involved.
+    """
+    author = _AUTHOR_COLUMNS[model]
+    net_votes = (
+        select(func.sum(model.upvotes - model.downvotes))
+        .where(*criteria, author == User.id)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(User)
+        .where(User.id.in_(select(author).where(*criteria, model.upvotes != model.downvotes)))
+        .values(reputation=User.reputation - net_votes)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _reputation_aggregate(user_id):
+    """SQL expression for a user's reputation summed from the vote counters of everything they wrote."""
+    total = 0
+    for model, author in _AUTHOR_COLUMNS.items():
+        total = total + (
+            select(func.coalesce(func.sum(model.upvotes - model.downvotes), 0))
+            .where(author == user_id)
+            .scalar_subquery()
+        )
+    return total
+
+
+def aggregate_reputation(db: Session, user_id: int) -> int:
+    """A user's reputation computed in SQL rather than read from `User.reputation`."""
+    return int(db.scalar(select(_reputation_aggregate(user_id))) or 0)
+
+
+def recompute_reputation(db: Session) -> int:
+    """Reset every stored reputation that disagrees with the vote counters; returns the repaired rows."""
+    reputation = _reputation_aggregate(User.id)
+    result = db.execute(
+        update(User)
+        .where(User.reputation != reputation)
+        .values(reputation=reputation)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        response_cache.invalidate(db, {response_cache.USERS})
+    db.commit()
+    return result.rowcount
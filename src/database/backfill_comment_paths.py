@@ -0,0 +1,12 @@
+from src.database.db import SessionLocal
+from src.backend.services.comment_paths import backfill
+import logging
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logging.info("🔄 Rebuilding comment ancestry paths from parent_comment_id...")
+
+    with SessionLocal() as db:
+        levels = backfill(db)
+
+    logging.info(f"✅ Comment paths rebuilt ({levels} reply level(s)).")
@@ -1,8 +1,10 @@
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from src.backend.config.config_utils import read_config
+from src.database.pool import InstrumentedQueuePool
 
 
 cfg = read_config()
@@ -14,17 +16,25 @@ port = cfg["RSP_DB_PORT"]
 database = cfg["RSP_DB_DATABASE"]
 DATABASE_URL = f"{prefix}://{user}:{password}@{host}:{port}/{database}"
 
+POOL_SIZE = int(cfg.get("RSP_DB_POOL_SIZE", 5))
+POOL_MAX_OVERFLOW = int(cfg.get("RSP_DB_POOL_MAX_OVERFLOW", 10))
+POOL_TIMEOUT_SECONDS = int(cfg.get("RSP_DB_POOL_TIMEOUT_SECONDS", 10))
+POOL_RECYCLE_SECONDS = int(cfg.get("RSP_DB_POOL_RECYCLE_SECONDS", 1800))
+POOL_PRE_PING = str(cfg.get("RSP_DB_POOL_PRE_PING") or "true").lower() not in ("0", "false", "no")
+
 
 def _ensure_database_exists() -> None:
     if not prefix.startswith("postgresql"):
         return
 
     admin_url = f"{prefix}://{user}:{password}@{host}:{port}/postgres"
+    # Used once at startup, so there is nothing to pool.
     admin_engine = create_engine(
         admin_url,
         isolation_level="AUTOCOMMIT",
         echo=False,
         future=True,
+        poolclass=NullPool,
     )
 
     try:
@@ -51,6 +61,12 @@ engine = create_engine(
     DATABASE_URL,
     echo=False,
     future=True,
+    poolclass=InstrumentedQueuePool,
+    pool_size=POOL_SIZE,
+    max_overflow=POOL_MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT_SECONDS,
+    pool_recycle=POOL_RECYCLE_SECONDS,
+    pool_pre_ping=POOL_PRE_PING,
 )
 
 SessionLocal = sessionmaker(
@@ -66,3 +82,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def pool_stats() -> dict[str, float | int]:
+    return engine.pool.stats()  # type: ignore[attr-defined]
@@ -0,0 +1,66 @@
+from src.database.db import SessionLocal
+from src.database.models import User
+from src.backend.services import post_import, response_cache
+import argparse
+import logging
+import sys
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk import posts from an NDJSON or BibTeX file.")
+    parser.add_argument("path", help="input file, or - to read standard input")
+    parser.add_argument(
+        "--poster",
+        required=True,
+        help="username the posts belong to (NDJSON records can override it with poster_username)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=post_import.FORMATS,
+        help="input format (default: bibtex for .bib files, otherwise ndjson)",
+    )
+    parser.add_argument("--batch-size", type=int, default=post_import.BATCH_SIZE, help="posts per transaction")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    format = args.format or post_import.format_for(args.path)
+    if not isinstance(response_cache.cache.generations, response_cache.DatabaseGenerations):
+        # This process's in-memory invalidations never reach the API workers.
+        logging.warning(
+            "⚠️ RSP_RESPONSE_CACHE_BACKEND is not 'database': running API workers keep serving cached "
+            "listings without the imported posts until their cache TTL runs out."
+        )
+
+    with SessionLocal() as db:
+        poster_id = db.query(User.id).filter(User.username == args.poster).scalar()
+        if poster_id is None:
+            logging.error(f"❌ No user named '{args.poster}'.")
+            return 1
+
+        logging.info(f"🔄 Importing {format} posts from {args.path} as {args.poster}...")
+        if args.path == "-":
+            result = post_import.import_file(
+                db, sys.stdin, format, default_poster_id=poster_id, batch_size=args.batch_size
+            )
+        else:
+            with open(args.path, encoding="utf-8", newline="") as stream:
+                result = post_import.import_file(
+                    db, stream, format, default_poster_id=poster_id, batch_size=args.batch_size
+                )
+
+    for line, message in result.errors:
+        logging.warning(f"⚠️ line {line}: {message}")
+    if result.rejected > len(result.errors):
+        logging.warning(f"⚠️ ...and {result.rejected - len(result.errors)} more rejected record(s).")
+    logging.info(
+        f"✅ Imported {result.imported} post(s), rejected {result.rejected}: "
+        f"{result.rows} rows in {result.seconds:.2f}s ({result.rows_per_second:.0f} rows/s)."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -1,16 +1,19 @@
 import enum
-from datetime import datetime
+from datetime import datetime, timezone
 from sqlalchemy import (
     CheckConstraint,
     UniqueConstraint,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     Text,
     Column,
+    text,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -21,6 +24,10 @@ class Base(DeclarativeBase):
     pass
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class UserRole(str, enum.Enum):
     USER = "user"
     RESEARCHER = "researcher"
@@ -33,14 +40,26 @@ class ReportStatus(str, enum.Enum):
     CLOSED = "closed"
 
 
+class EmailStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
 class TimestampMixin:
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=_utcnow,
         server_default=func.now(),
         nullable=False,
     )
 
 
+class RevisionMixin:
+    # Bumped on every committed change to the row or, for posts, anything shown with them; used for ETags.
+    revision: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+
+
 class VotableMixin:
     upvotes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     downvotes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -62,7 +81,7 @@ post_tags = Table(
 )
 
 
-class User(TimestampMixin, Base):
+class User(TimestampMixin, RevisionMixin, Base):
     __tablename__ = "users"
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -93,6 +112,13 @@ class User(TimestampMixin, Base):
     is_orcid_public: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     is_socials_public: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     is_arxiv_public: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    reputation: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+        doc="Net votes on the user's posts, comments and reviews, kept up to date by vote_service",
+    )
 
     @property
     def is_email_public(self) -> bool:
@@ -132,6 +158,7 @@ class User(TimestampMixin, Base):
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=_utcnow,
         server_default=func.now(),
         nullable=False,
     )
@@ -152,8 +179,13 @@ class PostPhase(str, enum.Enum):
     PUBLISHED = "published"
 
 
-class Post(TimestampMixin, VotableMixin, Base):
+class Post(TimestampMixin, VotableMixin, RevisionMixin, Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_score_created_at_id", text("(upvotes - downvotes)"), "created_at", "id"),
+        Index("ix_posts_review_count_created_at_id", "review_count", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     poster_id: Mapped[int] = mapped_column(
@@ -171,6 +203,13 @@ class Post(TimestampMixin, VotableMixin, Base):
         nullable=False,
         index=True,
     )
+    review_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+        doc="Denormalized number of reviews, kept up to date by vote_service.adjust_review_count",
+    )
     poster: Mapped[User] = relationship(back_populates="authored_posts")
     comments: Mapped[list["Comment"]] = relationship(
         back_populates="post",
@@ -194,13 +233,55 @@ class Post(TimestampMixin, VotableMixin, Base):
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=_utcnow,
         server_default=func.now(),
         nullable=False,
     )
 
 
+SEARCH_CONFIG = text("'simple'::regconfig")
+
+
+def _weighted_vector(column, weight: str):
+    return func.setweight(func.to_tsvector(SEARCH_CONFIG, column), text(f"'{weight}'"))
+
+
+def post_search_vector():
+    """PostgreSQL document for full-text search; must match ``ix_posts_search_vector``."""
+    columns = Post.__table__.c
+    return (
+        _weighted_vector(columns.title, "A")
+        .op("||")(_weighted_vector(columns.authors_text, "B"))
+        .op("||")(_weighted_vector(columns.abstract, "B"))
+        .op("||")(_weighted_vector(columns.body, "D"))
+    )
+
+
+def tag_search_vector():
+    return func.to_tsvector(SEARCH_CONFIG, Tag.__table__.c.name)
+
+
+Index(
+    "ix_posts_search_vector",
+    post_search_vector(),
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+
+Index(
+    "ix_tags_search_vector",
+    tag_search_vector(),
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+
+
 class Comment(TimestampMixin, VotableMixin, Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # Serves each page of a thread: one post's children of one parent, oldest first.
+        Index("ix_comments_post_parent_created_at", "post_id", "parent_comment_id", "created_at", "id"),
+        # Prefix (LIKE 'a/b/%') lookups of a thread's subtree.
+        Index("ix_comments_post_ancestry", "post_id", "ancestry", postgresql_ops={"ancestry": "varchar_pattern_ops"}),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     parent_comment_id: Mapped[int | None] = mapped_column(
@@ -216,6 +297,9 @@ class Comment(TimestampMixin, VotableMixin, Base):
         nullable=False,
     )
     body: Mapped[str] = mapped_column(nullable=False)
+    # Materialized path: ancestor ids from the root down, each followed by "/" ("" for top-level comments).
+    ancestry: Mapped[str] = mapped_column(String, default="", server_default="", nullable=False)
+    depth: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     post: Mapped[Post] = relationship(back_populates="comments")
     commenter: Mapped[User] = relationship(back_populates="authored_comments")
     comment_votes: Mapped[list["CommentVote"]] = relationship(
@@ -224,6 +308,7 @@ class Comment(TimestampMixin, VotableMixin, Base):
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=_utcnow,
         server_default=func.now(),
         nullable=False,
     )
@@ -239,11 +324,16 @@ class Attachment(TimestampMixin, Base):
     )
     file_path: Mapped[str] = mapped_column(nullable=False)
     mime_type: Mapped[str] = mapped_column(nullable=False)
+    # Content digest selecting the stored blob; rows sharing it are that blob's references.
+    sha256: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
     post: Mapped[Post] = relationship(back_populates="attachments")
 
 
 class Review(TimestampMixin, VotableMixin, Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_post_id", "post_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     post_id: Mapped[int] = mapped_column(
@@ -290,6 +380,7 @@ class Report(TimestampMixin, Base):
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=_utcnow,
         server_default=func.now(),
         nullable=False,
     )
@@ -299,7 +390,8 @@ class PostVote(TimestampMixin, Base):
     __tablename__ = "post_votes"
     __table_args__ = (
         CheckConstraint("value in (-1, 1)", name="post_vote_value_check"),
-        UniqueConstraint("user_id", "post_id", name="uq_post_vote")
+        UniqueConstraint("user_id", "post_id", name="uq_post_vote"),
+        Index("ix_post_votes_post_id_value", "post_id", "value"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -356,3 +448,62 @@ class ReviewVote(TimestampMixin, Base):
     value: Mapped[int] = mapped_column(Integer, nullable=False)
     user: Mapped[User] = relationship(back_populates="review_votes")
     review: Mapped["Review"] = relationship(back_populates="review_votes")
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti: Mapped[str] = mapped_column(String(64), primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True,
+    )
+
+
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    tat: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+
+
+class ResponseCacheGeneration(Base):
+    __tablename__ = "response_cache_generations"
+
+    tag: Mapped[str] = mapped_column(String(64), primary_key=True)
+    generation: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class FeedRevision(Base):
+    """A single row (id 1) bumped whenever anything the post feed shows changes; backs the feed's ETag."""
+
+    __tablename__ = "feed_revision"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    revision: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class OutboundEmail(TimestampMixin, Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    recipient: Mapped[str] = mapped_column(String(320), nullable=False)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[EmailStatus] = mapped_column(
+        Enum(EmailStatus, name="email_status", native_enum=False),
+        default=EmailStatus.PENDING,
+        nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=_utcnow,
+        nullable=False,
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
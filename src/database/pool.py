@@ -0,0 +1,62 @@
+"""QueuePool that records how long requests wait for a connection, for `GET /metrics`."""
+
+from __future__ import annotations
+
+import time
+from threading import Lock
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    A `QueuePool` that also counts checkouts, time spent waiting for a free
+    connection, checkout timeouts and connections invalidated (e.g. by pre-ping).
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = Lock()
+        self._checkouts = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._timeouts = 0
+        self._invalidated = 0
+        event.listen(self, "invalidate", self._on_invalidate)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        with self._stats_lock:
+            self._checkouts += 1
+            self._wait_seconds_total += waited
+            self._wait_seconds_max = max(self._wait_seconds_max, waited)
+        return connection
+
+    def _on_invalidate(self, _dbapi_connection, _record, _exception) -> None:
+        with self._stats_lock:
+            self._invalidated += 1
+
+    def stats(self) -> dict[str, float | int]:
+        with self._stats_lock:
+            avg_wait = self._wait_seconds_total / self._checkouts if self._checkouts else 0.0
+            return {
+                "size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "invalidated": self._invalidated,
+                "avg_wait_seconds": round(avg_wait, 4),
+                "max_wait_seconds": round(self._wait_seconds_max, 4),
+            }
@@ -0,0 +1,18 @@
+from src.database.db import SessionLocal
+from src.backend.services.vote_service import reconcile_vote_counters, recompute_reputation
+import logging
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logging.info("🔄 Reconciling vote counters with the vote tables...")
+
+    with SessionLocal() as db:
+        repaired = reconcile_vote_counters(db)
+        # Reputation is summed from the counters, so it is recomputed after they are repaired.
+        repaired["users.reputation"] = recompute_reputation(db)
+
+    for table, rows in repaired.items():
+        if rows:
+            logging.warning(f"🛠️ {table}: repaired {rows} drifted counter row(s).")
+        else:
+            logging.info(f"✅ {table}: counters already consistent.")
@@ -12,7 +12,7 @@ import {
 import { Button } from "@/components/Button";
 import { LoadingSkeleton } from "@/components/LoadingSkeleton";
 import { DownvoteIcon, LogoutIcon, UpvoteIcon, FlagIcon } from "@/components/icons";
-import { usePolling } from "@/lib/usePolling";
+import { useChangeFeed } from "@/lib/useChangeFeed";
 
 function formatJoinedDate(createdAt: string | undefined) {
   if (!createdAt) return "Unknown member since";
@@ -133,7 +133,7 @@ export default function MePage() {
     };
   }, [router]);
 
-  usePolling(
+  useChangeFeed(
     async ({ isActive }) => {
       if (!user) return;
 
@@ -162,7 +162,7 @@ export default function MePage() {
       }
     },
     [router, user?.username],
-    { enabled: !!user && !isLoadingActivity && !isLoading, intervalMs: 2000, immediate: false },
+    { enabled: !!user && !isLoadingActivity && !isLoading, kinds: ["post", "comment", "vote"] },
   );
 
   useEffect(() => {
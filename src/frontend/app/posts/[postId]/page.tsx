@@ -92,7 +92,7 @@ const looksLikeGeneratedFileName = (fileName: string) => {
   const extension = getFileExtension(leaf);
   const base = extension ? leaf.slice(0, -extension.length) : leaf;
   const normalizedBase = base.toLowerCase();
-  if (/^[0-9a-f]{32}$/.test(normalizedBase)) return true;
+  if (/^(?:[0-9a-f]{32}|[0-9a-f]{64})$/.test(normalizedBase)) return true;
   if (
     /^[0-9a-f]{8}-[0-9a-f]{4}-[1-5][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$/.test(
       normalizedBase,
@@ -115,7 +115,8 @@ const deriveOriginalNameFromStoredFileName = (storedFileName: string) => {
 
   const originalStem = base.slice(0, separatorIndex);
   const uniquePart = base.slice(separatorIndex + ATTACHMENT_NAME_SEPARATOR.length);
-  if (!/^[0-9a-f]{32}$/i.test(uniquePart)) {
+  // 32 hex: random names of older uploads; 64 hex: SHA-256 of content-addressed ones.
+  if (!/^(?:[0-9a-f]{32}|[0-9a-f]{64})$/i.test(uniquePart)) {
     return null;
   }
 
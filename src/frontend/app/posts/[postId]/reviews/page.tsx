@@ -7,7 +7,7 @@ import type { PostRead, ReviewRead, UserRead } from "@/lib/api";
 import { getCurrentUser, getPostById, getPostReviews } from "@/lib/api";
 import { Button } from "@/components/Button";
 import { XCircleSolidIcon } from "@/components/icons";
-import { usePolling } from "@/lib/usePolling";
+import { useChangeFeed } from "@/lib/useChangeFeed";
 
 export default function ReviewsFeedPage() {
   const params = useParams();
@@ -21,7 +21,7 @@ export default function ReviewsFeedPage() {
   const [error, setError] = useState<string | null>(null);
   const [actionError, setActionError] = useState<string | null>(null);
 
-  usePolling(
+  useChangeFeed(
     async ({ isActive }) => {
       try {
         setError(null);
@@ -61,7 +61,7 @@ export default function ReviewsFeedPage() {
       }
     },
     [postId],
-    { intervalMs: 2000, immediate: true },
+    { postId, kinds: ["post", "review", "vote"], immediate: true },
   );
 
   const canWriteReview = useMemo(() => {
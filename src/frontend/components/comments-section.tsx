@@ -12,7 +12,7 @@ import {
   type UserRead,
 } from "@/lib/api";
 import { DownvoteIcon, UpvoteIcon } from "@/components/icons";
-import { usePolling } from "@/lib/usePolling";
+import { useChangeFeed } from "@/lib/useChangeFeed";
 import ReportButton from "@/components/report-button";
 import DeleteCommentButton from "@/components/delete-comment-button";
 import { getVoteStorageUserKey } from "@/lib/voteStorage";
@@ -191,7 +191,7 @@ export default function CommentsSection({ postId, initialComments }: Props) {
     fetchUser();
   }, []);
 
-  usePolling(
+  useChangeFeed(
     async ({ isActive }) => {
       try {
         const latest = await getPostComments(postId);
@@ -202,7 +202,7 @@ export default function CommentsSection({ postId, initialComments }: Props) {
       }
     },
     [postId],
-    { intervalMs: 2000, immediate: false },
+    { postId, kinds: ["comment", "vote"] },
   );
 
   const threads = useMemo(() => buildThreads(comments), [comments]);
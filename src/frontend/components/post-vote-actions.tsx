@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react";
 import { getPostById, voteOnPost } from "@/lib/api";
 import { DownvoteIcon, UpvoteIcon } from "@/components/icons";
-import { usePolling } from "@/lib/usePolling";
+import { useChangeFeed } from "@/lib/useChangeFeed";
 import { getVoteStorageUserKey } from "@/lib/voteStorage";
 
 type Props = {
@@ -48,7 +48,7 @@ export default function PostVoteActions({
     }
   }, [postId]);
 
-  usePolling(
+  useChangeFeed(
     async ({ isActive }) => {
       if (isVoting) {
         return;
@@ -65,7 +65,7 @@ export default function PostVoteActions({
       }
     },
     [postId, isVoting],
-    { intervalMs: 2000, immediate: false },
+    { postId, kinds: ["vote"] },
   );
 
   const handleVote = async (value: 1 | -1) => {
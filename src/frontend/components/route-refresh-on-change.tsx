@@ -1,20 +1,22 @@
 "use client";
 
 import { useRouter } from "next/navigation";
-import { usePolling } from "@/lib/usePolling";
+import { type ChangeKind, useChangeFeed } from "@/lib/useChangeFeed";
 
 type Props = {
-  intervalMs?: number;
+  kinds?: readonly ChangeKind[];
+  postId?: number;
   enabled?: boolean;
 };
 
-export default function RouteRefreshPoller({
-  intervalMs = 2000,
+export default function RouteRefreshOnChange({
+  kinds,
+  postId,
   enabled = true,
 }: Props) {
   const router = useRouter();
 
-  usePolling(
+  useChangeFeed(
     async () => {
       const active = document.activeElement;
       if (active instanceof HTMLElement) {
@@ -31,7 +33,7 @@ export default function RouteRefreshPoller({
       router.refresh();
     },
     [router],
-    { enabled, intervalMs, immediate: false },
+    { enabled, kinds, postId },
   );
 
   return null;
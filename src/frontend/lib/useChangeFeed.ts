@@ -0,0 +1,145 @@
+"use client";
+
+import { useEffect, useRef } from "react";
+import { API_BASE_URL } from "@/lib/api";
+import type { PollContext } from "@/lib/usePolling";
+
+export type ChangeKind = "post" | "comment" | "vote" | "review" | "report";
+
+type ChangeMessage = {
+  id: number;
+  kind: ChangeKind;
+  action: string;
+  post_id: number | null;
+};
+
+export type UseChangeFeedOptions = {
+  enabled?: boolean;
+  postId?: number;
+  kinds?: readonly ChangeKind[];
+  immediate?: boolean;
+  debounceMs?: number;
+  fallbackMs?: number;
+};
+
+/**
+ * Runs `fn` whenever the backend's `/events` stream reports a matching change,
+ * instead of on a timer. Bursts are coalesced into one call per `debounceMs`,
+ * and changes that arrive while the tab is hidden trigger a single call once it
+ * is visible again. The browser's EventSource reconnects on its own and resumes
+ * from the last event it saw.
+ *
+ * The backend's broker only sees commits made by its own worker process, so
+ * `fn` also runs every `fallbackMs` (0 disables) to pick up changes published
+ * elsewhere or missed while the stream was down.
+ */
+export function useChangeFeed(
+  fn: (ctx: PollContext) => void | Promise<void>,
+  deps: readonly unknown[],
+  {
+    enabled = true,
+    postId,
+    kinds,
+    immediate = false,
+    debounceMs = 250,
+    fallbackMs = 60_000,
+  }: UseChangeFeedOptions = {},
+) {
+  const fnRef = useRef(fn);
+  const activeRef = useRef(true);
+  const kindsKey = kinds ? kinds.join(",") : "";
+
+  useEffect(() => {
+    fnRef.current = fn;
+  }, [fn]);
+
+  useEffect(() => {
+    activeRef.current = true;
+    return () => {
+      activeRef.current = false;
+    };
+  }, []);
+
+  useEffect(() => {
+    if (!enabled) {
+      return;
+    }
+
+    const wanted = kindsKey ? new Set(kindsKey.split(",")) : null;
+    let inFlight = false;
+    let rerun = false;
+    let missedWhileHidden = false;
+    let timer: number | undefined;
+
+    const run = async () => {
+      if (document.visibilityState === "hidden") {
+        missedWhileHidden = true;
+        return;
+      }
+      if (inFlight) {
+        rerun = true;
+        return;
+      }
+
+      inFlight = true;
+      try {
+        await fnRef.current({ isActive: () => activeRef.current });
+      } finally {
+        inFlight = false;
+        if (rerun) {
+          rerun = false;
+          schedule();
+        }
+      }
+    };
+
+    const schedule = () => {
+      if (timer !== undefined) return;
+      timer = window.setTimeout(() => {
+        timer = undefined;
+        void run();
+      }, debounceMs);
+    };
+
+    const onChange = (event: MessageEvent<string>) => {
+      try {
+        const change = JSON.parse(event.data) as ChangeMessage;
+        if (wanted && !wanted.has(change.kind)) return;
+      } catch {
+        return;
+      }
+      schedule();
+    };
+
+    const onVisibilityChange = () => {
+      if (document.visibilityState === "visible" && missedWhileHidden) {
+        missedWhileHidden = false;
+        schedule();
+      }
+    };
+
+    const url = new URL("/events", API_BASE_URL);
+    if (postId !== undefined) {
+      url.searchParams.set("post_id", String(postId));
+    }
+    const source =
+      typeof EventSource !== "undefined" ? new EventSource(url.toString()) : null;
+    source?.addEventListener("change", onChange);
+    source?.addEventListener("resync", schedule);
+    document.addEventListener("visibilitychange", onVisibilityChange);
+    const fallback =
+      fallbackMs > 0 ? window.setInterval(() => void run(), fallbackMs) : undefined;
+
+    if (immediate) {
+      void run();
+    }
+
+    return () => {
+      source?.close();
+      document.removeEventListener("visibilitychange", onVisibilityChange);
+      window.clearTimeout(timer);
+      window.clearInterval(fallback);
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps -- deps is intentionally spread as a dependency list.
+  }, [enabled, postId, kindsKey, immediate, debounceMs, fallbackMs, ...deps]);
+}
@@ -0,0 +1,64 @@
+"""Peak Python memory while storing uploads of growing size, streamed vs read whole.
+
+Run from the repo root:  python -m tst.bench_attachment_upload
+"""
+
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from starlette.datastructures import UploadFile
+
+from src.backend.services.attachment_store import store_upload
+
+SIZES_MB = (1, 16, 64, 256)
+
+
+def _upload(source: Path) -> UploadFile:
+    return UploadFile(file=source.open("rb"), filename=source.name)
+
+
+async def _streamed(upload: UploadFile, destination: Path) -> None:
+    stored = await store_upload(upload, destination.parent / "blobs", max_bytes=2**40)
+    stored.path.rename(destination)
+
+
+async def _read_whole(upload: UploadFile, destination: Path) -> None:
+    contents = await upload.read()
+    destination.write_bytes(contents)
+
+
+def _measure(store, source: Path, destination: Path) -> tuple[float, float]:
+    upload = _upload(source)
+    tracemalloc.start()
+    started = time.perf_counter()
+    asyncio.run(store(upload, destination))
+    elapsed = time.perf_counter() - started
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    upload.file.close()
+    destination.unlink()
+    return peak / 2**20, elapsed
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        print(f"{'size (MB)':>10} {'streamed peak (MB)':>19} {'read-whole peak (MB)':>21} {'streamed (s)':>13}")
+        for size_mb in SIZES_MB:
+            source = directory / f"source-{size_mb}.bin"
+            with source.open("wb") as handle:
+                block = bytes(range(256)) * 4096
+                for _ in range(size_mb):
+                    handle.write(block)
+
+            streamed_peak, streamed_seconds = _measure(_streamed, source, directory / "out.bin")
+            whole_peak, _ = _measure(_read_whole, source, directory / "out.bin")
+            print(f"{size_mb:>10} {streamed_peak:>19.2f} {whole_peak:>21.2f} {streamed_seconds:>13.3f}")
+            source.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Tail latency of cheap requests while DB-bound handlers run, `async def` vs plain `def`.
+
+A blocking SQLAlchemy query inside an `async def` handler runs on the event loop
+and stalls every other request until it returns; the same body in a plain `def`
+handler is run by FastAPI on its threadpool. The DB round trip is simulated with
+a sleeping SQLite function. Requests are driven straight through the ASGI app,
+so routing and the threadpool hop are included. Arrivals are generated on the
+same loop, so a stalled loop also delays them and the `async def` numbers are
+optimistic. Run from the repo root:
+
+    python -m tst.bench_blocking_handlers
+"""
+
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import NullPool
+
+REQUESTS = 200
+QUERY_SECONDS = 0.005
+ARRIVAL_SECONDS = 0.004
+
+engine = create_engine(
+    "sqlite+pysqlite://",
+    poolclass=NullPool,
+)
+
+
+@event.listens_for(engine, "connect")
+def _register_slow_query(dbapi_connection, _record):
+    dbapi_connection.create_function("slow_query", 0, lambda: time.sleep(QUERY_SECONDS) or 1)
+
+
+def _query() -> int:
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT slow_query()")).scalar_one()
+
+
+app = FastAPI()
+
+
+@app.get("/blocking-async")
+async def blocking_async() -> int:
+    return _query()
+
+
+@app.get("/threadpool")
+def threadpool() -> int:
+    return _query()
+
+
+@app.get("/cheap")
+async def cheap() -> int:
+    return 1
+
+
+async def _request(path: str, submitted_at: float) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 1),
+        "server": ("127.0.0.1", 8000),
+    }
+
+    done = asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            done.set()
+
+    await app(scope, receive, send)
+    return time.perf_counter() - submitted_at
+
+
+async def _run(db_path: str) -> dict[str, float]:
+    # One DB-bound and one cheap request arrive every ARRIVAL_SECONDS.
+    db_requests, cheap_requests = [], []
+    for _ in range(REQUESTS):
+        db_requests.append(asyncio.create_task(_request(db_path, time.perf_counter())))
+        cheap_requests.append(asyncio.create_task(_request("/cheap", time.perf_counter())))
+        await asyncio.sleep(ARRIVAL_SECONDS)
+    cheap_latencies = sorted(await asyncio.gather(*cheap_requests))
+    db_latencies = sorted(await asyncio.gather(*db_requests))
+    return {
+        "cheap p50 ms": statistics.median(cheap_latencies) * 1e3,
+        "cheap p99 ms": cheap_latencies[int(len(cheap_latencies) * 0.99) - 1] * 1e3,
+        "db p99 ms": db_latencies[int(len(db_latencies) * 0.99) - 1] * 1e3,
+    }
+
+
+def main() -> None:
+    _query()
+    rows = {
+        "async def": asyncio.run(_run("/blocking-async")),
+        "def": asyncio.run(_run("/threadpool")),
+    }
+
+    print(f"{'handler':>10} {'cheap p50 ms':>13} {'cheap p99 ms':>13} {'db p99 ms':>10}")
+    for handler, row in rows.items():
+        print(
+            f"{handler:>10} {row['cheap p50 ms']:>13.2f} {row['cheap p99 ms']:>13.2f} "
+            f"{row['db p99 ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Fan-out cost of the change feed for thousands of open event streams.
+
+Every subscriber is a task awaiting its queue, as an `/events` response does.
+Events are published from a worker thread (like a threadpool handler committing)
+and the time from `publish` until the last subscriber received it is measured.
+Half the subscribers follow every change, half follow one of 100 posts. Run
+from the repo root:
+
+    python -m tst.bench_change_feed
+"""
+
+import asyncio
+import statistics
+import threading
+import time
+
+from src.backend.services.change_feed import ChangeBroker
+
+EVENTS = 200
+POSTS = 100
+
+
+async def _run(subscribers: int) -> dict[str, float]:
+    broker = ChangeBroker()
+    subscriptions = [
+        broker.subscribe(None if i % 2 == 0 else i % POSTS) for i in range(subscribers)
+    ]
+    expected = {
+        i: subscribers // 2 + sum(1 for s in subscriptions if s.post_id == i % POSTS)
+        for i in range(EVENTS)
+    }
+    received = {i: 0 for i in range(EVENTS)}
+    published_at: dict[int, float] = {}
+    latencies: list[float] = []
+    done = asyncio.Event()
+
+    async def consume(subscription) -> None:
+        while True:
+            change = await subscription.get()
+            index = change.id - 1
+            received[index] += 1
+            if received[index] == expected[index]:
+                latencies.append(time.perf_counter() - published_at[index])
+                if len(latencies) == EVENTS:
+                    done.set()
+
+    consumers = [asyncio.create_task(consume(s)) for s in subscriptions]
+    await asyncio.sleep(0)
+
+    def publish() -> None:
+        for i in range(EVENTS):
+            published_at[i] = time.perf_counter()
+            broker.publish([("vote", "updated", i % POSTS)])
+            time.sleep(0.001)
+
+    started = time.perf_counter()
+    threading.Thread(target=publish).start()
+    await done.wait()
+    elapsed = time.perf_counter() - started
+    for task in consumers:
+        task.cancel()
+
+    latencies.sort()
+    return {
+        "deliveries/s": broker.stats()["delivered"] / elapsed,
+        "p50 ms": statistics.median(latencies) * 1e3,
+        "p99 ms": latencies[int(len(latencies) * 0.99) - 1] * 1e3,
+    }
+
+
+def main() -> None:
+    print(f"{'subscribers':>12} {'deliveries/s':>13} {'p50 ms':>8} {'p99 ms':>8}")
+    for subscribers in (1_000, 5_000, 10_000):
+        row = asyncio.run(_run(subscribers))
+        print(f"{subscribers:>12} {row['deliveries/s']:>13.0f} {row['p50 ms']:>8.2f} {row['p99 ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Request latency and failures when more requests need a connection than the pool holds.
+
+Each simulated request checks out a connection and holds it for HOLD_SECONDS (a
+query plus the work done while its session is open) on the 40-thread request
+pool. With a small pool, the rest queue for up to `pool_timeout` and are then
+rejected (503 in the API) instead of waiting forever. Run from the repo root:
+
+    python -m tst.bench_db_pool
+"""
+
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, exc, text
+
+from src.database.pool import InstrumentedQueuePool
+
+REQUEST_THREADS = 40
+REQUESTS = 400
+HOLD_SECONDS = 0.02
+POOL_TIMEOUT_SECONDS = 0.25
+
+
+def _run(path: str, pool_size: int, max_overflow: int) -> dict[str, float]:
+    engine = create_engine(
+        f"sqlite:///{path}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=POOL_TIMEOUT_SECONDS,
+    )
+    latencies: list[float] = []
+    outcomes = {"ok": 0, "rejected": 0}
+
+    def request() -> None:
+        started = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                time.sleep(HOLD_SECONDS)
+            outcomes["ok"] += 1
+        except exc.TimeoutError:
+            outcomes["rejected"] += 1
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=REQUEST_THREADS) as requests:
+        for _ in range(REQUESTS):
+            requests.submit(request)
+    elapsed = time.perf_counter() - started
+    stats = engine.pool.stats()  # type: ignore[attr-defined]
+    engine.dispose()
+
+    latencies.sort()
+    return {
+        "req/s": outcomes["ok"] / elapsed,
+        "rejected": outcomes["rejected"],
+        "p50 ms": statistics.median(latencies) * 1e3,
+        "p99 ms": latencies[int(len(latencies) * 0.99) - 1] * 1e3,
+        "max wait ms": stats["max_wait_seconds"] * 1e3,
+    }
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        rows = {
+            f"{size}+{overflow}": _run(path, size, overflow)
+            for size, overflow in ((2, 0), (5, 10), (20, 20))
+        }
+
+    print(f"{'pool':>6} {'req/s':>8} {'rejected':>9} {'p50 ms':>8} {'p99 ms':>8} {'max wait ms':>12}")
+    for pool, row in rows.items():
+        print(
+            f"{pool:>6} {row['req/s']:>8.1f} {row['rejected']:>9.0f} {row['p50 ms']:>8.1f} "
+            f"{row['p99 ms']:>8.1f} {row['max wait ms']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Login throughput and read latency while a burst of logins hits the API.
+
+Simulates the request threadpool (40 threads, Starlette's default) serving a mix of
+argon2 logins and cheap reads, with argon2 run inline (as before) or through the
+bounded HashingPool. Run from the repo root:
+
+    python -m tst.bench_password_hashing
+"""
+
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+from src.backend.services.password_hashing import HashingPool, HashingPoolSaturated
+
+REQUEST_THREADS = 40
+LOGINS = 200
+READS = 400
+READ_WORK_SECONDS = 0.002
+
+CONTEXT = CryptContext(
+    schemes=["argon2"],
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
+HASH = CONTEXT.hash("password123")
+
+
+def _read() -> float:
+    started = time.perf_counter()
+    time.sleep(READ_WORK_SECONDS)
+    return time.perf_counter() - started
+
+
+def _run(login) -> dict[str, float]:
+    read_latencies: list[float] = []
+    outcomes = {"ok": 0, "rejected": 0}
+
+    def timed_read(submitted_at: float) -> None:
+        _read()
+        read_latencies.append(time.perf_counter() - submitted_at)
+
+    def timed_login() -> None:
+        try:
+            login()
+            outcomes["ok"] += 1
+        except HashingPoolSaturated:
+            outcomes["rejected"] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=REQUEST_THREADS) as requests:
+        for i in range(max(LOGINS, READS)):
+            if i < LOGINS:
+                requests.submit(timed_login)
+            if i < READS:
+                requests.submit(timed_read, time.perf_counter())
+    elapsed = time.perf_counter() - started
+
+    read_latencies.sort()
+    return {
+        "logins/s": outcomes["ok"] / elapsed,
+        "rejected": outcomes["rejected"],
+        "read p50 ms": statistics.median(read_latencies) * 1e3,
+        "read p99 ms": read_latencies[int(len(read_latencies) * 0.99) - 1] * 1e3,
+    }
+
+
+def main() -> None:
+    rows = {"inline": _run(lambda: CONTEXT.verify("password123", HASH))}
+    for workers, queue in ((2, 8), (4, 16)):
+        pool = HashingPool(max_workers=workers, max_queue=queue)
+        rows[f"pool {workers}w/{queue}q"] = _run(lambda: pool.run(CONTEXT.verify, "password123", HASH))
+        pool.shutdown()
+
+    print(f"{'mode':>14} {'logins/s':>9} {'rejected':>9} {'read p50 ms':>12} {'read p99 ms':>12}")
+    for mode, row in rows.items():
+        print(
+            f"{mode:>14} {row['logins/s']:>9.1f} {row['rejected']:>9.0f} "
+            f"{row['read p50 ms']:>12.1f} {row['read p99 ms']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
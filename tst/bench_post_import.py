@@ -0,0 +1,70 @@
+"""Posts per second through the bulk importer vs one `create_research_post` call per post.
+
+Run from the repo root:  python -m tst.bench_post_import
+"""
+
+import io
+import json
+import time
+
+from src.backend.services import post_import
+from src.database import models
+
+from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+POSTS = 5_000
+ONE_BY_ONE_POSTS = 500
+
+
+def _record(i: int) -> dict:
+    return {
+        "title": f"Post {i}",
+        "authors_text": "Author One, Author Two",
+        "abstract": "Abstract " * 20,
+        "body": "Body " * 200,
+        "tags": [f"topic{i % 50}", f"group{i % 7}", "department"],
+        "attachments": [f"/attachments/paper{i}__{i:064x}.pdf"],
+    }
+
+
+def _session_with_poster():
+    engine, SessionLocal = make_sqlite_session_factory()
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    poster = models.User(
+        username="importer",
+        email="importer@example.com",
+        password_hash="x",
+        password_salt="x",
+        is_email_verified=True,
+        role=models.UserRole.MODERATOR,
+    )
+    db.add(poster)
+    db.commit()
+    return db, poster
+
+
+def main() -> None:
+    post_service = import_backend_app_with_stubbed_db().post_service
+
+    db, poster = _session_with_poster()
+    started = time.perf_counter()
+    for i in range(ONE_BY_ONE_POSTS):
+        post_service.create_research_post(raw_body=json.dumps(_record(i)), db=db, current_user=poster)
+    one_by_one = ONE_BY_ONE_POSTS / (time.perf_counter() - started)
+    db.close()
+
+    print(f"{'batch size':>10} {'posts/s':>10} {'rows/s':>10}")
+    print(f"{'per post':>10} {one_by_one:>10.0f} {'-':>10}")
+    ndjson = "\n".join(json.dumps(_record(i)) for i in range(POSTS))
+    for batch_size in (50, 500, 2000):
+        db, poster = _session_with_poster()
+        result = post_import.import_file(
+            db, io.StringIO(ndjson), "ndjson", default_poster_id=poster.id, batch_size=batch_size
+        )
+        db.close()
+        print(f"{batch_size:>10} {result.imported / result.seconds:>10.0f} {result.rows_per_second:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compare cached and uncached anonymous reads of the feed and post count.
+
+Run from the repo root:  python -m tst.bench_response_cache
+"""
+
+import time
+
+from src.backend.services import response_cache
+from src.database import models
+
+from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+POSTS = 2_000
+PAGE_SIZE = 20
+READS = 500
+
+
+def _seed(db) -> None:
+    poster = models.User(
+        username="poster",
+        email="poster@example.com",
+        password_hash="x",
+        password_salt="x",
+        is_email_verified=True,
+    )
+    db.add(poster)
+    db.flush()
+    db.add_all(
+        models.Post(
+            poster_id=poster.id,
+            title=f"Post {i}",
+            authors_text="Author",
+            abstract="Abstract " * 20,
+            body="Body " * 200,
+            phase=models.PostPhase.PUBLISHED,
+        )
+        for i in range(POSTS)
+    )
+    db.commit()
+
+
+def _per_read_micros(read) -> float:
+    started = time.perf_counter()
+    for _ in range(READS):
+        read()
+    return (time.perf_counter() - started) / READS * 1e6
+
+
+def main() -> None:
+    post_service = import_backend_app_with_stubbed_db().post_service
+    engine, SessionLocal = make_sqlite_session_factory()
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    _seed(db)
+
+    reads = {
+        "feed page": lambda: post_service.find_research_posts(db=db, limit=PAGE_SIZE),
+        "post count": lambda: post_service.get_published_post_count(db=db),
+    }
+    cache = response_cache.cache
+
+    print(f"{'read':>12} {'uncached (us)':>14} {'cached (us)':>12}")
+    for name, read in reads.items():
+        ttl_seconds = cache.ttl_seconds
+        cache.ttl_seconds = 0
+        uncached = _per_read_micros(read)
+        cache.ttl_seconds = ttl_seconds
+        read()
+        cached = _per_read_micros(read)
+        print(f"{name:>12} {uncached:>14.0f} {cached:>12.0f}")
+    print(f"hit ratio: {cache.stats()['hit_ratio']}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare in-process index lookups with the substring scan they replaced.
+
+Run from the repo root:  python -m tst.bench_search_index
+"""
+
+import random
+import string
+import time
+
+from src.backend.services.search_index import InvertedIndex, parse_query
+
+CORPUS_SIZES = (1_000, 10_000, 50_000)
+VOCABULARY_SIZE = 20_000
+WORDS_PER_BODY = 120
+QUERIES = 200
+
+
+def _vocabulary(rng: random.Random) -> list[str]:
+    words: set[str] = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))))
+    return sorted(words)
+
+
+def _corpus(rng: random.Random, vocabulary: list[str], size: int) -> list[dict]:
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    documents = []
+    for _ in range(size):
+        words = rng.choices(vocabulary, weights=weights, k=WORDS_PER_BODY + 8)
+        documents.append(
+            {
+                "title": " ".join(words[:6]),
+                "abstract": " ".join(words[6:8]),
+                "body": " ".join(words[8:]),
+                "authors_text": "Ada Lovelace",
+                "tags": [words[0]],
+            }
+        )
+    return documents
+
+
+def _scan(documents: list[dict], query: str) -> int:
+    needle = query.lower()
+    return sum(
+        1
+        for document in documents
+        if needle in document["title"].lower()
+        or needle in document["body"].lower()
+        or needle in document["abstract"].lower()
+        or needle in document["authors_text"].lower()
+        or any(needle in tag for tag in document["tags"])
+    )
+
+
+def main() -> None:
+    rng = random.Random(42)
+    vocabulary = _vocabulary(rng)
+    queries = rng.sample(vocabulary[len(vocabulary) // 10:], QUERIES)
+
+    print(f"{'posts':>8} {'index build (s)':>16} {'index query (us)':>17} {'scan query (us)':>16}")
+    for size in CORPUS_SIZES:
+        documents = _corpus(rng, vocabulary, size)
+
+        index = InvertedIndex()
+        started = time.perf_counter()
+        for post_id, document in enumerate(documents, start=1):
+            index.add(post_id, **document)
+        build_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for query in queries:
+            index.search(parse_query(query), limit=20)
+        index_micros = (time.perf_counter() - started) / len(queries) * 1e6
+
+        scan_queries = queries[:20]
+        started = time.perf_counter()
+        for query in scan_queries:
+            _scan(documents, query)
+        scan_micros = (time.perf_counter() - started) / len(scan_queries) * 1e6
+
+        print(f"{size:>8} {build_seconds:>16.2f} {index_micros:>17.1f} {scan_micros:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
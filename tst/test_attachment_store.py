@@ -0,0 +1,348 @@
+import asyncio
+import hashlib
+import importlib
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.backend.services import attachment_store
+from src.backend.services.attachment_store import AttachmentTooLarge, EmptyAttachment, store_upload
+from src.database import models
+
+from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+
+class _ChunkedUpload:
+    """Serves `content` the way `UploadFile.read(size)` does and records the largest read."""
+
+    def __init__(self, content: bytes):
+        self._content = content
+        self.largest_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            size = len(self._content)
+        self.largest_read = max(self.largest_read, size)
+        chunk, self._content = self._content[:size], self._content[size:]
+        return chunk
+
+
+class TestStoreUpload(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _store(self, content: bytes, **kwargs):
+        upload = _ChunkedUpload(content)
+        stored = asyncio.run(store_upload(upload, self.root, **kwargs))
+        return stored, upload
+
+    def _files(self) -> list[Path]:
+        return sorted(p.relative_to(self.root) for p in self.root.rglob("*") if p.is_file())
+
+    def test_streams_in_chunks_into_a_sharded_blob(self):
+        content = bytes(range(256)) * 1000
+        stored, upload = self._store(content, chunk_size=4096)
+
+        digest = hashlib.sha256(content).hexdigest()
+        self.assertEqual(upload.largest_read, 4096)
+        self.assertEqual((stored.size, stored.sha256, stored.deduplicated), (len(content), digest, False))
+        self.assertEqual(stored.path, self.root / digest[:2] / digest[2:4] / digest)
+        self.assertEqual(stored.path.read_bytes(), content)
+        self.assertEqual(self._files(), [stored.path.relative_to(self.root)])
+
+    def test_identical_content_is_stored_once(self):
+        first, _ = self._store(b"same paper")
+        second, _ = self._store(b"same paper")
+        self.assertTrue(second.deduplicated)
+        self.assertEqual(first.path, second.path)
+        self.assertEqual(len(self._files()), 1)
+
+    def test_oversized_upload_is_rejected_without_leaving_files(self):
+        with self.assertRaises(AttachmentTooLarge):
+            self._store(b"x" * 10_000, max_bytes=4096, chunk_size=1024)
+        self.assertEqual(self._files(), [])
+
+    def test_empty_upload_is_rejected_without_leaving_files(self):
+        with self.assertRaises(EmptyAttachment):
+            self._store(b"")
+        self.assertEqual(self._files(), [])
+
+    def test_public_names_resolve_to_blobs_or_legacy_files(self):
+        stored, _ = self._store(b"content")
+        (self.root / "old__0123456789abcdef0123456789abcdef.pdf").write_bytes(b"legacy")
+
+        self.assertEqual(attachment_store.resolve(self.root, f"paper__{stored.sha256}.pdf"), stored.path)
+        self.assertEqual(attachment_store.resolve(self.root, f"other-name__{stored.sha256}.png"), stored.path)
+        self.assertEqual(
+            attachment_store.resolve(self.root, "old__0123456789abcdef0123456789abcdef.pdf").read_bytes(),
+            b"legacy",
+        )
+        self.assertIsNone(attachment_store.resolve(self.root, f"paper__{'0' * 64}.pdf"))
+        self.assertIsNone(attachment_store.resolve(self.root, stored.sha256[:2]))
+        self.assertIsNone(attachment_store.resolve(self.root, "../secret"))
+
+
+class TestReferenceCounts(unittest.TestCase):
+    def test_counts_attachment_rows_per_digest(self):
+        engine, SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=engine)
+        digest, other = "a" * 64, "b" * 64
+        with SessionLocal() as db:
+            user = models.User(
+                username="poster",
+                email="poster@example.com",
+                password_hash="x",
+                password_salt="x",
+                is_email_verified=True,
+            )
+            db.add(user)
+            db.flush()
+            for title in ("One", "Two"):
+                post = models.Post(poster_id=user.id, title=title, authors_text="A", abstract="A", body="B")
+                db.add(post)
+                db.flush()
+                db.add(models.Attachment(
+                    post_id=post.id,
+                    file_path=f"/attachments/paper__{digest}.pdf",
+                    mime_type="application/pdf",
+                    sha256=digest,
+                ))
+            db.commit()
+
+            self.assertEqual(attachment_store.reference_counts(db, [digest, other]), {digest: 2})
+
+
+class TestUploadSizeLimitMiddleware(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import_backend_app_with_stubbed_db()
+        cls.main = importlib.import_module("src.backend.main")
+
+    def _call(self, path: str, content_length: int) -> int:
+        request = Request(
+            {
+                "type": "http",
+                "method": "POST",
+                "path": path,
+                "query_string": b"",
+                "headers": [(b"content-length", str(content_length).encode())],
+            }
+        )
+
+        async def call_next(_request):
+            return Response(status_code=200)
+
+        return asyncio.run(self.main.upload_size_limit_middleware(request, call_next)).status_code
+
+    def test_rejects_declared_oversized_uploads_only(self):
+        too_big = attachment_store.MAX_ATTACHMENT_BYTES + self.main.MULTIPART_OVERHEAD_BYTES + 1
+        self.assertEqual(self._call(self.main.ATTACHMENT_UPLOAD_PATH, too_big), 413)
+        self.assertEqual(self._call(self.main.ATTACHMENT_UPLOAD_PATH, 1024), 200)
+        self.assertEqual(self._call("/posts/create", too_big), 200)
+
+
+class TestSweepOrphans(unittest.TestCase):
+    GRACE = 3600
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+        user = models.User(
+            username="poster",
+            email="poster@example.com",
+            password_hash="x",
+            password_salt="x",
+            is_email_verified=True,
+        )
+        self.db.add(user)
+        self.db.flush()
+        self.post = models.Post(poster_id=user.id, title="T", authors_text="A", abstract="A", body="B")
+        self.db.add(self.post)
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self._tmp.cleanup()
+
+    def _blob(self, content: bytes, *, age: float) -> Path:
+        stored = asyncio.run(store_upload(_ChunkedUpload(content), self.root))
+        self._age(stored.path, age)
+        return stored.path
+
+    def _age(self, path: Path, age: float) -> None:
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+
+    def _attach(self, file_path: str, sha256: str | None = None) -> None:
+        self.db.add(models.Attachment(post_id=self.post.id, file_path=file_path, mime_type="application/pdf", sha256=sha256))
+        self.db.commit()
+
+    def test_deletes_only_old_unreferenced_files(self):
+        referenced = self._blob(b"referenced", age=2 * self.GRACE)
+        self._attach(f"/attachments/paper__{referenced.name}.pdf", referenced.name)
+        orphan = self._blob(b"orphan blob", age=2 * self.GRACE)
+        recent = self._blob(b"just uploaded", age=0)
+
+        legacy_used = self.root / "used__0123456789abcdef0123456789abcdef.pdf"
+        legacy_orphan = self.root / "gone__fedcba9876543210fedcba9876543210.pdf"
+        stale_temp = self.root / ".upload-abc.part"
+        keep_file = self.root / ".gitkeep"
+        for path in (legacy_used, legacy_orphan, stale_temp, keep_file):
+            path.write_bytes(b"12345")
+            self._age(path, 2 * self.GRACE)
+        self._attach(f"/attachments/{legacy_used.name}")
+
+        result = attachment_store.sweep_orphans(self.db, self.root, grace_seconds=self.GRACE, batch_size=2)
+
+        self.assertFalse(orphan.exists())
+        self.assertFalse(legacy_orphan.exists())
+        self.assertFalse(stale_temp.exists())
+        for kept in (referenced, recent, legacy_used, keep_file):
+            self.assertTrue(kept.exists(), kept)
+        self.assertEqual(result.scanned, 7)
+        self.assertEqual(result.deleted, 3)
+        self.assertEqual(result.reclaimed_bytes, len(b"orphan blob") + 10)
+
+    def test_reupload_restarts_the_grace_period(self):
+        old = self._blob(b"draft", age=2 * self.GRACE)
+        self.assertEqual(self._blob(b"draft", age=0), old)
+
+        attachment_store.sweep_orphans(self.db, self.root, grace_seconds=self.GRACE)
+        self.assertTrue(old.exists())
+
+    def test_deleting_a_post_orphans_its_blob_only_when_unshared(self):
+        shared = self._blob(b"shared", age=2 * self.GRACE)
+        other_post = models.Post(poster_id=self.post.poster_id, title="U", authors_text="A", abstract="A", body="B")
+        self.db.add(other_post)
+        self.db.commit()
+        for post in (self.post, other_post):
+            self.db.add(models.Attachment(
+                post_id=post.id, file_path=f"/attachments/x__{shared.name}", mime_type="x", sha256=shared.name
+            ))
+        self.db.commit()
+
+        self.db.delete(self.post)
+        self.db.commit()
+        attachment_store.sweep_orphans(self.db, self.root, grace_seconds=self.GRACE)
+        self.assertTrue(shared.exists())
+
+        self.db.delete(other_post)
+        self.db.commit()
+        attachment_store.sweep_orphans(self.db, self.root, grace_seconds=self.GRACE)
+        self.assertFalse(shared.exists())
+
+
+class TestServeAttachment(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import_backend_app_with_stubbed_db()
+        cls.main = importlib.import_module("src.backend.main")
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.content = bytes(range(256)) * 64
+        self.stored = asyncio.run(store_upload(_ChunkedUpload(self.content), self.root))
+        self.name = f"paper__{self.stored.sha256}.pdf"
+        patcher = mock.patch.object(self.main, "ATTACHMENTS_DIR", self.root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+    def _get(self, name: str, headers: dict[str, str] | None = None, method: str = "GET", extensions=None):
+        headers = headers or {}
+        response = self.main.serve_attachment(name, if_none_match=headers.get("if-none-match"))
+        scope = {
+            "type": "http",
+            "method": method,
+            "path": f"/attachments/{name}",
+            "query_string": b"",
+            "headers": [(key.encode(), value.encode()) for key, value in headers.items()],
+            "extensions": extensions or {},
+            # ASGI 2.4: the server reports disconnects on send, so the response does not watch `receive`.
+            "asgi": {"version": "3.0", "spec_version": "2.4"},
+        }
+        messages = []
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(response(scope, receive, send))
+        start = messages[0]
+        self.sent = messages
+        body = b"".join(message.get("body", b"") for message in messages[1:])
+        return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}, body
+
+    def test_full_download_is_immutable_with_a_strong_etag(self):
+        status, headers, body = self._get(self.name)
+        self.assertEqual(status, 200)
+        self.assertEqual(body, self.content)
+        self.assertEqual(headers["etag"], f'"{self.stored.sha256}"')
+        self.assertEqual(headers["cache-control"], attachment_store.IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(headers["content-type"], "application/pdf")
+        self.assertEqual(headers["content-disposition"], 'inline; filename="paper.pdf"')
+        self.assertEqual(headers["accept-ranges"], "bytes")
+
+    def test_servers_with_pathsend_get_the_path_instead_of_the_bytes(self):
+        status, _, body = self._get(self.name, extensions={"http.response.pathsend": {}})
+        self.assertEqual((status, body), (200, b""))
+        self.assertEqual(self.sent[-1], {"type": "http.response.pathsend", "path": str(self.stored.path)})
+
+    def test_matching_if_none_match_gets_304(self):
+        self.assertEqual(self.main.serve_attachment(self.name, if_none_match=f'"{self.stored.sha256}"').status_code, 304)
+        self.assertEqual(self.main.serve_attachment(self.name, if_none_match='"other"').status_code, 200)
+
+    def test_range_requests_get_partial_content(self):
+        status, headers, body = self._get(self.name, {"range": "bytes=100-199"})
+        self.assertEqual(status, 206)
+        self.assertEqual(body, self.content[100:200])
+        self.assertEqual(headers["content-range"], f"bytes 100-199/{len(self.content)}")
+
+        status, _, body = self._get(self.name, {"range": "bytes=100-199", "if-range": '"stale"'})
+        self.assertEqual((status, body), (200, self.content))
+
+        status, headers, _ = self._get(self.name, {"range": f"bytes={len(self.content)}-"})
+        self.assertEqual(status, 416)
+
+    def test_head_sends_headers_only(self):
+        status, headers, body = self._get(self.name, method="HEAD")
+        self.assertEqual((status, body), (200, b""))
+        self.assertEqual(headers["content-length"], str(len(self.content)))
+
+    def test_legacy_files_get_a_stat_etag(self):
+        legacy = self.root / "old__0123456789abcdef0123456789abcdef.pdf"
+        legacy.write_bytes(b"legacy")
+        status, headers, body = self._get(legacy.name)
+        self.assertEqual((status, body), (200, b"legacy"))
+        self.assertRegex(headers["etag"], r'^"[0-9a-f]+-[0-9a-f]+"$')
+
+    def test_accel_redirect_hands_the_blob_to_the_proxy(self):
+        with mock.patch.object(attachment_store, "ACCEL_REDIRECT_PREFIX", "/_attachment_blobs"):
+            status, headers, body = self._get(self.name)
+        digest = self.stored.sha256
+        self.assertEqual((status, body), (200, b""))
+        self.assertEqual(headers["x-accel-redirect"], f"/_attachment_blobs/{digest[:2]}/{digest[2:4]}/{digest}")
+        self.assertEqual(headers["content-type"], "application/pdf")
+        self.assertEqual(headers["cache-control"], attachment_store.IMMUTABLE_CACHE_CONTROL)
+
+    def test_unknown_names_are_404(self):
+        with self.assertRaises(HTTPException) as raised:
+            self.main.serve_attachment(f"paper__{'0' * 64}.pdf")
+        self.assertEqual(raised.exception.status_code, 404)
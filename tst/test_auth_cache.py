@@ -0,0 +1,215 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from fastapi import BackgroundTasks, HTTPException
+from passlib.context import CryptContext
+
+from src.backend.services.auth_cache import Principal, PrincipalCache
+from src.backend.services.token_revocation import DatabaseRevocationStore
+from src.database import models
+
+from tst.test_support import (
+    count_queries,
+    import_backend_app_with_stubbed_db,
+    make_sqlite_session_factory,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestPrincipalCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.cache = PrincipalCache(ttl_seconds=30, max_entries=2, clock=self.clock)
+
+    def _user(self, user_id: int) -> Principal:
+        return Principal(user_id=user_id, role=models.UserRole.USER, revocation_key=f"jti{user_id}")
+
+    def test_entries_expire_at_ttl_or_token_exp_whichever_first(self):
+        self.cache.put("a", self._user(1))
+        self.cache.put("b", self._user(2), token_expires_at=self.clock.now + 5)
+
+        self.clock.now += 10
+        self.assertEqual(self.cache.get("a").user_id, 1)
+        self.assertIsNone(self.cache.get("b"))
+
+        self.clock.now += 30
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.put("a", self._user(1))
+        self.cache.put("b", self._user(2))
+        self.cache.get("a")
+        self.cache.put("c", self._user(3))
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_invalidate_user_drops_all_of_their_tokens(self):
+        self.cache.put("a", self._user(1))
+        self.cache.put("b", self._user(1))
+        self.cache.invalidate_user(1)
+
+        self.assertIsNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        stats = self.cache.stats()
+        self.assertEqual(stats["invalidations"], 2)
+        self.assertEqual((stats["hits"], stats["misses"]), (0, 2))
+
+    def test_zero_ttl_disables_cache(self):
+        cache = PrincipalCache(ttl_seconds=0, max_entries=10)
+        cache.put("a", self._user(1))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["misses"], 0)
+
+
+class TestCachedCurrentUser(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        imported = import_backend_app_with_stubbed_db()
+        cls.user_service = imported.user_service
+
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+
+        self._pwd_context_patcher = patch(
+            "src.backend.services.user_service.pwd_context",
+            new=CryptContext(
+                schemes=["argon2"],
+                deprecated="auto",
+                argon2__time_cost=1,
+                argon2__memory_cost=1024,
+                argon2__parallelism=1,
+            ),
+        )
+        self._pwd_context_patcher.start()
+        self.user_service._revoked_tokens.clear()  # type: ignore
+        self.user_service._principal_cache.clear()  # type: ignore
+
+        self.user_service.register_user(  # type: ignore
+            user_in=self.user_service.UserCreate(  # type: ignore
+                username="alice",
+                password="password123",
+                email="alice@example.com",
+            ),
+            background_tasks=BackgroundTasks(),
+            db=self.db,
+        )
+        self.token = self.user_service.create_token({"sub": "alice"})  # type: ignore
+
+    def tearDown(self):
+        self.db.close()
+        self._pwd_context_patcher.stop()
+
+    def _current_user(self, db=None):
+        return self.user_service.get_current_user(token=self.token, db=db or self.db)  # type: ignore
+
+    def test_hit_skips_the_user_lookup_and_returns_a_session_bound_user(self):
+        self._current_user()
+
+        other_db = self.SessionLocal()
+        try:
+            with count_queries(self.engine) as statements:
+                user = self._current_user(other_db)
+            self.assertEqual(statements, [])
+            self.assertIn(user, other_db)
+
+            user.display_name = "Alice"
+            other_db.commit()
+        finally:
+            other_db.close()
+
+        self.assertEqual(
+            self.db.query(models.User.display_name).filter_by(username="alice").scalar(),
+            "Alice",
+        )
+
+    def test_entries_hold_only_id_role_and_jti_and_load_the_row_on_demand(self):
+        user_id = self._current_user().id
+        principal = self.user_service._principal_cache.get(self.token)  # type: ignore
+        jti = self.user_service.jwt.get_unverified_claims(self.token)["jti"]  # type: ignore
+        self.assertEqual(principal, Principal(user_id=user_id, role=models.UserRole.USER, revocation_key=jti))
+
+        other_db = self.SessionLocal()
+        try:
+            with count_queries(self.engine) as statements:
+                user = self._current_user(other_db)
+                self.assertEqual((user.id, user.role), (user_id, models.UserRole.USER))
+            self.assertEqual(statements, [])
+
+            with count_queries(self.engine) as statements:
+                self.assertEqual(user.username, "alice")
+                self.assertTrue(user.password_hash.startswith("$argon2"))
+            self.assertEqual(len(statements), 1)
+        finally:
+            other_db.close()
+
+    def test_revoking_a_cached_token_is_seen_on_the_next_hit(self):
+        self._current_user()
+        self.user_service._revoked_tokens.revoke(  # type: ignore
+            self.user_service.jwt.get_unverified_claims(self.token)["jti"], 2**31  # type: ignore
+        )
+        with self.assertRaises(HTTPException) as raised:
+            self._current_user()
+        self.assertEqual(raised.exception.detail, "Token has been revoked")
+
+    def test_database_revocation_check_runs_on_the_request_session(self):
+        def no_second_session():
+            raise AssertionError("revocation check opened a second session")
+
+        store = DatabaseRevocationStore(no_second_session)
+        with patch.object(self.user_service, "_revoked_tokens", store):
+            self._current_user()
+            with count_queries(self.engine) as statements:
+                self._current_user()
+            self.assertEqual(len(statements), 1)
+
+            jti = self.user_service.jwt.get_unverified_claims(self.token)["jti"]  # type: ignore
+            self.db.add(models.RevokedToken(jti=jti, expires_at=datetime.now(timezone.utc) + timedelta(hours=1)))
+            self.db.commit()
+            with self.assertRaises(HTTPException):
+                self._current_user()
+
+    def test_profile_update_and_promotion_invalidate_cached_principal(self):
+        user = self._current_user()
+        user_id = user.id
+        self.user_service.update_current_user_profile(  # type: ignore
+            payload=self.user_service.ProfileUpdate(display_name="Alice"),  # type: ignore
+            db=self.db,
+            current_user=user,
+        )
+        self.db.expunge_all()
+        self.assertEqual(self._current_user().display_name, "Alice")
+
+        self.db.query(models.User).filter_by(username="alice").update(
+            {"role": models.UserRole.MODERATOR}
+        )
+        self.db.commit()
+        self.assertEqual(self._current_user().role, models.UserRole.USER)
+        self.user_service.invalidate_cached_user(user_id)  # type: ignore
+        moderator = self._current_user()
+        self.assertEqual(moderator.role, models.UserRole.MODERATOR)
+        self.user_service.promote_user(  # type: ignore
+            username="alice",
+            payload=self.user_service.PromotionRequest(role=models.UserRole.RESEARCHER),  # type: ignore
+            db=self.db,
+            requester=moderator,
+        )
+        self.db.expunge_all()
+        self.assertEqual(self._current_user().role, models.UserRole.RESEARCHER)
+
+    def test_logout_evicts_token(self):
+        user = self._current_user()
+        self.user_service.logout(token=self.token, current_user=user)  # type: ignore
+        self.assertEqual(self.user_service.auth_cache_stats()["size"], 0)  # type: ignore
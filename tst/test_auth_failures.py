@@ -1,4 +1,3 @@
-import asyncio
 import unittest
 from unittest.mock import patch
 
@@ -44,20 +43,15 @@ class TestAuthFailures(unittest.TestCase):
         self.db.commit()
 
     def _register_verified_user(self, username: str) -> models.User:
-        with patch(
-            "src.backend.services.user_service.send_verification_email",
-            autospec=True,
-            side_effect=lambda *_args, **_kwargs: None,
-        ):
-            self.user_service.register_user(  # type: ignore
-                user_in=self.user_service.UserCreate(  # type: ignore
-                    username=username,
-                    password="password123",
-                    email=f"{username}@example.com",
-                ),
-                background_tasks=BackgroundTasks(),
-                db=self.db,
-            )
+        self.user_service.register_user(  # type: ignore
+            user_in=self.user_service.UserCreate(  # type: ignore
+                username=username,
+                password="password123",
+                email=f"{username}@example.com",
+            ),
+            background_tasks=BackgroundTasks(),
+            db=self.db,
+        )
         self._mark_email_verified(username)
         return self.db.query(models.User).filter(models.User.username == username).one()
 
@@ -73,29 +67,29 @@ class TestAuthFailures(unittest.TestCase):
 
     def test_invalid_token_rejected(self):
         with self.assertRaises(HTTPException) as ctx:
-            asyncio.run(self.user_service.get_current_user(token="not-a-token", db=self.db))  # type: ignore
+            self.user_service.get_current_user(token="not-a-token", db=self.db)  # type: ignore
         self.assertEqual(ctx.exception.status_code, 401)
 
     def test_token_without_sub_rejected(self):
         token = self.user_service.create_token({"foo": "bar"})  # type: ignore
         with self.assertRaises(HTTPException) as ctx:
-            asyncio.run(self.user_service.get_current_user(token=token, db=self.db))  # type: ignore
+            self.user_service.get_current_user(token=token, db=self.db)  # type: ignore
         self.assertEqual(ctx.exception.status_code, 401)
 
     def test_token_for_nonexistent_user_rejected(self):
         token = self.user_service.create_token({"sub": "missing-user"})  # type: ignore
         with self.assertRaises(HTTPException) as ctx:
-            asyncio.run(self.user_service.get_current_user(token=token, db=self.db))  # type: ignore
+            self.user_service.get_current_user(token=token, db=self.db)  # type: ignore
         self.assertEqual(ctx.exception.status_code, 404)
 
     def test_revoked_token_rejected(self):
         self._register_verified_user("alice")
         token = self._login_and_get_token("alice")
-        current_user = asyncio.run(self.user_service.get_current_user(token=token, db=self.db))  # type: ignore
+        current_user = self.user_service.get_current_user(token=token, db=self.db)  # type: ignore
 
-        asyncio.run(self.user_service.logout(token=token, current_user=current_user))  # type: ignore
+        self.user_service.logout(token=token, current_user=current_user)  # type: ignore
 
         with self.assertRaises(HTTPException) as ctx:
-            asyncio.run(self.user_service.get_current_user(token=token, db=self.db))  # type: ignore
+            self.user_service.get_current_user(token=token, db=self.db)  # type: ignore
         self.assertEqual(ctx.exception.status_code, 401)
 
@@ -0,0 +1,214 @@
+import asyncio
+import importlib
+import threading
+import unittest
+
+from src.backend.services import change_feed, vote_service
+from src.backend.services.change_feed import RESYNC, ChangeBroker
+from src.database import models
+
+from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+
+class TestChangeBroker(unittest.TestCase):
+    def test_publish_from_a_thread_reaches_matching_subscribers(self):
+        broker = ChangeBroker()
+
+        async def scenario():
+            everything = broker.subscribe()
+            post_1 = broker.subscribe(post_id=1)
+            post_2 = broker.subscribe(post_id=2)
+
+            publisher = threading.Thread(
+                target=broker.publish,
+                args=([("comment", "created", 1), ("report", "created", None)],),
+            )
+            publisher.start()
+            publisher.join()
+
+            received = [await everything.get(), await everything.get()]
+            scoped = await asyncio.wait_for(post_1.get(), 1)
+            self.assertTrue(post_2.queue.empty())
+            for subscription in (everything, post_1, post_2):
+                subscription.close()
+            return received, scoped
+
+        received, scoped = asyncio.run(scenario())
+        self.assertEqual([(c.kind, c.post_id) for c in received], [("comment", 1), ("report", None)])
+        self.assertEqual((scoped.id, scoped.kind), (1, "comment"))
+        self.assertEqual(broker.stats()["subscribers"], 0)
+        self.assertEqual(broker.stats()["delivered"], 3)
+
+    def test_slow_subscriber_gets_one_resync_instead_of_a_backlog(self):
+        broker = ChangeBroker()
+
+        async def scenario():
+            subscription = broker.subscribe()
+            broker.publish([("vote", "updated", 1)] * (change_feed.SUBSCRIBER_QUEUE_SIZE + 5))
+            await asyncio.sleep(0)
+            first = await subscription.get()
+            remaining = subscription.queue.qsize()
+            broker.publish([("vote", "updated", 1)])
+            await asyncio.sleep(0)
+            after = await subscription.get()
+            return first, remaining, after
+
+        first, remaining, after = asyncio.run(scenario())
+        self.assertIs(first, RESYNC)
+        self.assertEqual(remaining, 0)
+        self.assertEqual(after.kind, "vote")
+
+    def test_replay_returns_missed_events_or_none_when_too_old(self):
+        broker = ChangeBroker(history_size=3)
+        broker.publish([("post", "created", 1), ("comment", "created", 2)])
+        self.assertEqual([c.id for c in broker.replay(0)], [1, 2])
+        self.assertEqual([c.id for c in broker.replay(0, post_id=2)], [2])
+        self.assertEqual(broker.replay(2), [])
+
+        broker.publish([("vote", "updated", 1)] * 3)
+        self.assertIsNone(broker.replay(1))
+        self.assertEqual([c.id for c in broker.replay(2)], [3, 4, 5])
+
+
+class TestCommitHooks(unittest.TestCase):
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+        self.users = [
+            models.User(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password_hash="x",
+                password_salt="x",
+                is_email_verified=True,
+            )
+            for i in range(2)
+        ]
+        self.db.add_all(self.users)
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _changes_during(self, action) -> list[tuple[str, str, int | None]]:
+        before = change_feed.broker.last_id
+        action()
+        return [(c.kind, c.action, c.post_id) for c in change_feed.broker.replay(before)]
+
+    def test_committed_changes_are_published_once_per_post(self):
+        post = models.Post(
+            poster_id=self.users[0].id,
+            title="Post",
+            authors_text="Author",
+            abstract="Abstract",
+            body="Body",
+            phase=models.PostPhase.PUBLISHED,
+        )
+
+        def create_post():
+            self.db.add(post)
+            self.db.commit()
+
+        self.assertEqual(self._changes_during(create_post), [("post", "created", post.id)])
+
+        def comment_twice():
+            self.db.add_all([
+                models.Comment(post_id=post.id, commenter_id=self.users[1].id, body="a"),
+                models.Comment(post_id=post.id, commenter_id=self.users[1].id, body="b"),
+            ])
+            self.db.commit()
+
+        self.assertEqual(self._changes_during(comment_twice), [("comment", "created", post.id)])
+
+        comment = self.db.query(models.Comment).first()
+        self.assertEqual(
+            self._changes_during(lambda: vote_service.vote_comment(self.db, self.users[0].id, comment.id, 1)),
+            [("vote", "updated", post.id)],
+        )
+
+    def test_votes_on_unloaded_comments_still_name_their_post(self):
+        post = models.Post(
+            poster_id=self.users[0].id,
+            title="Post",
+            authors_text="Author",
+            abstract="Abstract",
+            body="Body",
+            phase=models.PostPhase.PUBLISHED,
+        )
+        self.db.add(post)
+        self.db.flush()
+        comment = models.Comment(post_id=post.id, commenter_id=self.users[1].id, body="a")
+        self.db.add(comment)
+        self.db.commit()
+        post_id, comment_id = post.id, comment.id
+        revision = post.revision
+
+        def vote_from_a_fresh_session():
+            with self.SessionLocal() as db:
+                db.add(models.CommentVote(comment_id=comment_id, user_id=self.users[0].id, value=1))
+                db.commit()
+
+        self.assertEqual(self._changes_during(vote_from_a_fresh_session), [("vote", "updated", post_id)])
+        self.db.expire_all()
+        self.assertGreater(self.db.get(models.Post, post_id).revision, revision)
+
+    def test_rolled_back_changes_are_not_published(self):
+        def rolled_back():
+            self.db.add(models.Report(
+                reported_by_id=self.users[0].id,
+                target_type="POST",
+                target_id=1,
+                status=models.ReportStatus.OPEN,
+                description="spam",
+            ))
+            self.db.flush()
+            self.db.rollback()
+
+        self.assertEqual(self._changes_during(rolled_back), [])
+
+
+class _Request:
+    def __init__(self, connected_checks: int):
+        self._checks = connected_checks
+
+    async def is_disconnected(self) -> bool:
+        self._checks -= 1
+        return self._checks < 0
+
+
+class TestEventStream(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import_backend_app_with_stubbed_db()
+        cls.main = importlib.import_module("src.backend.main")
+
+    def _read(self, *, post_id=None, last_event_id=None, publish=(), connected_checks=1) -> list[str]:
+        async def scenario():
+            response = await self.main.stream_changes(
+                _Request(connected_checks), post_id=post_id, last_event_id=last_event_id
+            )
+            change_feed.broker.publish(publish)
+            return [chunk async for chunk in response.body_iterator]
+
+        return asyncio.run(scenario())
+
+    def test_streams_published_changes(self):
+        chunks = self._read(post_id=7, publish=[("review", "created", 7)])
+        self.assertEqual(chunks[0], "retry: 3000\n\n")
+        self.assertIn("event: change", chunks[1])
+        self.assertIn('"kind": "review"', chunks[1])
+        self.assertIn('"post_id": 7', chunks[1])
+
+    def test_reconnect_replays_missed_events(self):
+        last_seen = change_feed.broker.last_id
+        change_feed.broker.publish([("post", "updated", 9), ("comment", "created", 9)])
+        chunks = self._read(post_id=9, last_event_id=str(last_seen), connected_checks=0)
+        self.assertEqual(len(chunks), 3)
+        self.assertIn('"kind": "post"', chunks[1])
+        self.assertIn('"kind": "comment"', chunks[2])
+
+    def test_reconnect_after_history_was_trimmed_asks_for_resync(self):
+        change_feed.broker.publish([("vote", "updated", 3)] * (change_feed.HISTORY_SIZE + 1))
+        chunks = self._read(last_event_id="1", connected_checks=0)
+        self.assertEqual(chunks[1], "event: resync\ndata: {}\n\n")
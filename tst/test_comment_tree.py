@@ -0,0 +1,192 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, Response
+
+from src.backend.services import comment_paths
+from src.database import models
+
+from tst.test_support import count_queries, import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+
+class TestCommentTree(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.post_service = import_backend_app_with_stubbed_db().post_service
+
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+        self.user = models.User(
+            username="commenter",
+            email="commenter@example.com",
+            password_hash="x",
+            password_salt="x",
+            is_email_verified=True,
+        )
+        self.db.add(self.user)
+        self.db.flush()
+        self.post = models.Post(poster_id=self.user.id, title="T", authors_text="A", abstract="A", body="B")
+        self.db.add(self.post)
+        self.db.commit()
+        self._clock = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def tearDown(self):
+        self.db.close()
+
+    def _comment(self, body: str, parent: models.Comment | None = None, upvotes: int = 0) -> models.Comment:
+        self._clock += timedelta(seconds=1)
+        comment = models.Comment(
+            post_id=self.post.id,
+            commenter_id=self.user.id,
+            parent_comment_id=parent.id if parent else None,
+            body=body,
+            created_at=self._clock,
+            upvotes=upvotes,
+            **comment_paths.child_fields(parent),
+        )
+        self.db.add(comment)
+        self.db.commit()
+        return comment
+
+    def _tree(self, **params):
+        response = Response()
+        nodes = self.post_service.get_post_comment_tree(self.post.id, db=self.db, response=response, **params)
+        return nodes, response.headers.get(self.post_service.NEXT_CURSOR_HEADER)
+
+    def _seed_thread(self, top_level: int = 3, replies: int = 4):
+        roots = [self._comment(f"root {i}", upvotes=i) for i in range(top_level)]
+        children = [self._comment(f"reply {i}", roots[0]) for i in range(replies)]
+        for i in range(2):
+            self._comment(f"nested {i}", children[0])
+        return roots, children
+
+    def test_nests_a_bounded_number_of_replies_per_node(self):
+        roots, children = self._seed_thread()
+        nodes, next_cursor = self._tree(limit=2, replies=2, depth=2)
+
+        self.assertIsNotNone(next_cursor)
+        self.assertEqual([node.body for node in nodes], ["root 0", "root 1"])
+        first = nodes[0]
+        self.assertEqual(first.reply_count, 4)
+        self.assertEqual([reply.body for reply in first.replies], ["reply 0", "reply 1"])
+        self.assertIsNotNone(first.replies_cursor)
+        self.assertEqual([nested.body for nested in first.replies[0].replies], ["nested 0", "nested 1"])
+        self.assertIsNone(first.replies[0].replies_cursor)
+        self.assertEqual((nodes[1].reply_count, nodes[1].replies, nodes[1].upvotes), (0, [], 1))
+        self.assertEqual((first.descendant_count, first.replies[0].descendant_count), (6, 2))
+
+        rest, _ = self._tree(limit=2, replies=2, depth=2, cursor=next_cursor)
+        self.assertEqual([node.body for node in rest], ["root 2"])
+
+    def test_replies_cursor_continues_a_subtree(self):
+        roots, _children = self._seed_thread()
+        first = self._tree(replies=2, depth=1)[0][0]
+
+        response = Response()
+        more = self.post_service.get_comment_replies(
+            self.post.id, roots[0].id, db=self.db, cursor=first.replies_cursor, response=response
+        )
+        self.assertEqual([reply.body for reply in more], ["reply 2", "reply 3"])
+        self.assertNotIn(self.post_service.NEXT_CURSOR_HEADER, response.headers)
+
+    def test_deepest_level_reports_reply_counts_only(self):
+        self._seed_thread()
+        first = self._tree(replies=2, depth=1)[0][0]
+        self.assertEqual(first.replies[0].reply_count, 2)
+        self.assertEqual(first.replies[0].replies, [])
+
+    def test_query_count_does_not_grow_with_the_thread(self):
+        def queries() -> int:
+            with count_queries(self.engine) as statements:
+                self._tree(limit=50, replies=3, depth=3)
+            return len(statements)
+
+        self._seed_thread(top_level=2, replies=1)
+        small = queries()
+        self._seed_thread(top_level=20, replies=10)
+        self.assertEqual(queries(), small)
+
+    def test_matching_etag_gets_304(self):
+        self._seed_thread()
+        response = Response()
+        self.post_service.get_post_comment_tree(self.post.id, db=self.db, response=response)
+        not_modified = self.post_service.get_post_comment_tree(
+            self.post.id, db=self.db, if_none_match=response.headers["ETag"]
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_unknown_post_or_comment_is_404(self):
+        with self.assertRaises(HTTPException) as raised:
+            self.post_service.get_post_comment_tree(self.post.id + 1, db=self.db)
+        self.assertEqual(raised.exception.status_code, 404)
+        with self.assertRaises(HTTPException) as raised:
+            self.post_service.get_comment_replies(self.post.id, 999, db=self.db)
+        self.assertEqual(raised.exception.status_code, 404)
+
+    def _reply(self, parent: models.Comment) -> models.Comment:
+        return self._comment(f"reply to {parent.id}", parent)
+
+    def test_paths_follow_the_parent_chain(self):
+        root = self._comment("root")
+        child = self._reply(root)
+        grandchild = self._reply(child)
+        self.assertEqual((root.ancestry, root.depth), ("", 0))
+        self.assertEqual((grandchild.ancestry, grandchild.depth), (f"{root.id}/{child.id}/", 2))
+
+    def test_thread_is_one_query_and_depth_limited(self):
+        root = self._comment("root")
+        level = [root]
+        for _ in range(4):
+            level = [self._reply(parent) for parent in level for _ in range(2)]
+        self._comment("other thread")
+        post_id, root_id = self.post.id, root.id
+
+        with count_queries(self.engine) as statements:
+            thread = self.post_service.get_comment_thread(post_id, root_id, db=self.db)
+        # Root lookup, ETag stamp and the subtree itself.
+        self.assertEqual(len(statements), 3)
+        self.assertEqual(len(thread), 1 + 2 + 4 + 8 + 16)
+        self.assertEqual(thread[0].id, root.id)
+
+        limited = self.post_service.get_comment_thread(self.post.id, root.id, db=self.db, max_depth=2)
+        self.assertEqual(len(limited), 1 + 2 + 4)
+        self.assertEqual(comment_paths.descendant_counts(self.db, [root.id]), {root.id: 30})
+
+    def test_deleting_a_comment_removes_its_thread_and_closes_reports(self):
+        root = self._comment("root")
+        child = self._reply(root)
+        grandchild = self._reply(child)
+        sibling = self._comment("sibling")
+        self.db.add(models.CommentVote(user_id=self.user.id, comment_id=grandchild.id, value=1))
+        self.db.add(models.Report(
+            reported_by_id=self.user.id, target_type="COMMENT", target_id=grandchild.id, description="spam"
+        ))
+        self.db.commit()
+
+        self.post_service.delete_comment(self.post.id, root.id, db=self.db, current_user=self.user)
+
+        self.assertEqual([c.id for c in self.db.query(models.Comment).all()], [sibling.id])
+        self.assertEqual(self.db.query(models.CommentVote).count(), 0)
+        self.assertEqual(self.db.query(models.Report).one().status, models.ReportStatus.CLOSED)
+
+    def test_backfill_rebuilds_paths_from_parent_ids(self):
+        root = self._comment("root")
+        child = self._reply(root)
+        grandchild = self._reply(child)
+        self.db.query(models.Comment).update({"ancestry": "", "depth": 0})
+        self.db.commit()
+
+        self.assertEqual(comment_paths.backfill(self.db), 2)
+        self.db.expire_all()
+        self.assertEqual((child.ancestry, child.depth), (f"{root.id}/", 1))
+        self.assertEqual((grandchild.ancestry, grandchild.depth), (f"{root.id}/{child.id}/", 2))
+
+    def test_tampered_comment_cursor_is_400(self):
+        self._seed_thread()
+        for values in (["2024-01-01T00:00:00+00:00", [1]], [None, 1], ["2024-01-01", "1"]):
+            cursor = self.post_service._encode_cursor(self.post_service._COMMENT_CURSOR_KEY, values)
+            with self.subTest(values=values), self.assertRaises(HTTPException) as raised:
+                self._tree(cursor=cursor)
+            self.assertEqual(raised.exception.status_code, 400)
@@ -0,0 +1,188 @@
+import unittest
+
+from fastapi import Response
+
+from src.backend.services import revisions, vote_service
+from src.database import models
+
+from tst.test_support import count_queries, import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+
+class TestEtagMatching(unittest.TestCase):
+    def test_weak_comparison_lists_and_wildcard(self):
+        etag = revisions.make_etag("post", 1, 2, 3)
+        self.assertEqual(etag, 'W/"post.1.2.3"')
+
+        self.assertIsNotNone(revisions.conditional(etag, etag, None))
+        self.assertIsNotNone(revisions.conditional('"post.1.2.3"', etag, None))
+        self.assertIsNotNone(revisions.conditional('W/"other", W/"post.1.2.3"', etag, None))
+        self.assertIsNotNone(revisions.conditional("*", etag, None))
+
+        response = Response()
+        self.assertIsNone(revisions.conditional('W/"post.1.2.4"', etag, response))
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertIsNone(revisions.conditional(None, etag, None))
+
+
+class TestConditionalReads(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        imported = import_backend_app_with_stubbed_db()
+        cls.post_service = imported.post_service
+        cls.review_service = imported.review_service
+        cls.user_service = imported.user_service
+
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+        self.poster, self.reader = (
+            models.User(
+                username=name,
+                email=f"{name}@example.com",
+                password_hash="x",
+                password_salt="x",
+                is_email_verified=True,
+            )
+            for name in ("poster", "reader")
+        )
+        self.db.add_all([self.poster, self.reader])
+        self.db.flush()
+        self.post = models.Post(
+            poster_id=self.poster.id,
+            title="Post",
+            authors_text="Author",
+            abstract="Abstract",
+            body="Body",
+            phase=models.PostPhase.PUBLISHED,
+        )
+        self.db.add(self.post)
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _etag(self, handler, *args, **kwargs) -> str:
+        response = Response()
+        handler(*args, db=self.db, response=response, **kwargs)
+        return response.headers["ETag"]
+
+    def _revision(self) -> int:
+        return revisions.post_stamp(self.db, self.post.id)[0]
+
+    def test_post_revision_follows_comments_votes_and_edits(self):
+        start = self._revision()
+
+        comment = models.Comment(post_id=self.post.id, commenter_id=self.reader.id, body="hi")
+        self.db.add(comment)
+        self.db.commit()
+        after_comment = self._revision()
+        self.assertGreater(after_comment, start)
+
+        vote_service.vote_comment(self.db, self.poster.id, comment.id, 1)
+        after_vote = self._revision()
+        self.assertGreater(after_vote, after_comment)
+
+        self.post.title = "Renamed"
+        self.db.commit()
+        self.assertGreater(self._revision(), after_vote)
+
+    def test_rolled_back_changes_do_not_bump_the_revision(self):
+        start = self._revision()
+        self.db.add(models.Comment(post_id=self.post.id, commenter_id=self.reader.id, body="hi"))
+        self.db.flush()
+        self.db.rollback()
+        self.assertEqual(self._revision(), start)
+
+    def test_matching_etag_answers_304_until_the_post_changes(self):
+        reads = (
+            (self.post_service.get_research_post, self.post.id),
+            (self.post_service.get_post_comments, self.post.id),
+            (self.review_service.get_post_reviews, self.post.id),
+        )
+        etags = [self._etag(handler, arg) for handler, arg in reads]
+        for (handler, arg), etag in zip(reads, etags):
+            not_modified = handler(arg, db=self.db, if_none_match=etag)
+            self.assertEqual(not_modified.status_code, 304)
+            self.assertEqual(not_modified.headers["ETag"], etag)
+
+        self.db.add(models.Comment(post_id=self.post.id, commenter_id=self.reader.id, body="new"))
+        self.db.commit()
+
+        for (handler, arg), etag in zip(reads, etags):
+            listed = handler(arg, db=self.db, if_none_match=etag)
+            self.assertNotIsInstance(listed, Response)
+            self.assertNotEqual(self._etag(handler, arg), etag)
+
+    def test_feed_and_profile_etags_change_with_their_rows(self):
+        feed = self._etag(self.post_service.find_research_posts)
+        profile = self._etag(self.user_service.get_user_profile, "poster")
+        self.assertEqual(
+            self.post_service.find_research_posts(db=self.db, if_none_match=feed).status_code, 304
+        )
+        self.assertEqual(
+            self.user_service.get_user_profile("poster", db=self.db, if_none_match=profile).status_code, 304
+        )
+
+        self.poster.bio = "Updated"
+        self.db.commit()
+
+        self.assertNotEqual(self._etag(self.user_service.get_user_profile, "poster"), profile)
+        # The feed does not show bios: its ETag stays put.
+        self.assertEqual(self._etag(self.post_service.find_research_posts), feed)
+
+        self.reader.username = "renamed-reader"
+        self.db.commit()
+        self.assertEqual(self._etag(self.post_service.find_research_posts), feed)
+
+        # It does show the poster's username.
+        self.poster.username = "renamed-poster"
+        self.db.commit()
+        self.assertNotEqual(self._etag(self.post_service.find_research_posts), feed)
+
+    def test_feed_etag_is_one_primary_key_read(self):
+        feed = self._etag(self.post_service.find_research_posts)
+        with count_queries(self.engine) as statements:
+            not_modified = self.post_service.find_research_posts(db=self.db, if_none_match=feed)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(len(statements), 1)
+        self.assertIn("feed_revision", statements[0])
+
+        vote_service.vote_post(self.db, self.reader.id, self.post.id, 1)
+        self.assertNotEqual(self._etag(self.post_service.find_research_posts), feed)
+
+    def test_feed_revision_is_bumped_after_commit_outside_the_write(self):
+        start = revisions.feed_stamp(self.db)
+        self.db.commit()
+
+        self.db.add(models.PostVote(user_id=self.reader.id, post_id=self.post.id, value=1))
+        with count_queries(self.engine) as statements:
+            self.db.flush()
+        # The writer's own transaction never touches the shared row, so writers do not queue on its lock.
+        self.assertFalse(any("feed_revision" in statement for statement in statements))
+
+        self.db.rollback()
+        self.assertEqual(revisions.feed_stamp(self.db), start)
+
+        self.db.add(models.PostVote(user_id=self.reader.id, post_id=self.post.id, value=1))
+        self.db.commit()
+        self.assertEqual(revisions.feed_stamp(self.db), start + 1)
+
+    def test_reports_do_not_bump_the_post_revision(self):
+        start = self._revision()
+        self.db.add(models.Report(
+            reported_by_id=self.reader.id,
+            target_type="POST",
+            target_id=self.post.id,
+            status=models.ReportStatus.OPEN,
+            description="spam",
+        ))
+        self.db.commit()
+        self.assertEqual(self._revision(), start)
+
+    def test_missing_post_still_404s(self):
+        from fastapi import HTTPException
+
+        with self.assertRaises(HTTPException) as raised:
+            self.post_service.get_research_post(9999, db=self.db, if_none_match="*")
+        self.assertEqual(raised.exception.status_code, 404)
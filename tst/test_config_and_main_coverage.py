@@ -57,6 +57,7 @@ class TestConfigAndMainCoverage(unittest.TestCase):
             raise RuntimeError("Test must override dependency `get_db`.")
 
         fake_db.get_db = get_db # type: ignore
+        fake_db.pool_stats = lambda: {}  # type: ignore
 
         try:
             sys.modules["uvicorn"] = fake_uvicorn  # type: ignore
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from sqlalchemy import create_engine, exc, text
+
+from src.database.pool import InstrumentedQueuePool
+
+from tst.test_support import import_backend_app_with_stubbed_db
+
+
+class TestInstrumentedQueuePool(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine(
+            f"sqlite:///{os.path.join(self._tmp.name, 'pool.db')}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=2,
+            max_overflow=1,
+            pool_timeout=0.2,
+            pool_pre_ping=True,
+        )
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._tmp.cleanup()
+
+    def test_counts_checkouts_and_overflow(self):
+        with self.engine.connect() as a, self.engine.connect() as b, self.engine.connect() as c:
+            for conn in (a, b, c):
+                conn.execute(text("SELECT 1"))
+            stats = self.engine.pool.stats()  # type: ignore[attr-defined]
+            self.assertEqual(stats["checked_out"], 3)
+            self.assertEqual(stats["overflow"], 1)
+
+        stats = self.engine.pool.stats()  # type: ignore[attr-defined]
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["checkouts"], 3)
+        self.assertEqual(stats["timeouts"], 0)
+
+    def test_waits_for_a_released_connection_then_times_out(self):
+        held = [self.engine.connect() for _ in range(3)]
+
+        def release_one():
+            time.sleep(0.05)
+            held.pop().close()
+
+        threading.Thread(target=release_one).start()
+        with self.engine.connect():
+            stats = self.engine.pool.stats()  # type: ignore[attr-defined]
+            self.assertGreaterEqual(stats["max_wait_seconds"], 0.04)
+
+            with self.assertRaises(exc.TimeoutError):
+                self.engine.connect()
+
+        for conn in held:
+            conn.close()
+        self.assertEqual(self.engine.pool.stats()["timeouts"], 1)  # type: ignore[attr-defined]
+
+    def test_invalidated_connections_are_counted(self):
+        with self.engine.connect() as conn:
+            conn.invalidate()
+        self.assertEqual(self.engine.pool.stats()["invalidated"], 1)  # type: ignore[attr-defined]
+
+    def test_dispose_recreates_an_instrumented_pool(self):
+        with self.engine.connect():
+            pass
+        self.engine.dispose()
+        self.assertIsInstance(self.engine.pool, InstrumentedQueuePool)
+        self.assertEqual(self.engine.pool.stats()["checkouts"], 0)  # type: ignore[attr-defined]
+
+
+class TestPoolExhaustedResponse(unittest.TestCase):
+    def test_pool_timeout_becomes_503_with_retry_after(self):
+        main = import_backend_app_with_stubbed_db().app
+        handler = main.exception_handlers[exc.TimeoutError]  # type: ignore[attr-defined]
+        response = asyncio.run(handler(None, exc.TimeoutError("QueuePool limit reached")))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "1")
@@ -0,0 +1,158 @@
+import socketserver
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from src.backend.services import email_outbox
+from src.backend.services.email_outbox import PooledSMTP, deliver_pending, enqueue_email, retry_delay
+from src.database import models
+
+from tst.test_support import make_sqlite_session_factory
+
+
+class _StubSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough of RFC 5321 for smtplib: EHLO, MAIL, RCPT, DATA, NOOP, RSET, QUIT."""
+
+    def handle(self):
+        server: _StubSMTPServer = self.server  # type: ignore[assignment]
+        server.connections += 1
+        self._reply("220 stub ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self._reply("250 stub")
+            elif verb == "RCPT" and "reject" in command:
+                self._reply("550 no such user")
+            elif verb in ("MAIL", "RCPT", "NOOP", "RSET"):
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 go ahead")
+                payload = []
+                while (data_line := self.rfile.readline()) not in (b".\r\n", b""):
+                    payload.append(data_line)
+                server.messages.append(b"".join(payload).decode())
+                self._reply("250 queued")
+                if server.drop_after_next_message:
+                    server.drop_after_next_message = False
+                    return
+            elif verb == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("502 not implemented")
+
+    def _reply(self, text: str) -> None:
+        self.wfile.write(text.encode() + b"\r\n")
+
+
+class _StubSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubSMTPHandler)
+        self.connections = 0
+        self.messages: list[str] = []
+        self.drop_after_next_message = False
+
+
+class TestEmailOutbox(unittest.TestCase):
+    def setUp(self):
+        self.server = _StubSMTPServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        self.smtp = PooledSMTP(host, port, username=None, password=None, use_starttls=False, timeout=5)
+
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+        self.now = datetime.now(timezone.utc) + timedelta(seconds=1)
+
+    def tearDown(self):
+        self.smtp.close()
+        self.db.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _enqueue(self, recipient: str) -> None:
+        enqueue_email(self.db, recipient=recipient, subject="Hello", body=f"Hi {recipient}")
+        self.db.commit()
+
+    def _deliver(self, *, max_attempts: int = 3) -> dict[str, int]:
+        return deliver_pending(
+            self.db,
+            self.smtp,
+            sender="portal@example.com",
+            max_attempts=max_attempts,
+            retry_base_seconds=30,
+            now=self.now,
+        )
+
+    def test_batch_is_sent_over_one_reused_connection(self):
+        for i in range(3):
+            self._enqueue(f"user{i}@example.com")
+
+        self.assertEqual(self._deliver(), {"sent": 3, "retrying": 0, "failed": 0})
+        self._enqueue("late@example.com")
+        self.assertEqual(self._deliver()["sent"], 1)
+
+        self.assertEqual(len(self.server.messages), 4)
+        self.assertIn("To: user0@example.com", self.server.messages[0])
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.smtp.connections_opened, 1)
+        statuses = {row.status for row in self.db.query(models.OutboundEmail)}
+        self.assertEqual(statuses, {models.EmailStatus.SENT})
+
+    def test_rejected_message_backs_off_then_gives_up(self):
+        self._enqueue("reject@example.com")
+        self._enqueue("ok@example.com")
+
+        self.assertEqual(self._deliver(max_attempts=2), {"sent": 1, "retrying": 1, "failed": 0})
+        rejected = self.db.query(models.OutboundEmail).filter_by(recipient="reject@example.com").one()
+        self.assertEqual(rejected.attempts, 1)
+        self.assertIn("SMTPRecipientsRefused", rejected.last_error)
+
+        # Not due yet: nothing is attempted before the backoff expires.
+        self.assertEqual(self._deliver(max_attempts=2), {"sent": 0, "retrying": 0, "failed": 0})
+
+        self.now += timedelta(seconds=30)
+        self.assertEqual(self._deliver(max_attempts=2), {"sent": 0, "retrying": 0, "failed": 1})
+        self.db.refresh(rejected)
+        self.assertEqual(rejected.status, models.EmailStatus.FAILED)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_server_disconnect_reconnects_transparently(self):
+        self.server.drop_after_next_message = True
+        self._enqueue("first@example.com")
+        self._enqueue("second@example.com")
+
+        self.assertEqual(self._deliver(), {"sent": 2, "retrying": 0, "failed": 0})
+        self.assertEqual(self.smtp.connections_opened, 2)
+
+    def test_unreachable_server_keeps_messages_pending(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self._enqueue("someone@example.com")
+
+        self.assertEqual(self._deliver(), {"sent": 0, "retrying": 1, "failed": 0})
+        queued = self.db.query(models.OutboundEmail).one()
+        self.assertEqual(queued.status, models.EmailStatus.PENDING)
+        self.assertEqual(
+            queued.next_attempt_at.replace(tzinfo=timezone.utc), self.now + timedelta(seconds=30)
+        )
+
+    def test_old_sent_messages_are_pruned(self):
+        self._enqueue("old@example.com")
+        self._deliver()
+        self.now += email_outbox.SENT_RETENTION + timedelta(seconds=1)
+        self._deliver()
+        self.assertEqual(self.db.query(models.OutboundEmail).count(), 0)
+
+    def test_retry_delay_doubles_and_is_capped(self):
+        self.assertEqual(retry_delay(1, 30), timedelta(seconds=30))
+        self.assertEqual(retry_delay(3, 30), timedelta(seconds=120))
+        self.assertEqual(retry_delay(20, 30), email_outbox.MAX_RETRY_DELAY)
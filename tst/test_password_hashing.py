@@ -0,0 +1,170 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import anyio
+from fastapi import BackgroundTasks, HTTPException
+from passlib.context import CryptContext
+
+from src.backend.services.password_hashing import HashingPool, HashingPoolSaturated
+from src.database import models
+
+from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+
+def _fast_context(time_cost: int = 1) -> CryptContext:
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__time_cost=time_cost,
+        argon2__memory_cost=1024,
+        argon2__parallelism=1,
+    )
+
+
+class TestHashingPool(unittest.TestCase):
+    def test_rejects_when_workers_and_queue_are_full(self):
+        pool = HashingPool(max_workers=1, max_queue=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "done"
+
+        results: list[str] = []
+        threads = [threading.Thread(target=lambda: results.append(pool.run(slow))) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        started.wait(5)
+        deadline = time.monotonic() + 5
+        while pool.stats()["in_flight"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        with self.assertRaises(HashingPoolSaturated) as ctx:
+            pool.run(str.upper, "x")
+        self.assertGreaterEqual(ctx.exception.retry_after, 1)
+
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(results, ["done", "done"])
+        self.assertEqual(pool.run(str.upper, "x"), "X")
+        self.assertEqual(pool.stats()["rejected"], 1)
+        pool.shutdown()
+
+
+class TestLoginHashing(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        imported = import_backend_app_with_stubbed_db()
+        cls.user_service = imported.user_service
+
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+        self.user_service._revoked_tokens.clear()  # type: ignore
+
+        with patch("src.backend.services.user_service.pwd_context", new=_fast_context()):
+            self.user_service.register_user(  # type: ignore
+                user_in=self.user_service.UserCreate(  # type: ignore
+                    username="alice",
+                    password="password123",
+                    email="alice@example.com",
+                ),
+                background_tasks=BackgroundTasks(),
+                db=self.db,
+            )
+        self.user = self.db.query(models.User).filter_by(username="alice").one()
+        self.user.is_email_verified = True
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _login(self):
+        form = self.user_service.OAuth2PasswordRequestForm(  # type: ignore
+            username="alice",
+            password="password123",
+            scope="",
+            client_id=None,
+            client_secret=None,
+        )
+        return self.user_service.login(form_data=form, db=self.db)  # type: ignore
+
+    def test_login_rehashes_when_argon2_parameters_change(self):
+        old_hash = self.user.password_hash
+        self.assertIn("t=1", old_hash)
+
+        with patch("src.backend.services.user_service.pwd_context", new=_fast_context(time_cost=2)):
+            self._login()
+            self.db.refresh(self.user)
+            self.assertIn("t=2", self.user.password_hash)
+            self.assertEqual(
+                self.user.password_salt,
+                self.user_service._extract_argon_salt(self.user.password_hash),  # type: ignore
+            )
+
+            rehashed = self.user.password_hash
+            self._login()
+            self.db.refresh(self.user)
+            self.assertEqual(self.user.password_hash, rehashed)
+
+    def test_saturated_pool_returns_503_with_retry_after(self):
+        saturated = HashingPool(max_workers=1, max_queue=0)
+        saturated._slots.acquire()
+        with patch.object(self.user_service, "_hashing_pool", new=saturated):
+            with self.assertRaises(HTTPException) as ctx:
+                self._login()
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertEqual(ctx.exception.headers["Retry-After"], "1")
+        saturated.shutdown()
+
+
+class TestBurstBackpressure(unittest.TestCase):
+    def test_saturated_burst_leaves_the_request_threadpool_serving(self):
+        user_service = import_backend_app_with_stubbed_db().user_service
+        held = user_service.PASSWORD_HASH_WORKERS + user_service.PASSWORD_HASH_MAX_QUEUE
+        pool = HashingPool(
+            max_workers=user_service.PASSWORD_HASH_WORKERS, max_queue=user_service.PASSWORD_HASH_MAX_QUEUE
+        )
+        release = threading.Event()
+
+        def slow():
+            release.wait(10)
+            return "hashed"
+
+        def login() -> str:
+            try:
+                return pool.run(slow)
+            except HashingPoolSaturated:
+                return "503"
+
+        async def burst():
+            threads = anyio.to_thread.current_default_thread_limiter().total_tokens
+            results: list[str] = []
+
+            async def request():
+                results.append(await anyio.to_thread.run_sync(login))
+
+            async with anyio.create_task_group() as group:
+                for _ in range(threads):
+                    group.start_soon(request)
+                with anyio.fail_after(5):
+                    # Everything beyond workers + queue is turned away without waiting...
+                    while len(results) < threads - held:
+                        await anyio.sleep(0.01)
+                    # ...so an unrelated sync handler still gets a thread mid-burst.
+                    other = await anyio.to_thread.run_sync(lambda: "served")
+                release.set()
+            return threads, results, other
+
+        threads, results, other = anyio.run(burst)
+        pool.shutdown()
+        self.assertLessEqual(held, threads // 4)
+        self.assertEqual(other, "served")
+        self.assertEqual(results.count("hashed"), held)
+        self.assertEqual(results.count("503"), threads - held)
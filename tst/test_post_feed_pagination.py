@@ -0,0 +1,142 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, Response
+
+from src.backend.services import vote_service
+from src.database import models
+
+from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+
+class TestPostFeedPagination(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        imported = import_backend_app_with_stubbed_db()
+        cls.post_service = imported.post_service
+
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+
+        self.users = [
+            models.User(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password_hash="x",
+                password_salt="x",
+                is_email_verified=True,
+            )
+            for i in range(3)
+        ]
+        self.db.add_all(self.users)
+        self.db.commit()
+
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.posts = [
+            models.Post(
+                poster_id=self.users[0].id,
+                title=f"Post {i}",
+                authors_text="Author",
+                abstract="Abstract",
+                body="shared words",
+                created_at=base + timedelta(days=i // 2),
+                phase=models.PostPhase.PUBLISHED,
+            )
+            for i in range(5)
+        ]
+        self.db.add_all(self.posts)
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _page(self, **params):
+        response = Response()
+        posts = self.post_service.find_research_posts(  # type: ignore
+            db=self.db,
+            response=response,
+            **params,
+        )
+        return posts, response.headers.get(self.post_service.NEXT_CURSOR_HEADER)  # type: ignore
+
+    def _walk(self, **params) -> list[str]:
+        titles: list[str] = []
+        cursor = None
+        while True:
+            posts, cursor = self._page(limit=2, cursor=cursor, **params)
+            titles.extend(post.title for post in posts)
+            if cursor is None:
+                return titles
+
+    def test_newest_pages_cover_every_post_once_with_ties_broken_by_id(self):
+        first_page, cursor = self._page(limit=2)
+        self.assertEqual([p.title for p in first_page], ["Post 4", "Post 3"])
+        self.assertIsNotNone(cursor)
+
+        self.assertEqual(
+            self._walk(),
+            ["Post 4", "Post 3", "Post 2", "Post 1", "Post 0"],
+        )
+
+    def test_unpaged_request_returns_everything_without_cursor(self):
+        posts, cursor = self._page()
+        self.assertEqual(len(posts), 5)
+        self.assertIsNone(cursor)
+
+    def test_top_and_most_reviewed_orders(self):
+        voters = self.users[1:]
+        for voter in voters:
+            vote_service.vote_post(self.db, voter.id, self.posts[1].id, 1)
+        vote_service.vote_post(self.db, voters[0].id, self.posts[3].id, 1)
+        vote_service.vote_post(self.db, voters[0].id, self.posts[4].id, -1)
+        self.db.add(
+            models.Review(
+                post_id=self.posts[0].id,
+                reviewer_id=self.users[1].id,
+                is_positive=True,
+                body="Good",
+            )
+        )
+        vote_service.adjust_review_count(self.db, self.posts[0].id, 1)
+        self.db.commit()
+
+        self.assertEqual(
+            self._walk(sort=self.post_service.PostSort.TOP),  # type: ignore
+            ["Post 1", "Post 3", "Post 2", "Post 0", "Post 4"],
+        )
+        self.assertEqual(
+            self._walk(sort=self.post_service.PostSort.MOST_REVIEWED)[0],  # type: ignore
+            "Post 0",
+        )
+
+    def test_search_results_are_paged_by_relevance(self):
+        titles = self._walk(query="shared")
+        self.assertEqual(sorted(titles), [f"Post {i}" for i in range(5)])
+        self.assertEqual(len(set(titles)), 5)
+
+    def test_invalid_or_mismatched_cursor_rejected(self):
+        _, newest_cursor = self._page(limit=2)
+
+        for cursor, sort in (
+            ("not-a-cursor", self.post_service.PostSort.NEWEST),  # type: ignore
+            (newest_cursor, self.post_service.PostSort.TOP),  # type: ignore
+        ):
+            with self.assertRaises(HTTPException) as ctx:
+                self._page(limit=2, cursor=cursor, sort=sort)
+            self.assertEqual(ctx.exception.status_code, 400)
+
+    def test_tampered_cursor_values_rejected(self):
+        encode = self.post_service._encode_cursor  # type: ignore
+        for params in (
+            {"query": "shared", "cursor": encode("relevance", ["a", "b"])},
+            {"query": "shared", "cursor": encode("relevance", [1.5, True])},
+            {"cursor": encode("newest", ["2024-01-01T00:00:00+00:00", "3"])},
+            {"cursor": encode("newest", ["yesterday", 3])},
+            {"sort": self.post_service.PostSort.TOP, "cursor": encode("top", [[1], "2024-01-01", 3])},  # type: ignore
+        ):
+            with self.subTest(params=params):
+                with self.assertRaises(HTTPException) as ctx:
+                    self._page(limit=2, **params)
+                self.assertEqual(ctx.exception.status_code, 400)
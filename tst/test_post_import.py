@@ -0,0 +1,193 @@
+import io
+import json
+import unittest
+
+from fastapi import HTTPException, UploadFile
+
+from src.backend.services import post_import, response_cache
+from src.backend.services.post_import import import_posts, parse_bibtex, parse_ndjson
+from src.database import models
+
+from tst.test_support import count_queries, import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+BIBTEX = """
+@comment{exported from the department list}
+@article{doe2024,
+  title = {Fast {GPU} Kernels},
+  author = {Jane Doe and John Smith},
+  abstract = "We make kernels {fast}.",
+  keywords = {gpu; systems},
+  year = 2024
+}
+
+@inproceedings{nobody,
+  author = {Anon}
+}
+"""
+
+
+def _record(i: int, **extra) -> dict:
+    return {
+        "title": f"Post {i}",
+        "authors_text": "Author",
+        "abstract": "Abstract",
+        "body": "Body",
+        "tags": [f"tag{i % 3}", "shared"],
+        "attachments": [f"/attachments/paper{i}.pdf"],
+        **extra,
+    }
+
+
+class TestParsers(unittest.TestCase):
+    def test_ndjson_reports_bad_lines_and_skips_blank_ones(self):
+        lines = ['{"title": "A"}\n', "\n", "{not json\n", "[1]\n"]
+        parsed = list(parse_ndjson(lines))
+        self.assertEqual([line for line, _ in parsed], [1, 3, 4])
+        self.assertEqual(parsed[0][1], {"title": "A"})
+        self.assertTrue(parsed[1][1].startswith("Invalid JSON"))
+
+    def test_bibtex_entries_map_to_post_fields(self):
+        parsed = list(parse_bibtex(io.StringIO(BIBTEX)))
+        self.assertEqual([line for line, _ in parsed], [3, 11])
+        article = parsed[0][1]
+        self.assertEqual(article["title"], "Fast GPU Kernels")
+        self.assertEqual(article["authors_text"], "Jane Doe, John Smith")
+        self.assertEqual(article["abstract"], "We make kernels fast.")
+        self.assertEqual(article["body"], "We make kernels fast.")
+        self.assertEqual(article["tags"], ["gpu", "systems"])
+        self.assertTrue(article["bibtex"].startswith("@article{doe2024,"))
+        self.assertIsNone(parsed[1][1]["title"])
+
+    def test_unterminated_bibtex_entry_is_an_error(self):
+        self.assertEqual(list(parse_bibtex(["@article{x,\n", "title = {T\n"])), [(1, "Unterminated BibTeX entry")])
+
+
+class TestImportPosts(unittest.TestCase):
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+        self.users = {}
+        for username in ("importer", "researcher"):
+            user = models.User(
+                username=username,
+                email=f"{username}@example.com",
+                password_hash="x",
+                password_salt="x",
+                is_email_verified=True,
+            )
+            self.db.add(user)
+            self.db.flush()
+            self.users[username] = user.id
+        self.db.add(models.Tag(name="shared"))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _import(self, records: list, batch_size: int = 10):
+        numbered = [(line, record) for line, record in enumerate(records, start=1)]
+        return import_posts(self.db, numbered, default_poster_id=self.users["importer"], batch_size=batch_size)
+
+    def test_inserts_posts_tags_and_attachments(self):
+        records = [_record(0), _record(1, poster_username="researcher"), _record(2)]
+        result = self._import(records)
+
+        self.assertEqual((result.imported, result.rejected), (3, 0))
+        self.assertEqual(result.rows, 3 + 6 + 3)
+        posts = self.db.query(models.Post).order_by(models.Post.id).all()
+        self.assertEqual([post.title for post in posts], ["Post 0", "Post 1", "Post 2"])
+        self.assertEqual(posts[1].poster_id, self.users["researcher"])
+        self.assertEqual({tag.name for tag in posts[0].tags}, {"tag0", "shared"})
+        self.assertEqual([a.file_path for a in posts[2].attachments], ["/attachments/paper2.pdf"])
+        self.assertEqual(self.db.query(models.Tag).count(), 4)
+
+    def test_statement_count_depends_on_batches_not_posts(self):
+        def statements_for(count: int) -> list[str]:
+            with count_queries(self.engine) as statements:
+                self._import([_record(i) for i in range(count)], batch_size=50)
+            # SQLite cannot batch an INSERT whose RETURNING must follow parameter order; PostgreSQL sends one.
+            return [statement for statement in statements if not statement.startswith("INSERT INTO posts")]
+
+        self.assertEqual(len(statements_for(3)), len(statements_for(40)))
+
+    def test_invalid_records_are_reported_and_skipped(self):
+        records = [
+            _record(0),
+            {"title": "No body"},
+            "Invalid JSON: Expecting value",
+            _record(3, poster_username="nobody"),
+            _record(4),
+        ]
+        result = self._import(records, batch_size=2)
+
+        self.assertEqual((result.imported, result.rejected), (2, 3))
+        self.assertEqual([line for line, _ in result.errors], [2, 3, 4])
+        self.assertIn("body", result.errors[0][1])
+        self.assertIn("nobody", result.errors[2][1])
+        self.assertEqual(self.db.query(models.Post).count(), 2)
+
+    def test_import_invalidates_cached_listings(self):
+        before = response_cache.cache.generations.current((response_cache.POSTS,))
+        self._import([_record(0)])
+        self.assertNotEqual(response_cache.cache.generations.current((response_cache.POSTS,)), before)
+
+
+class TestImportEndpoint(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.post_service = import_backend_app_with_stubbed_db().post_service
+
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _user(self, role: models.UserRole) -> models.User:
+        user = models.User(
+            username=role.value.lower(),
+            email=f"{role.value.lower()}@example.com",
+            password_hash="x",
+            password_salt="x",
+            is_email_verified=True,
+            role=role,
+        )
+        self.db.add(user)
+        self.db.commit()
+        return user
+
+    def _upload(self, content: str, filename: str) -> UploadFile:
+        return UploadFile(file=io.BytesIO(content.encode()), filename=filename)
+
+    def test_moderator_imports_ndjson_and_bibtex(self):
+        moderator = self._user(models.UserRole.MODERATOR)
+        ndjson = "\n".join(json.dumps(_record(i)) for i in range(3))
+
+        result = self.post_service.import_research_posts(
+            file=self._upload(ndjson, "posts.ndjson"), db=self.db, current_user=moderator, batch_size=2
+        )
+        self.assertEqual((result.imported, result.rejected), (3, 0))
+
+        result = self.post_service.import_research_posts(
+            file=self._upload(BIBTEX, "papers.bib"), db=self.db, current_user=moderator
+        )
+        self.assertEqual((result.imported, result.rejected), (1, 1))
+        self.assertEqual(result.errors[0].line, 11)
+
+    def test_non_moderators_cannot_import(self):
+        user = self._user(models.UserRole.USER)
+        with self.assertRaises(HTTPException) as raised:
+            self.post_service.import_research_posts(
+                file=self._upload("", "posts.ndjson"), db=self.db, current_user=user
+            )
+        self.assertEqual(raised.exception.status_code, 403)
+
+
+class TestFormatFor(unittest.TestCase):
+    def test_bib_extension_selects_bibtex(self):
+        self.assertEqual(post_import.format_for("Papers.BIB"), "bibtex")
+        self.assertEqual(post_import.format_for("posts.jsonl"), "ndjson")
+        self.assertEqual(post_import.format_for(None), "ndjson")
@@ -9,6 +9,7 @@ from unittest.mock import patch
 from fastapi import BackgroundTasks, HTTPException
 from passlib.context import CryptContext
 
+from src.backend.services import attachment_store
 from src.database import models
 
 from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory
@@ -49,46 +50,33 @@ class TestPostServiceEdgeCases(unittest.TestCase):
         self.db.commit()
 
     def _create_verified_user(self, username: str) -> models.User:
-        with patch(
-            "src.backend.services.user_service.send_verification_email",
-            autospec=True,
-            side_effect=lambda *_args, **_kwargs: None,
-        ):
-            self.user_service.register_user(  # type: ignore
-                user_in=self.user_service.UserCreate(  # type: ignore
-                    username=username,
-                    password="password123",
-                    email=f"{username}@example.com",
-                ),
-                background_tasks=BackgroundTasks(),
-                db=self.db,
-            )
+        self.user_service.register_user(  # type: ignore
+            user_in=self.user_service.UserCreate(  # type: ignore
+                username=username,
+                password="password123",
+                email=f"{username}@example.com",
+            ),
+            background_tasks=BackgroundTasks(),
+            db=self.db,
+        )
         self._mark_email_verified(username)
         return self.db.query(models.User).filter(models.User.username == username).one()
 
     def _create_post(self, current_user: models.User, payload: object):
-        return asyncio.run(
-            self.post_service.create_research_post(  # type: ignore
-                raw_body=json.dumps(payload),
-                db=self.db,
-                current_user=current_user,
-            )
+        return self.post_service.create_research_post(  # type: ignore
+            raw_body=json.dumps(payload),
+            db=self.db,
+            current_user=current_user,
         )
 
-    def test_escape_and_attachment_normalization_helpers(self):
-        self.assertEqual(self.post_service._escape(None), "")  # type: ignore
-        escaped = self.post_service._escape(r" 100%_ \ ")  # type: ignore
-        self.assertIn("\\%", escaped)
-        self.assertIn("\\_", escaped)
-        self.assertIn("\\\\", escaped)
-
-        self.assertEqual(self.post_service._normalize_attachment_value("   "), None)  # type: ignore
-        self.assertEqual(  # type: ignore
-            self.post_service._normalize_attachment_value('{"file_path": "attachments/x.pdf"}'),
+    def test_attachment_normalization_helpers(self):
+        self.assertEqual(attachment_store.normalize_reference("   "), None)
+        self.assertEqual(
+            attachment_store.normalize_reference('{"file_path": "attachments/x.pdf"}'),
             "/attachments/x.pdf",
         )
-        self.assertEqual(  # type: ignore
-            self.post_service._normalize_attachment_value("{bad}"),
+        self.assertEqual(
+            attachment_store.normalize_reference("{bad}"),
             "/attachments/{bad}",
         )
 
@@ -112,8 +100,11 @@ class TestPostServiceEdgeCases(unittest.TestCase):
                 self.content_type = content_type
                 self._content = content
 
-            async def read(self) -> bytes:
-                return self._content
+            async def read(self, size: int = -1) -> bytes:
+                if size < 0:
+                    size = len(self._content)
+                chunk, self._content = self._content[:size], self._content[size:]
+                return chunk
 
         user = self._create_verified_user("alice")
         with tempfile.TemporaryDirectory() as tmp:
@@ -135,29 +126,28 @@ class TestPostServiceEdgeCases(unittest.TestCase):
                         file=ok_file,
                     )
                 )
-                self.assertTrue(resp.file_path.startswith("/attachments/"))
-                self.assertTrue((Path(tmp) / Path(resp.file_path).name).exists())
+                self.assertTrue(resp.file_path.startswith("/attachments/ok__"))
+                self.assertEqual(
+                    attachment_store.resolve(Path(tmp), Path(resp.file_path).name).read_bytes(),
+                    b"hello",
+                )
 
     def test_create_post_payload_validation_errors(self):
         user = self._create_verified_user("alice")
 
         with self.assertRaises(HTTPException) as ctx:
-            asyncio.run(
-                self.post_service.create_research_post(  # type: ignore
-                    raw_body="",
-                    db=self.db,
-                    current_user=user,
-                )
+            self.post_service.create_research_post(  # type: ignore
+                raw_body="",
+                db=self.db,
+                current_user=user,
             )
         self.assertEqual(ctx.exception.status_code, 400)
 
         with self.assertRaises(HTTPException) as ctx:
-            asyncio.run(
-                self.post_service.create_research_post(  # type: ignore
-                    raw_body="{bad",
-                    db=self.db,
-                    current_user=user,
-                )
+            self.post_service.create_research_post(  # type: ignore
+                raw_body="{bad",
+                db=self.db,
+                current_user=user,
             )
         self.assertEqual(ctx.exception.status_code, 400)
 
@@ -167,12 +157,10 @@ class TestPostServiceEdgeCases(unittest.TestCase):
 
         nested_bad = '{"title": "x"'  # JSON string, but malformed object
         with self.assertRaises(HTTPException) as ctx:
-            asyncio.run(
-                self.post_service.create_research_post(  # type: ignore
-                    raw_body=json.dumps(nested_bad),
-                    db=self.db,
-                    current_user=user,
-                )
+            self.post_service.create_research_post(  # type: ignore
+                raw_body=json.dumps(nested_bad),
+                db=self.db,
+                current_user=user,
             )
         self.assertEqual(ctx.exception.status_code, 400)
 
@@ -1,4 +1,3 @@
-import asyncio
 import json
 import unittest
 from unittest.mock import patch
@@ -8,7 +7,7 @@ from passlib.context import CryptContext
 
 from src.database import models
 
-from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory
+from tst.test_support import count_queries, import_backend_app_with_stubbed_db, make_sqlite_session_factory
 
 
 class TestPostsApiFlow(unittest.TestCase):
@@ -46,20 +45,15 @@ class TestPostsApiFlow(unittest.TestCase):
         self.db.commit()
 
     def _create_verified_user_and_get_current_user(self, username: str):
-        with patch(
-            "src.backend.services.user_service.send_verification_email",
-            autospec=True,
-            side_effect=lambda *_args, **_kwargs: None,
-        ):
-            self.user_service.register_user( # type: ignore
-                user_in=self.user_service.UserCreate( # type: ignore
-                    username=username,
-                    password="password123",
-                    email=f"{username}@example.com",
-                ),
-                background_tasks=BackgroundTasks(),
-                db=self.db,
-            )
+        self.user_service.register_user( # type: ignore
+            user_in=self.user_service.UserCreate( # type: ignore
+                username=username,
+                password="password123",
+                email=f"{username}@example.com",
+            ),
+            background_tasks=BackgroundTasks(),
+            db=self.db,
+        )
 
         self._mark_email_verified(username)
 
@@ -71,19 +65,15 @@ class TestPostsApiFlow(unittest.TestCase):
             client_secret=None,
         )
         token = self.user_service.login(form_data=form, db=self.db).access_token # type: ignore
-        current_user = asyncio.run(
-            self.user_service.get_current_user(token=token, db=self.db) # type: ignore
-        )
+        current_user = self.user_service.get_current_user(token=token, db=self.db) # type: ignore
         return token, current_user
 
     def _create_post(self, current_user: models.User, payload: dict):
         raw_body = json.dumps(payload)
-        return asyncio.run(
-            self.post_service.create_research_post( # type: ignore
-                raw_body=raw_body,
-                db=self.db,
-                current_user=current_user,
-            )
+        return self.post_service.create_research_post( # type: ignore
+            raw_body=raw_body,
+            db=self.db,
+            current_user=current_user,
         )
 
     def test_create_post_with_tags_and_attachments(self):
@@ -123,6 +113,25 @@ class TestPostsApiFlow(unittest.TestCase):
         self.assertEqual(len(by_user), 1)
         self.assertEqual(by_user[0].id, created.id)
 
+    def test_create_post_writes_tags_with_a_constant_number_of_queries(self):
+        _token, current_user = self._create_verified_user_and_get_current_user("alice")
+        self._create_post(current_user, {"title": "Seed", "authors_text": "A", "abstract": "A", "body": "B", "tags": ["t0"]})
+
+        def queries_for(tags: list[str]) -> int:
+            payload = {"title": "Post", "authors_text": "A", "abstract": "A", "body": "B", "tags": tags}
+            with count_queries(self.engine) as statements:
+                self._create_post(current_user, payload)
+            return len(statements)
+
+        one = queries_for(["a0"])
+        many = queries_for([f"b{i}" for i in range(25)] + ["t0", "b0"])
+        self.assertEqual(one, many)
+
+        tags = self.db.query(models.Tag.name).all()
+        self.assertEqual(len(tags), 27)
+        seed_tag = self.db.query(models.Tag).filter(models.Tag.name == "t0").one()
+        self.assertEqual(len(seed_tag.posts), 2)
+
     def test_search_posts_by_tag(self):
         _, current_user = self._create_verified_user_and_get_current_user("alice")
         self._create_post(
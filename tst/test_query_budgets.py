@@ -0,0 +1,129 @@
+import inspect
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from src.backend.services import response_cache
+from src.database import models
+
+from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory, query_budget
+
+# Statements per request on a cold cache, whatever the number of posts, tags and attachments.
+BUDGETS = {
+    # ETag stamp, the post with its poster, tags, attachments.
+    "get_research_post": 4,
+    # The user, their posts with the poster, tags, attachments.
+    "get_posts_by_username": 4,
+    # Posts with the poster, tags, attachments (the current user is already loaded).
+    "get_my_research_posts": 3,
+    # ETag stamp, the page's keys, its posts with posters, tags, attachments.
+    "find_research_posts": 5,
+    # The user with counts, the posts page, tags, attachments.
+    "get_user_summary": 4,
+}
+
+
+class TestQueryBudgets(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        backend = import_backend_app_with_stubbed_db()
+        cls.post_service = backend.post_service
+        cls.user_service = backend.user_service
+
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+        self.user = models.User(
+            username="author",
+            email="author@example.com",
+            password_hash="x",
+            password_salt="x",
+            is_email_verified=True,
+        )
+        self.db.add(self.user)
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _seed(self, count: int) -> list[models.Post]:
+        tags = [models.Tag(name=name) for name in ("ml", "systems", "theory")]
+        created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        posts = [
+            models.Post(
+                poster_id=self.user.id,
+                title=f"Post {i}",
+                authors_text="Author",
+                abstract="Abstract",
+                body="Body",
+                phase=models.PostPhase.PUBLISHED,
+                # Pairs of posts share a timestamp, so ties must be broken in SQL too.
+                created_at=created_at + timedelta(minutes=i // 2),
+                tags=tags[: 1 + i % 3],
+                attachments=[
+                    models.Attachment(file_path=f"/attachments/p{i}-{n}.pdf", mime_type="application/pdf")
+                    for n in range(2)
+                ],
+            )
+            for i in range(count)
+        ]
+        self.db.add_all(posts)
+        self.db.commit()
+        return posts
+
+    def _call(self, endpoint: str, posts: list[models.Post]):
+        post_id = posts[-1].id
+        calls = {
+            "get_research_post": lambda: self.post_service.get_research_post(post_id, db=self.db),
+            "get_posts_by_username": lambda: self.post_service.get_posts_by_username("author", db=self.db),
+            "get_my_research_posts": lambda: self.post_service.get_my_research_posts(
+                db=self.db, current_user=self.user
+            ),
+            "find_research_posts": lambda: self.post_service.find_research_posts(db=self.db, limit=20),
+            "get_user_summary": lambda: self.user_service.get_user_summary("author", db=self.db),
+        }
+        response_cache.cache.clear()
+        self.db.expire_all()
+        self.db.refresh(self.user)
+        with query_budget(self.engine, BUDGETS[endpoint]):
+            return calls[endpoint]()
+
+    def test_endpoints_stay_within_their_budget(self):
+        posts = self._seed(30)
+        for endpoint in BUDGETS:
+            with self.subTest(endpoint=endpoint):
+                self._call(endpoint, posts)
+
+    def test_listings_are_ordered_in_sql_newest_first(self):
+        posts = self._seed(6)
+        expected = [post.id for post in sorted(posts, key=lambda post: (post.created_at, post.id), reverse=True)]
+        for endpoint in ("get_posts_by_username", "get_my_research_posts"):
+            with self.subTest(endpoint=endpoint):
+                listed = self._call(endpoint, posts)
+                self.assertEqual([post.id for post in listed], expected)
+                self.assertEqual(listed[-1].tags, ["ml"])
+                self.assertEqual(len(listed[-1].attachments), 2)
+
+    def test_me_on_a_principal_cache_hit(self):
+        token = self.user_service.create_token({"sub": "author"})
+        self.user_service._principal_cache.clear()
+        self.user_service.get_current_user(token=token, db=self.db)
+        hits = self.user_service.auth_cache_stats()["hits"]
+
+        with self.SessionLocal() as db:
+            # The cached principal skips the user lookup; /me then reads the profile in one SELECT.
+            with query_budget(self.engine, 1):
+                current_user = self.user_service.get_current_user(token=token, db=db)
+                me = self.user_service.read_current_user(db=db, current_user=current_user)
+                self.assertEqual((me.username, me.email), ("author", "author@example.com"))
+        self.assertEqual(self.user_service.auth_cache_stats()["hits"], hits + 1)
+        # The lazy load must not run on the event loop.
+        self.assertFalse(inspect.iscoroutinefunction(self.user_service.read_current_user))
+
+    def test_budget_failure_lists_the_statements(self):
+        with self.assertRaises(AssertionError) as raised:
+            with query_budget(self.engine, 1):
+                self.db.query(models.User).all()
+                self.db.query(models.Post).all()
+        self.assertIn("2 queries over a budget of 1", str(raised.exception))
+        self.assertIn("2. SELECT", str(raised.exception))
@@ -0,0 +1,158 @@
+import asyncio
+import ipaddress
+import unittest
+from unittest.mock import patch
+
+from fastapi import Request, Response
+
+from src.backend.services.rate_limit import DatabaseRateLimiter, GCRARateLimiter
+from src.database import models
+
+from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestGCRARateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.limiter = GCRARateLimiter(3, 60, max_clients=2, clock=self.clock)
+
+    def test_burst_up_to_limit_then_refills_evenly(self):
+        decisions = [self.limiter.hit("a") for _ in range(4)]
+        self.assertEqual([d.allowed for d in decisions], [True, True, True, False])
+        self.assertEqual([d.remaining for d in decisions[:3]], [2, 1, 0])
+        self.assertAlmostEqual(decisions[3].retry_after, 20.0)
+
+        self.clock.now += 20
+        self.assertTrue(self.limiter.hit("a").allowed)
+        self.assertFalse(self.limiter.hit("a").allowed)
+
+        self.clock.now += 60
+        self.assertEqual(self.limiter.hit("a").remaining, 2)
+
+    def test_clients_are_limited_independently(self):
+        for _ in range(3):
+            self.limiter.hit("a")
+        self.assertFalse(self.limiter.hit("a").allowed)
+        self.assertTrue(self.limiter.hit("b").allowed)
+
+    def test_idle_clients_are_evicted_and_table_is_capped(self):
+        self.limiter.hit("a")
+        self.limiter.hit("b")
+        self.limiter.hit("c")
+        self.assertLessEqual(len(self.limiter), 2)
+        self.assertEqual(self.limiter.hit("c").remaining, 1)
+
+        self.clock.now += 60
+        self.limiter.hit("d")
+        self.assertEqual(len(self.limiter), 1)
+
+
+class TestDatabaseRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.clock = _Clock()
+
+    def _limiter(self) -> DatabaseRateLimiter:
+        return DatabaseRateLimiter(3, 60, self.SessionLocal, clock=self.clock)
+
+    def test_limit_is_shared_between_workers(self):
+        worker_a, worker_b = self._limiter(), self._limiter()
+        allowed = [worker.hit("a").allowed for worker in (worker_a, worker_b, worker_a, worker_b)]
+        self.assertEqual(allowed, [True, True, True, False])
+
+        rejected = worker_a.hit("a")
+        self.assertAlmostEqual(rejected.retry_after, 20.0)
+
+        self.clock.now += 20
+        allowed = worker_b.hit("a")
+        self.assertTrue(allowed.allowed)
+        self.assertEqual(allowed.remaining, 0)
+
+    def test_idle_buckets_are_pruned(self):
+        limiter = self._limiter()
+        limiter.hit("a")
+        self.clock.now += limiter.PRUNE_INTERVAL_SECONDS + 60
+        limiter.hit("b")
+        with self.SessionLocal() as db:
+            self.assertEqual([row.key for row in db.query(models.RateLimitBucket)], [limiter.bucket_key("b")])
+
+    def test_oversized_client_keys_are_stored_as_fixed_length_digests(self):
+        limiter = self._limiter()
+        forwarded_for = ", ".join(f"10.0.{i // 256}.{i % 256}" for i in range(500))
+        self.assertTrue(limiter.hit(forwarded_for).allowed)
+        self.assertEqual(limiter.hit(forwarded_for).remaining, 1)
+        with self.SessionLocal() as db:
+            self.assertEqual([len(row.key) for row in db.query(models.RateLimitBucket)], [64])
+
+
+class TestRateLimitMiddleware(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import_backend_app_with_stubbed_db()
+        from src.backend import main
+
+        cls.main = main
+
+    def _request(self, ip: str, forwarded_for: str | None = None) -> Request:
+        headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for is not None else []
+        return Request(
+            {
+                "type": "http",
+                "method": "GET",
+                "path": "/posts",
+                "headers": headers,
+                "client": (ip, 1234),
+            }
+        )
+
+    def test_rotating_x_forwarded_for_does_not_reset_the_bucket(self):
+        async def call_next(_request):
+            return Response("ok")
+
+        async def run(peer: str, hops: list[str]):
+            statuses = []
+            for forwarded_for in hops:
+                response = await self.main.rate_limit_middleware(self._request(peer, forwarded_for), call_next)
+                statuses.append(response.status_code)
+            return statuses
+
+        proxy = ipaddress.ip_network("10.0.0.0/8")
+        with patch.object(self.main, "_rate_limiter", new=GCRARateLimiter(2, 60)):
+            # Untrusted peer: its header is ignored whatever it says.
+            spoofed = [f"203.0.113.{i}" for i in range(3)]
+            self.assertEqual(asyncio.run(run("198.51.100.7", spoofed)), [200, 200, 429])
+
+            # Behind a trusted proxy the client's own prefix still cannot move the bucket.
+            with patch.object(self.main, "TRUSTED_PROXIES", new=(proxy,)):
+                rotated = [f"203.0.113.{i}, 192.0.2.9, 10.1.2.3" for i in range(3)]
+                self.assertEqual(asyncio.run(run("10.0.0.2", rotated)), [200, 200, 429])
+                self.assertEqual(self.main._get_client_ip(self._request("10.0.0.2", rotated[0])), "192.0.2.9")
+                self.assertEqual(self.main._get_client_ip(self._request("10.0.0.2")), "10.0.0.2")
+
+    def test_rejects_with_retry_after_once_budget_is_spent(self):
+        async def call_next(_request):
+            return Response("ok")
+
+        async def run():
+            responses = []
+            for _ in range(3):
+                responses.append(await self.main.rate_limit_middleware(self._request("10.0.0.1"), call_next))
+            return responses
+
+        with patch.object(self.main, "_rate_limiter", new=GCRARateLimiter(2, 60)):
+            ok, last_ok, rejected = asyncio.run(run())
+
+        self.assertEqual(ok.status_code, 200)
+        self.assertEqual(ok.headers["X-RateLimit-Remaining"], "1")
+        self.assertEqual(last_ok.headers["X-RateLimit-Remaining"], "0")
+        self.assertEqual(rejected.status_code, 429)
+        self.assertEqual(rejected.headers["Retry-After"], "30")
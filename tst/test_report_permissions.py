@@ -1,4 +1,3 @@
-import asyncio
 import json
 import unittest
 from unittest.mock import patch
@@ -48,20 +47,15 @@ class TestReportPermissions(unittest.TestCase):
         self.db.commit()
 
     def _register_user(self, username: str) -> models.User:
-        with patch(
-            "src.backend.services.user_service.send_verification_email",
-            autospec=True,
-            side_effect=lambda *_args, **_kwargs: None,
-        ):
-            self.user_service.register_user(  # type: ignore
-                user_in=self.user_service.UserCreate(  # type: ignore
-                    username=username,
-                    password="password123",
-                    email=f"{username}@example.com",
-                ),
-                background_tasks=BackgroundTasks(),
-                db=self.db,
-            )
+        self.user_service.register_user(  # type: ignore
+            user_in=self.user_service.UserCreate(  # type: ignore
+                username=username,
+                password="password123",
+                email=f"{username}@example.com",
+            ),
+            background_tasks=BackgroundTasks(),
+            db=self.db,
+        )
 
         self._mark_email_verified(username)
         return self.db.query(models.User).filter(models.User.username == username).one()
@@ -75,12 +69,10 @@ class TestReportPermissions(unittest.TestCase):
                 "body": "Body",
             }
         )
-        created = asyncio.run(
-            self.post_service.create_research_post(  # type: ignore
-                raw_body=raw_body,
-                db=self.db,
-                current_user=current_user,
-            )
+        created = self.post_service.create_research_post(  # type: ignore
+            raw_body=raw_body,
+            db=self.db,
+            current_user=current_user,
         )
         return created.id
 
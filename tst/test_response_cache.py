@@ -0,0 +1,286 @@
+import unittest
+from unittest.mock import patch
+
+from fastapi import Response
+
+from src.backend.services import response_cache, vote_service
+from src.backend.services.response_cache import (
+    POSTS,
+    USERS,
+    DatabaseGenerations,
+    MemoryGenerations,
+    ResponseCache,
+    cache_key,
+)
+from src.database import models
+
+from tst.test_support import count_queries, import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.generations = MemoryGenerations()
+        self.cache = ResponseCache(ttl_seconds=10, max_entries=2, generations=self.generations, clock=self.clock)
+        self.calls = 0
+
+    def _compute(self):
+        self.calls += 1
+        return self.calls
+
+    def test_hit_until_ttl_or_generation_moves_on(self):
+        self.assertEqual(self.cache.serve("a", (POSTS,), self._compute), 1)
+        self.assertEqual(self.cache.serve("a", (POSTS,), self._compute), 1)
+
+        self.generations.bump_committed({USERS})
+        self.assertEqual(self.cache.serve("a", (POSTS,), self._compute), 1)
+
+        self.generations.bump_committed({POSTS})
+        self.assertEqual(self.cache.serve("a", (POSTS,), self._compute), 2)
+
+        self.clock.now += 11
+        self.assertEqual(self.cache.serve("a", (POSTS,), self._compute), 3)
+
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["stale"]), (2, 3, 2))
+        self.assertEqual(stats["hit_ratio"], 0.4)
+
+    def test_result_computed_across_a_write_is_not_served_afterwards(self):
+        def compute_while_writing():
+            self.generations.bump_committed({POSTS})
+            return self._compute()
+
+        self.cache.serve("a", (POSTS,), compute_while_writing)
+        self.assertEqual(self.cache.serve("a", (POSTS,), self._compute), 2)
+
+    def test_lru_eviction_and_errors_are_not_cached(self):
+        for key in ("a", "b", "a", "c"):
+            self.cache.serve(key, (POSTS,), self._compute)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        self.assertEqual(self.cache.serve("a", (POSTS,), self._compute), 1)
+        self.assertEqual(self.cache.serve("b", (POSTS,), self._compute), 4)
+
+        def fail():
+            raise LookupError
+
+        for _ in range(2):
+            with self.assertRaises(LookupError):
+                self.cache.serve("missing", (POSTS,), fail)
+
+    def test_headers_set_by_compute_are_replayed_on_hits(self):
+        def compute_with_header(response):
+            def compute():
+                response.headers["X-Next-Cursor"] = "abc"
+                return self._compute()
+
+            return compute
+
+        first = Response(headers={"ETag": "W/\"1\""})
+        self.cache.serve("a", (POSTS,), compute_with_header(first), first)
+        second = Response()
+        self.cache.serve("a", (POSTS,), compute_with_header(second), second)
+        self.assertEqual(second.headers["X-Next-Cursor"], "abc")
+        self.assertNotIn("ETag", second.headers)
+        self.assertEqual(self.calls, 1)
+
+    def test_disabled_cache_always_computes(self):
+        cache = ResponseCache(ttl_seconds=0, max_entries=10)
+        cache.serve("a", (POSTS,), self._compute)
+        cache.serve("a", (POSTS,), self._compute)
+        self.assertEqual(self.calls, 2)
+
+    def test_cache_key_ignores_parameter_order_and_unset_values(self):
+        self.assertEqual(cache_key("feed", sort="top", limit=5, cursor=None), cache_key("feed", limit=5, sort="top"))
+        self.assertNotEqual(cache_key("feed", limit=5), cache_key("feed", limit=6))
+
+
+class TestInvalidationHooks(unittest.TestCase):
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+        self.user = models.User(
+            username="poster",
+            email="poster@example.com",
+            password_hash="x",
+            password_salt="x",
+            is_email_verified=True,
+        )
+        self.db.add(self.user)
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _bumped_by(self, action) -> set[str]:
+        before = dict(zip((POSTS, USERS), response_cache.cache.generations.current((POSTS, USERS))))
+        action()
+        after = dict(zip((POSTS, USERS), response_cache.cache.generations.current((POSTS, USERS))))
+        return {tag for tag in (POSTS, USERS) if after[tag] != before[tag]}
+
+    def _add_post(self) -> models.Post:
+        post = models.Post(
+            poster_id=self.user.id,
+            title="Post",
+            authors_text="Author",
+            abstract="Abstract",
+            body="Body",
+            phase=models.PostPhase.PUBLISHED,
+        )
+        self.db.add(post)
+        self.db.commit()
+        return post
+
+    def test_writes_bump_only_the_tags_they_touch(self):
+        self.assertEqual(self._bumped_by(self._add_post), {POSTS})
+        post = self.db.query(models.Post).one()
+
+        def comment():
+            self.db.add(models.Comment(post_id=post.id, commenter_id=self.user.id, body="hi"))
+            self.db.commit()
+
+        self.assertEqual(self._bumped_by(comment), set())
+        self.assertEqual(self._bumped_by(lambda: vote_service.vote_post(self.db, self.user.id, post.id, 1)), {POSTS})
+
+        def rehash():
+            self.user.password_hash = "y"
+            self.db.commit()
+
+        def edit_bio():
+            self.user.bio = "Hello"
+            self.db.commit()
+
+        def promote():
+            self.user.role = models.UserRole.RESEARCHER
+            self.db.commit()
+
+        self.assertEqual(self._bumped_by(rehash), set())
+        self.assertEqual(self._bumped_by(edit_bio), {USERS})
+        self.assertEqual(self._bumped_by(promote), {USERS, POSTS})
+
+    def test_rolled_back_writes_bump_nothing(self):
+        def rolled_back():
+            self.user.bio = "Draft"
+            self.db.flush()
+            self.db.rollback()
+
+        self.assertEqual(self._bumped_by(rolled_back), set())
+
+
+class TestDatabaseGenerations(unittest.TestCase):
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.generations = DatabaseGenerations(self.SessionLocal)
+
+    def test_bumps_land_after_commit_and_never_on_rollback(self):
+        self.assertEqual(self.generations.current((POSTS, USERS)), (0, 0))
+        cache = ResponseCache(ttl_seconds=30, max_entries=10, generations=self.generations)
+        user = models.User(username="u", email="u@example.com", password_hash="x", password_salt="x")
+
+        with patch.object(response_cache, "cache", cache), self.SessionLocal() as db:
+            db.add(user)
+            db.flush()
+            # The writing transaction itself never touches the shared counter rows.
+            self.assertEqual(db.query(models.ResponseCacheGeneration).count(), 0)
+            db.commit()
+            self.assertEqual(self.generations.current((POSTS, USERS)), (0, 1))
+
+            db.add(models.Post(poster_id=user.id, title="T", authors_text="A", abstract="A", body="B"))
+            db.flush()
+            db.rollback()
+            self.assertEqual(self.generations.current((POSTS, USERS)), (0, 1))
+
+        self.generations.bump_committed({POSTS, USERS})
+        self.assertEqual(self.generations.current((POSTS, USERS)), (1, 2))
+
+
+class TestCachedEndpoints(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        imported = import_backend_app_with_stubbed_db()
+        cls.post_service = imported.post_service
+        cls.user_service = imported.user_service
+
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+        self.user = models.User(
+            username="poster",
+            email="poster@example.com",
+            password_hash="x",
+            password_salt="x",
+            is_email_verified=True,
+        )
+        self.db.add(self.user)
+        self.db.flush()
+        self.db.add_all(
+            models.Post(
+                poster_id=self.user.id,
+                title=f"Post {i}",
+                authors_text="Author",
+                abstract="Abstract",
+                body="Body",
+                phase=models.PostPhase.PUBLISHED,
+            )
+            for i in range(3)
+        )
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _queries(self, read) -> tuple[int, object]:
+        with count_queries(self.engine) as statements:
+            result = read()
+        return len(statements), result
+
+    def test_repeat_reads_skip_the_query_until_a_write(self):
+        reads = (
+            lambda: self.post_service.get_published_post_count(db=self.db),
+            lambda: self.post_service.get_posts_by_username("poster", db=self.db),
+            lambda: self.user_service.get_user_count(db=self.db),
+            lambda: self.user_service.get_latest_users(db=self.db, n=5),
+        )
+        for read in reads:
+            first_queries, first = self._queries(read)
+            self.assertGreater(first_queries, 0)
+            self.assertEqual(self._queries(read), (0, first))
+
+        post = self.db.query(models.Post).first()
+        vote_service.vote_post(self.db, self.user.id, post.id, 1)
+        queries, listed = self._queries(reads[1])
+        self.assertGreater(queries, 0)
+        self.assertEqual(sum(p.upvotes for p in listed), 1)
+
+    def test_feed_page_keeps_its_cursor_header_on_hits(self):
+        first = Response()
+        page = self.post_service.find_research_posts(db=self.db, limit=2, response=first)
+
+        second = Response()
+        queries, cached = self._queries(
+            lambda: self.post_service.find_research_posts(db=self.db, limit=2, response=second)
+        )
+        # Only the ETag stamp runs; the page itself comes from the cache.
+        self.assertEqual(queries, 1)
+        self.assertEqual([p.id for p in cached], [p.id for p in page])
+        self.assertEqual(second.headers[self.post_service.NEXT_CURSOR_HEADER], first.headers[self.post_service.NEXT_CURSOR_HEADER])
+
+    def test_database_backend_reads_generations_on_the_request_session(self):
+        def no_second_session():
+            raise AssertionError("cache lookup opened a second session")
+
+        cache = ResponseCache(ttl_seconds=30, max_entries=10, generations=DatabaseGenerations(no_second_session))
+        with patch.object(response_cache, "cache", cache):
+            count = self.post_service.get_published_post_count(db=self.db)
+            self.assertEqual(self._queries(lambda: self.post_service.get_published_post_count(db=self.db)), (1, count))
+            self.assertEqual(cache.hits, 1)
@@ -1,4 +1,3 @@
-import asyncio
 import json
 import unittest
 from unittest.mock import patch
@@ -47,20 +46,15 @@ class TestReviewPermissionsAndAutoPromotion(unittest.TestCase):
         self.db.commit()
 
     def _register_user(self, username: str) -> models.User:
-        with patch(
-            "src.backend.services.user_service.send_verification_email",
-            autospec=True,
-            side_effect=lambda *_args, **_kwargs: None,
-        ):
-            self.user_service.register_user(  # type: ignore
-                user_in=self.user_service.UserCreate(  # type: ignore
-                    username=username,
-                    password="password123",
-                    email=f"{username}@example.com",
-                ),
-                background_tasks=BackgroundTasks(),
-                db=self.db,
-            )
+        self.user_service.register_user(  # type: ignore
+            user_in=self.user_service.UserCreate(  # type: ignore
+                username=username,
+                password="password123",
+                email=f"{username}@example.com",
+            ),
+            background_tasks=BackgroundTasks(),
+            db=self.db,
+        )
 
         self._mark_email_verified(username)
         return self.db.query(models.User).filter(models.User.username == username).one()
@@ -74,28 +68,24 @@ class TestReviewPermissionsAndAutoPromotion(unittest.TestCase):
                 "body": "Body",
             }
         )
-        created = asyncio.run(
-            self.post_service.create_research_post(  # type: ignore
-                raw_body=raw_body,
-                db=self.db,
-                current_user=current_user,
-            )
+        created = self.post_service.create_research_post(  # type: ignore
+            raw_body=raw_body,
+            db=self.db,
+            current_user=current_user,
         )
         return self.db.query(models.Post).filter(models.Post.id == created.id).one()
 
     def _create_review(self, post_id: int, current_user: models.User, is_positive: bool):
-        return asyncio.run(
-            self.review_service.create_review(  # type: ignore
-                post_id=post_id,
-                review_data=self.review_service.ReviewCreate(  # type: ignore
-                    body="Review body",
-                    is_positive=is_positive,
-                    strengths="Strengths",
-                    weaknesses="Weaknesses",
-                ),
-                current_user=current_user,
-                db=self.db,
-            )
+        return self.review_service.create_review(  # type: ignore
+            post_id=post_id,
+            review_data=self.review_service.ReviewCreate(  # type: ignore
+                body="Review body",
+                is_positive=is_positive,
+                strengths="Strengths",
+                weaknesses="Weaknesses",
+            ),
+            current_user=current_user,
+            db=self.db,
         )
 
     def test_simple_user_cannot_create_review(self):
@@ -133,6 +123,8 @@ class TestReviewPermissionsAndAutoPromotion(unittest.TestCase):
         with self.assertRaises(HTTPException) as ctx:
             self._create_review(post_id=post.id, current_user=reviewer, is_positive=False)
         self.assertEqual(ctx.exception.status_code, 400)
+        self.db.refresh(post)
+        self.assertEqual(post.review_count, 1)
 
     def test_auto_promotion_after_three_positive_reviews(self):
         poster = self._register_user("alice")
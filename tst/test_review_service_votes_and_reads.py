@@ -1,4 +1,3 @@
-import asyncio
 import json
 import unittest
 from unittest.mock import patch
@@ -8,7 +7,11 @@ from passlib.context import CryptContext
 
 from src.database import models
 
-from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory
+from tst.test_support import (
+    count_queries,
+    import_backend_app_with_stubbed_db,
+    make_sqlite_session_factory,
+)
 
 
 class TestReviewServiceVotesAndReads(unittest.TestCase):
@@ -47,20 +50,15 @@ class TestReviewServiceVotesAndReads(unittest.TestCase):
         self.db.commit()
 
     def _register_user(self, username: str) -> models.User:
-        with patch(
-            "src.backend.services.user_service.send_verification_email",
-            autospec=True,
-            side_effect=lambda *_args, **_kwargs: None,
-        ):
-            self.user_service.register_user(  # type: ignore
-                user_in=self.user_service.UserCreate(  # type: ignore
-                    username=username,
-                    password="password123",
-                    email=f"{username}@example.com",
-                ),
-                background_tasks=BackgroundTasks(),
-                db=self.db,
-            )
+        self.user_service.register_user(  # type: ignore
+            user_in=self.user_service.UserCreate(  # type: ignore
+                username=username,
+                password="password123",
+                email=f"{username}@example.com",
+            ),
+            background_tasks=BackgroundTasks(),
+            db=self.db,
+        )
         self._mark_email_verified(username)
         return self.db.query(models.User).filter(models.User.username == username).one()
 
@@ -73,12 +71,10 @@ class TestReviewServiceVotesAndReads(unittest.TestCase):
                 "body": "Body",
             }
         )
-        created = asyncio.run(
-            self.post_service.create_research_post(  # type: ignore
-                raw_body=raw_body,
-                db=self.db,
-                current_user=poster,
-            )
+        created = self.post_service.create_research_post(  # type: ignore
+            raw_body=raw_body,
+            db=self.db,
+            current_user=poster,
         )
         return self.db.query(models.Post).filter(models.Post.id == created.id).one()
 
@@ -89,18 +85,16 @@ class TestReviewServiceVotesAndReads(unittest.TestCase):
         self.db.refresh(reviewer)
 
         with self.assertRaises(HTTPException) as ctx:
-            asyncio.run(
-                self.review_service.create_review(  # type: ignore
-                    post_id=999,
-                    review_data=self.review_service.ReviewCreate(  # type: ignore
-                        body="Body",
-                        is_positive=True,
-                        strengths="S",
-                        weaknesses="W",
-                    ),
-                    current_user=reviewer,
-                    db=self.db,
-                )
+            self.review_service.create_review(  # type: ignore
+                post_id=999,
+                review_data=self.review_service.ReviewCreate(  # type: ignore
+                    body="Body",
+                    is_positive=True,
+                    strengths="S",
+                    weaknesses="W",
+                ),
+                current_user=reviewer,
+                db=self.db,
             )
         self.assertEqual(ctx.exception.status_code, 404)
 
@@ -113,31 +107,81 @@ class TestReviewServiceVotesAndReads(unittest.TestCase):
 
         post = self._create_post(poster)
 
-        created = asyncio.run(
-            self.review_service.create_review(  # type: ignore
-                post_id=post.id,
-                review_data=self.review_service.ReviewCreate(  # type: ignore
-                    body="Review",
-                    is_positive=True,
-                    strengths="S",
-                    weaknesses="W",
-                ),
-                current_user=reviewer,
-                db=self.db,
-            )
+        created = self.review_service.create_review(  # type: ignore
+            post_id=post.id,
+            review_data=self.review_service.ReviewCreate(  # type: ignore
+                body="Review",
+                is_positive=True,
+                strengths="S",
+                weaknesses="W",
+            ),
+            current_user=reviewer,
+            db=self.db,
         )
 
-        listed = asyncio.run(self.review_service.get_post_reviews(post.id, db=self.db))  # type: ignore
+        listed = self.review_service.get_post_reviews(post.id, db=self.db)  # type: ignore
         self.assertEqual(len(listed), 1)
         self.assertEqual(listed[0].id, created.id)
 
-        fetched = asyncio.run(self.review_service.get_review(created.id, db=self.db))  # type: ignore
+        fetched = self.review_service.get_review(created.id, db=self.db)  # type: ignore
         self.assertEqual(fetched.id, created.id)
 
         with self.assertRaises(HTTPException) as ctx:
-            asyncio.run(self.review_service.get_review(999, db=self.db))  # type: ignore
+            self.review_service.get_review(999, db=self.db)  # type: ignore
         self.assertEqual(ctx.exception.status_code, 404)
 
+    def test_review_reads_use_constant_query_count(self):
+        poster = self._register_user("poster")
+        post_id = self._create_post(poster).id
+
+        def add_reviews(count: int) -> None:
+            start = self.db.query(models.User).count()
+            for i in range(start, start + count):
+                reviewer = models.User(
+                    username=f"reviewer{i}",
+                    email=f"reviewer{i}@example.com",
+                    password_hash="x",
+                    password_salt="x",
+                    is_email_verified=True,
+                )
+                self.db.add(reviewer)
+                self.db.flush()
+                self.db.add(
+                    models.Review(
+                        post_id=post_id,
+                        reviewer_id=reviewer.id,
+                        is_positive=True,
+                        body="Review",
+                        upvotes=i,
+                    )
+                )
+            self.db.commit()
+
+        def read_reviews() -> tuple[int, list]:
+            self.db.expire_all()
+            with count_queries(self.engine) as statements:
+                listed = self.review_service.get_post_reviews(post_id, db=self.db)  # type: ignore
+            return len(statements), listed
+
+        add_reviews(2)
+        few_queries, listed = read_reviews()
+        add_reviews(20)
+        many_queries, listed = read_reviews()
+
+        self.assertEqual(few_queries, many_queries)
+        # The revision lookup for the ETag, then the reviews themselves.
+        self.assertLessEqual(many_queries, 2)
+        self.assertEqual(len(listed), 22)
+        self.assertEqual(listed[-1].reviewer_username, "reviewer22")
+        self.assertEqual(listed[-1].upvotes, 22)
+
+        review_id = listed[0].id
+        self.db.expire_all()
+        with count_queries(self.engine) as statements:
+            fetched = self.review_service.get_review(review_id, db=self.db)  # type: ignore
+        self.assertEqual(fetched.reviewer_username, listed[0].reviewer_username)
+        self.assertEqual(len(statements), 1)
+
     def test_vote_on_review_add_update_delete(self):
         poster = self._register_user("poster")
         reviewer = self._register_user("reviewer")
@@ -147,60 +191,50 @@ class TestReviewServiceVotesAndReads(unittest.TestCase):
         self.db.refresh(reviewer)
 
         post = self._create_post(poster)
-        created = asyncio.run(
-            self.review_service.create_review(  # type: ignore
-                post_id=post.id,
-                review_data=self.review_service.ReviewCreate(  # type: ignore
-                    body="Review",
-                    is_positive=True,
-                    strengths="S",
-                    weaknesses="W",
-                ),
-                current_user=reviewer,
-                db=self.db,
-            )
+        created = self.review_service.create_review(  # type: ignore
+            post_id=post.id,
+            review_data=self.review_service.ReviewCreate(  # type: ignore
+                body="Review",
+                is_positive=True,
+                strengths="S",
+                weaknesses="W",
+            ),
+            current_user=reviewer,
+            db=self.db,
         )
 
-        out = asyncio.run(
-            self.review_service.vote_on_review(  # type: ignore
-                review_id=created.id,
-                vote=self.review_service.VoteRequest(value=1),  # type: ignore
-                db=self.db,
-                current_user=voter,
-            )
+        out = self.review_service.vote_on_review(  # type: ignore
+            review_id=created.id,
+            vote=self.review_service.VoteRequest(value=1),  # type: ignore
+            db=self.db,
+            current_user=voter,
         )
         self.assertEqual(out.upvotes, 1)
 
-        out = asyncio.run(
-            self.review_service.vote_on_review(  # type: ignore
-                review_id=created.id,
-                vote=self.review_service.VoteRequest(value=-1),  # type: ignore
-                db=self.db,
-                current_user=voter,
-            )
+        out = self.review_service.vote_on_review(  # type: ignore
+            review_id=created.id,
+            vote=self.review_service.VoteRequest(value=-1),  # type: ignore
+            db=self.db,
+            current_user=voter,
         )
         self.assertEqual(out.upvotes, 0)
         self.assertEqual(out.downvotes, 1)
 
-        out = asyncio.run(
-            self.review_service.vote_on_review(  # type: ignore
-                review_id=created.id,
-                vote=self.review_service.VoteRequest(value=-1),  # type: ignore
-                db=self.db,
-                current_user=voter,
-            )
+        out = self.review_service.vote_on_review(  # type: ignore
+            review_id=created.id,
+            vote=self.review_service.VoteRequest(value=-1),  # type: ignore
+            db=self.db,
+            current_user=voter,
         )
         self.assertEqual(out.upvotes, 0)
         self.assertEqual(out.downvotes, 0)
 
         with self.assertRaises(HTTPException) as ctx:
-            asyncio.run(
-                self.review_service.vote_on_review(  # type: ignore
-                    review_id=999,
-                    vote=self.review_service.VoteRequest(value=1),  # type: ignore
-                    db=self.db,
-                    current_user=voter,
-                )
+            self.review_service.vote_on_review(  # type: ignore
+                review_id=999,
+                vote=self.review_service.VoteRequest(value=1),  # type: ignore
+                db=self.db,
+                current_user=voter,
             )
         self.assertEqual(ctx.exception.status_code, 404)
 
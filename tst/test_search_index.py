@@ -0,0 +1,126 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from fastapi import BackgroundTasks
+from passlib.context import CryptContext
+
+from src.database import models
+
+from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+
+class TestInvertedIndex(unittest.TestCase):
+    def setUp(self):
+        from src.backend.services.search_index import InvertedIndex
+
+        self.index = InvertedIndex()
+        self.index.add(1, title="Graph neural networks", body="message passing", tags=["ml"])
+        self.index.add(2, title="Compilers", body="graph colouring for register allocation")
+        self.index.add(3, title="Databases", authors_text="Ada Lovelace", tags=["systems"])
+
+    def test_title_match_outranks_body_match(self):
+        ranked = [post_id for post_id, _ in self.index.search(["graph"])]
+        self.assertEqual(ranked, [1, 2])
+
+    def test_terms_are_prefix_matched_and_combined_with_and(self):
+        self.assertEqual([p for p, _ in self.index.search(["neur", "pass"])], [1])
+        self.assertEqual(self.index.search(["graph", "lovelace"]), [])
+        self.assertEqual([p for p, _ in self.index.search(["sys", "ada"])], [3])
+
+    def test_remove_and_reindex_drop_stale_terms(self):
+        self.index.remove(2)
+        self.assertEqual([p for p, _ in self.index.search(["graph"])], [1])
+
+        self.index.add(1, title="Renamed")
+        self.assertEqual(self.index.search(["graph"]), [])
+        self.assertEqual([p for p, _ in self.index.search(["renamed"])], [1])
+        self.assertEqual(self.index.search(["message"]), [])
+
+    def test_prefix_matches_stop_at_the_first_other_term(self):
+        self.assertEqual(self.index._matching_terms("co"), ["colouring", "compilers"])
+        self.assertEqual(self.index._matching_terms("systems"), ["systems"])
+        self.assertEqual(self.index._matching_terms("zzz"), [])
+
+    def test_limit(self):
+        self.assertEqual(len(self.index.search(["graph"], limit=1)), 1)
+
+
+class TestPostSearch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        imported = import_backend_app_with_stubbed_db()
+        cls.user_service = imported.user_service
+        cls.post_service = imported.post_service
+
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+
+        self._pwd_context_patcher = patch(
+            "src.backend.services.user_service.pwd_context",
+            new=CryptContext(
+                schemes=["argon2"],
+                deprecated="auto",
+                argon2__time_cost=1,
+                argon2__memory_cost=1024,
+                argon2__parallelism=1,
+            ),
+        )
+        self._pwd_context_patcher.start()
+
+        self.user_service.register_user(  # type: ignore
+            user_in=self.user_service.UserCreate(  # type: ignore
+                username="alice",
+                password="password123",
+                email="alice@example.com",
+            ),
+            background_tasks=BackgroundTasks(),
+            db=self.db,
+        )
+        self.user = self.db.query(models.User).filter(models.User.username == "alice").one()
+
+    def tearDown(self):
+        self.db.close()
+        self._pwd_context_patcher.stop()
+
+    def _create_post(self, **payload):
+        payload.setdefault("authors_text", "Alice")
+        payload.setdefault("abstract", "Abstract")
+        payload.setdefault("body", "Body")
+        return self.post_service.create_research_post(  # type: ignore
+            raw_body=json.dumps(payload),
+            db=self.db,
+            current_user=self.user,
+        )
+
+    def _search(self, query: str) -> list[str]:
+        results = self.post_service.find_research_posts(db=self.db, query=query)  # type: ignore
+        return [post.title for post in results]
+
+    def test_results_are_ranked_and_cover_all_fields(self):
+        self._create_post(title="Notes", body="a passing mention of transformers")
+        self._create_post(title="Transformers at scale")
+        self._create_post(title="Tagged", tags=["transformers"])
+        self._create_post(title="Unrelated", authors_text="Transformers Group")
+
+        self.assertEqual(
+            self._search("transformers"),
+            ["Transformers at scale", "Tagged", "Unrelated", "Notes"],
+        )
+
+    def test_index_follows_creates_and_deletes(self):
+        first = self._create_post(title="Quantum error correction")
+        self.assertEqual(self._search("quantum"), ["Quantum error correction"])
+
+        self._create_post(title="Quantum sensing")
+        self.assertEqual(len(self._search("quantum")), 2)
+
+        self.post_service.delete_research_post(  # type: ignore
+            post_id=first.id,
+            db=self.db,
+            current_user=self.user,
+        )
+        self.assertEqual(self._search("quantum"), ["Quantum sensing"])
+        self.assertEqual(self._search("error"), [])
@@ -4,9 +4,10 @@ import importlib
 import os
 import sys
 import types
+from contextlib import contextmanager
 from dataclasses import dataclass
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -72,6 +73,7 @@ def import_backend_app_with_stubbed_db() -> ImportedBackend:
         raise RuntimeError("Test must override dependency `get_db`.")
 
     fake_db.get_db = get_db
+    fake_db.pool_stats = lambda: {}
     sys.modules["src.database.db"] = fake_db
 
     main = importlib.import_module("src.backend.main")
@@ -90,6 +92,10 @@ def import_backend_app_with_stubbed_db() -> ImportedBackend:
 
 
 def make_sqlite_session_factory():
+    # Cached responses are keyed by route, not database; a fresh database starts with an empty cache.
+    from src.backend.services import response_cache
+
+    response_cache.cache.clear()
     engine = create_engine(
         "sqlite+pysqlite://",
         connect_args={"check_same_thread": False},
@@ -103,3 +109,35 @@ def make_sqlite_session_factory():
         future=True,
     )
     return engine, SessionLocal
+
+
+@contextmanager
+def count_queries(engine):
+    """
+    Records every SQL statement sent to `engine` inside the block; the
+    yielded list can be asserted on (e.g. `len(statements)`) afterwards.
+    """
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, _parameters, _context, _executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+@contextmanager
+def query_budget(engine, budget: int):
+    """
+    Like `count_queries`, but fails when the block sends more than `budget`
+    statements to `engine`. The failure lists every statement, so an N+1
+    shows up as the repeated query.
+    """
+    with count_queries(engine) as statements:
+        yield statements
+    if len(statements) > budget:
+        listing = "\n".join(f"  {number}. {' '.join(statement.split())}" for number, statement in enumerate(statements, 1))
+        raise AssertionError(f"{len(statements)} queries over a budget of {budget}:\n{listing}")
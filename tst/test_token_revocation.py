@@ -0,0 +1,102 @@
+import unittest
+
+from src.backend.services.token_revocation import DatabaseRevocationStore, InMemoryRevocationStore
+from src.database import models
+
+from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestInMemoryRevocationStore(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.store = InMemoryRevocationStore(clock=self.clock)
+
+    def test_entries_are_dropped_once_expired(self):
+        self.store.revoke("a", self.clock.now + 10)
+        self.store.revoke("b", self.clock.now + 20)
+        self.store.revoke("stale", self.clock.now - 1)
+        self.assertTrue(self.store.is_revoked("a"))
+        self.assertFalse(self.store.is_revoked("stale"))
+        self.assertEqual(len(self.store), 2)
+
+        self.clock.now += 15
+        self.assertFalse(self.store.is_revoked("a"))
+        self.assertTrue(self.store.is_revoked("b"))
+        self.assertEqual(len(self.store), 1)
+
+        self.clock.now += 10
+        self.assertEqual(self.store.prune(), 1)
+        self.assertEqual(len(self.store), 0)
+
+    def test_revoking_again_keeps_the_latest_expiry(self):
+        self.store.revoke("a", self.clock.now + 10)
+        self.store.revoke("a", self.clock.now + 30)
+        self.store.revoke("a", self.clock.now + 5)
+
+        self.clock.now += 20
+        self.assertTrue(self.store.is_revoked("a"))
+        self.clock.now += 20
+        self.assertFalse(self.store.is_revoked("a"))
+
+
+class TestDatabaseRevocationStore(unittest.TestCase):
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.clock = _Clock()
+
+    def _store(self) -> DatabaseRevocationStore:
+        return DatabaseRevocationStore(self.SessionLocal, clock=self.clock)
+
+    def test_revocations_are_shared_between_workers(self):
+        worker_a, worker_b = self._store(), self._store()
+        worker_a.revoke("a", self.clock.now + 10)
+        worker_a.revoke("a", self.clock.now + 20)
+
+        self.assertTrue(worker_b.is_revoked("a"))
+        self.assertFalse(worker_b.is_revoked("b"))
+
+    def test_expired_rows_are_ignored_then_pruned(self):
+        store = self._store()
+        store.revoke("a", self.clock.now + 10)
+        store.revoke("b", self.clock.now + 100)
+
+        self.clock.now += 50
+        self.assertFalse(store.is_revoked("a"))
+        self.assertEqual(store.prune(), 1)
+        with self.SessionLocal() as db:
+            self.assertEqual([row.jti for row in db.query(models.RevokedToken)], ["b"])
+
+
+class TestLogoutRevocation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        imported = import_backend_app_with_stubbed_db()
+        cls.user_service = imported.user_service
+
+    def setUp(self):
+        self.user_service._revoked_tokens.clear()  # type: ignore
+
+    def test_tokens_are_revoked_by_jti(self):
+        token = self.user_service.create_token({"sub": "alice"})  # type: ignore
+        other = self.user_service.create_token({"sub": "alice"})  # type: ignore
+
+        self.user_service.revoke_token(token)  # type: ignore
+
+        self.assertTrue(self.user_service.is_token_revoked(token))  # type: ignore
+        self.assertFalse(self.user_service.is_token_revoked(other))  # type: ignore
+        jti = self.user_service.jwt.get_unverified_claims(token)["jti"]  # type: ignore
+        self.assertTrue(self.user_service._revoked_tokens.is_revoked(jti))  # type: ignore
+
+    def test_tokens_without_jti_are_still_revocable(self):
+        token = self.user_service.create_token({"sub": "alice", "jti": ""})  # type: ignore
+        self.user_service.revoke_token(token)  # type: ignore
+        self.assertTrue(self.user_service.is_token_revoked(token))  # type: ignore
@@ -1,42 +1,20 @@
-import asyncio
+import os
+import tempfile
 import unittest
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 from fastapi import BackgroundTasks, HTTPException
 from passlib.context import CryptContext
 
+from src.backend.services import email_outbox, vote_service
 from src.database import models
 
 from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory
 
 
-class _DummySMTP:
-    def __init__(self, *_args, **_kwargs):
-        self.starttls_called = False
-        self.login_called = False
-        self.send_message_called = False
-        self.raise_on_send = False
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, *_exc):
-        return False
-
-    def starttls(self):
-        self.starttls_called = True
-
-    def login(self, *_args, **_kwargs):
-        self.login_called = True
-
-    def send_message(self, *_args, **_kwargs):
-        self.send_message_called = True
-        if self.raise_on_send:
-            raise RuntimeError("boom")
-
-
 class TestUserServiceCoverage(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -72,20 +50,15 @@ class TestUserServiceCoverage(unittest.TestCase):
         self.db.commit()
 
     def _register_user(self, username: str, *, verified: bool = True) -> models.User:
-        with patch(
-            "src.backend.services.user_service.send_verification_email",
-            autospec=True,
-            side_effect=lambda *_args, **_kwargs: None,
-        ):
-            self.user_service.register_user(  # type: ignore
-                user_in=self.user_service.UserCreate(  # type: ignore
-                    username=username,
-                    password="password123",
-                    email=f"{username}@example.com",
-                ),
-                background_tasks=BackgroundTasks(),
-                db=self.db,
-            )
+        self.user_service.register_user(  # type: ignore
+            user_in=self.user_service.UserCreate(  # type: ignore
+                username=username,
+                password="password123",
+                email=f"{username}@example.com",
+            ),
+            background_tasks=BackgroundTasks(),
+            db=self.db,
+        )
         if verified:
             self._mark_email_verified(username)
         return self.db.query(models.User).filter(models.User.username == username).one()
@@ -94,52 +67,51 @@ class TestUserServiceCoverage(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             self.user_service._extract_argon_salt("not-an-argon2-hash")  # type: ignore
 
-    def test_send_verification_email_sends_and_handles_error(self):
-        dummy = _DummySMTP()
-
-        def smtp_factory(*_args, **_kwargs):
-            return dummy
+    def _deliver_outbox(self, smtp) -> dict[str, int]:
+        def fake_get_db():
+            yield self.SessionLocal()
 
         with patch.multiple(
             self.user_service,  # type: ignore
+            get_db=fake_get_db,
+            _outbox_smtp=smtp,
             EMAIL_SENDER="sender@example.com",
-            EMAIL_PASSWORD="pw",
-            EMAIL_SMTP_SERVER="smtp.example.com",
-            EMAIL_SMTP_PORT=587,
-        ), patch("src.backend.services.user_service.smtplib.SMTP", new=smtp_factory):
-            self.user_service.send_verification_email(  # type: ignore
-                "alice@example.com",
-                "http://example.com/verify",
-            )
-            self.assertTrue(dummy.starttls_called)
-            self.assertTrue(dummy.login_called)
-            self.assertTrue(dummy.send_message_called)
+        ):
+            return self.user_service.deliver_email_outbox()  # type: ignore
 
-            dummy.raise_on_send = True
-            with self.assertRaises(RuntimeError):
-                self.user_service.send_verification_email(  # type: ignore
-                    "alice@example.com",
-                    "http://example.com/verify",
-                )
+    def test_outbox_delivers_verification_and_reset_emails(self):
+        self._register_user("alice", verified=False)
+        self.user_service.request_password_reset(  # type: ignore
+            payload=self.user_service.PasswordResetRequest(email="alice@example.com"),  # type: ignore
+            db=self.db,
+        )
+        smtp = Mock(spec=email_outbox.PooledSMTP)
+
+        self.assertEqual(self._deliver_outbox(smtp), {"sent": 2, "retrying": 0, "failed": 0})
 
-    def test_send_password_reset_email_sends(self):
-        dummy = _DummySMTP()
+        sent = [call.args[0] for call in smtp.send.call_args_list]
+        self.assertEqual(
+            [message["Subject"] for message in sent],
+            [self.user_service.VERIFICATION_EMAIL_SUBJECT, self.user_service.PASSWORD_RESET_EMAIL_SUBJECT],  # type: ignore
+        )
+        self.assertTrue(all(message["To"] == "alice@example.com" for message in sent))
+        self.assertTrue(all(message["From"] == "sender@example.com" for message in sent))
+        self.assertIn("/reset-password?token=", sent[1].get_content())
+        self.db.expire_all()
+        statuses = {email.status for email in self.db.query(models.OutboundEmail)}
+        self.assertEqual(statuses, {models.EmailStatus.SENT})
+
+    def test_outbox_keeps_emails_for_retry_when_smtp_fails(self):
+        self._register_user("alice", verified=False)
+        smtp = Mock(spec=email_outbox.PooledSMTP)
+        smtp.send.side_effect = RuntimeError("smtp down")
 
-        def smtp_factory(*_args, **_kwargs):
-            return dummy
+        self.assertEqual(self._deliver_outbox(smtp), {"sent": 0, "retrying": 1, "failed": 0})
 
-        with patch.multiple(
-            self.user_service,  # type: ignore
-            EMAIL_SENDER="sender@example.com",
-            EMAIL_PASSWORD="pw",
-            EMAIL_SMTP_SERVER="smtp.example.com",
-            EMAIL_SMTP_PORT=587,
-        ), patch("src.backend.services.user_service.smtplib.SMTP", new=smtp_factory):
-            self.user_service.send_password_reset_email(  # type: ignore
-                "alice@example.com",
-                "http://example.com/reset",
-            )
-            self.assertTrue(dummy.send_message_called)
+        self.db.expire_all()
+        queued = self.db.query(models.OutboundEmail).one()
+        self.assertEqual((queued.status, queued.attempts), (models.EmailStatus.PENDING, 1))
+        self.assertEqual(queued.last_error, "RuntimeError: smtp down")
 
     def test_request_password_reset_unknown_email(self):
         out = self.user_service.request_password_reset(  # type: ignore
@@ -148,19 +120,24 @@ class TestUserServiceCoverage(unittest.TestCase):
         )
         self.assertIn("message", out)
 
-    def test_request_password_reset_catches_send_failures(self):
+    def test_request_password_reset_queues_email_without_sending(self):
         self._register_user("alice")
 
-        with patch(
-            "src.backend.services.user_service.send_password_reset_email",
-            autospec=True,
-            side_effect=RuntimeError("smtp down"),
-        ):
+        smtp = Mock(spec=email_outbox.PooledSMTP)
+        with patch.object(self.user_service, "_outbox_smtp", new=smtp):  # type: ignore
             out = self.user_service.request_password_reset(  # type: ignore
                 payload=self.user_service.PasswordResetRequest(email="alice@example.com"),  # type: ignore
                 db=self.db,
             )
         self.assertIn("message", out)
+        smtp.send.assert_not_called()
+        queued = (
+            self.db.query(models.OutboundEmail)
+            .filter(models.OutboundEmail.subject == self.user_service.PASSWORD_RESET_EMAIL_SUBJECT)  # type: ignore
+            .one()
+        )
+        self.assertEqual(queued.recipient, "alice@example.com")
+        self.assertIn("/reset-password?token=", queued.body)
 
     def test_reset_password_validation_and_success(self):
         self._register_user("alice")
@@ -297,6 +274,40 @@ class TestUserServiceCoverage(unittest.TestCase):
         finally:
             job_db.close()
 
+    def test_attachment_gc_job_sweeps_and_accumulates_stats(self):
+        captured = {}
+
+        class DummyScheduler:
+            running = False
+
+            def add_job(self, func, **kwargs):
+                captured["job"] = func
+                captured["kwargs"] = kwargs
+
+            def start(self):
+                captured["started"] = True
+
+        def fake_get_db():
+            yield self.SessionLocal()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            orphan = Path(tmp) / "old__0123456789abcdef0123456789abcdef.pdf"
+            orphan.write_bytes(b"abc")
+            os.utime(orphan, (0, 0))
+
+            with patch.object(self.user_service, "scheduler", new=DummyScheduler()):  # type: ignore
+                self.user_service.start_attachment_gc()  # type: ignore
+            self.assertEqual(captured["kwargs"]["id"], "sweep_orphaned_attachments")
+
+            before = self.user_service.attachment_gc_stats()["reclaimed_bytes"]  # type: ignore
+            with patch.object(self.user_service, "get_db", new=fake_get_db), \
+                    patch.object(self.user_service, "ATTACHMENTS_DIR", new=Path(tmp)):  # type: ignore
+                outcome = captured["job"]()
+
+            self.assertEqual(outcome["deleted"], 1)
+            self.assertFalse(orphan.exists())
+            self.assertEqual(self.user_service.attachment_gc_stats()["reclaimed_bytes"], before + 3)  # type: ignore
+
     def test_login_error_branches(self):
         self._register_user("alice")
 
@@ -327,17 +338,17 @@ class TestUserServiceCoverage(unittest.TestCase):
         self._register_user("a2")
         self._register_user("a3")
 
-        count = asyncio.run(self.user_service.get_user_count(db=self.db))  # type: ignore
+        count = self.user_service.get_user_count(db=self.db)  # type: ignore
         self.assertEqual(count, 3)
 
-        latest = asyncio.run(self.user_service.get_latest_users(db=self.db, n=2))  # type: ignore
+        latest = self.user_service.get_latest_users(db=self.db, n=2)  # type: ignore
         self.assertEqual(len(latest), 2)
 
-        profile = asyncio.run(self.user_service.get_user_profile("a1", db=self.db))  # type: ignore
+        profile = self.user_service.get_user_profile("a1", db=self.db)  # type: ignore
         self.assertEqual(profile.username, "a1")
 
         with self.assertRaises(HTTPException) as ctx:
-            asyncio.run(self.user_service.get_user_profile("missing", db=self.db))  # type: ignore
+            self.user_service.get_user_profile("missing", db=self.db)  # type: ignore
         self.assertEqual(ctx.exception.status_code, 404)
 
     def test_user_post_count_and_score(self):
@@ -368,33 +379,27 @@ class TestUserServiceCoverage(unittest.TestCase):
         self.db.add(models.CommentVote(user_id=voter.id, comment_id=comment.id, value=-1))
         self.db.commit()
 
-        post_count = asyncio.run(
-            self.user_service.get_user_post_count("poster", db=self.db)  # type: ignore
-        )
+        post_count = self.user_service.get_user_post_count("poster", db=self.db)  # type: ignore
         self.assertEqual(post_count, 1)
 
-        score = asyncio.run(self.user_service.get_user_score("poster", db=self.db))  # type: ignore
+        score = self.user_service.get_user_score("poster", db=self.db)  # type: ignore
         self.assertEqual(score, 0)
 
     def test_update_profile_and_recent_comments(self):
         user = self._register_user("alice")
 
         with self.assertRaises(HTTPException) as ctx:
-            asyncio.run(
-                self.user_service.update_current_user_profile(  # type: ignore
-                    payload=self.user_service.ProfileUpdate(),  # type: ignore
-                    db=self.db,
-                    current_user=user,
-                )
-            )
-        self.assertEqual(ctx.exception.status_code, 400)
-
-        updated = asyncio.run(
             self.user_service.update_current_user_profile(  # type: ignore
-                payload=self.user_service.ProfileUpdate(display_name="Alice"),  # type: ignore
+                payload=self.user_service.ProfileUpdate(),  # type: ignore
                 db=self.db,
                 current_user=user,
             )
+        self.assertEqual(ctx.exception.status_code, 400)
+
+        updated = self.user_service.update_current_user_profile(  # type: ignore
+            payload=self.user_service.ProfileUpdate(display_name="Alice"),  # type: ignore
+            db=self.db,
+            current_user=user,
         )
         self.assertEqual(updated.display_name, "Alice")
 
@@ -415,16 +420,13 @@ class TestUserServiceCoverage(unittest.TestCase):
         self.db.commit()
         self.db.refresh(comment)
 
-        self.db.add(models.CommentVote(user_id=user.id, comment_id=comment.id, value=1))
-        self.db.add(models.CommentVote(user_id=self._register_user("bob").id, comment_id=comment.id, value=-1))
-        self.db.commit()
+        vote_service.vote_comment(self.db, user.id, comment.id, 1)
+        vote_service.vote_comment(self.db, self._register_user("bob").id, comment.id, -1)
 
-        items = asyncio.run(
-            self.user_service.get_my_recent_comments(  # type: ignore
-                db=self.db,
-                current_user=user,
-                n=10,
-            )
+        items = self.user_service.get_my_recent_comments(  # type: ignore
+            db=self.db,
+            current_user=user,
+            n=10,
         )
         self.assertEqual(len(items), 1)
         self.assertEqual(items[0].post_title, "Post title")
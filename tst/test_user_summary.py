@@ -0,0 +1,107 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+
+from src.backend.services import vote_service
+from src.database import models
+
+from tst.test_support import count_queries, import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+
+class TestUserSummary(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.user_service = import_backend_app_with_stubbed_db().user_service
+
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+        self.author, self.reader = (
+            models.User(
+                username=name,
+                email=f"{name}@example.com",
+                password_hash="x",
+                password_salt="x",
+                is_email_verified=True,
+            )
+            for name in ("author", "reader")
+        )
+        self.db.add_all([self.author, self.reader])
+        self.db.commit()
+        self._clock = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def tearDown(self):
+        self.db.close()
+
+    def _posts(self, count: int) -> list[models.Post]:
+        tag = self.db.query(models.Tag).filter_by(name="ml").first() or models.Tag(name="ml")
+        posts = []
+        for i in range(count):
+            self._clock += timedelta(minutes=1)
+            post = models.Post(
+                poster_id=self.author.id,
+                title=f"Post {i}",
+                authors_text="Author",
+                abstract="Abstract",
+                body="Body",
+                phase=models.PostPhase.PUBLISHED,
+                created_at=self._clock,
+                tags=[tag],
+                attachments=[models.Attachment(file_path=f"/attachments/p{i}.pdf", mime_type="application/pdf")],
+            )
+            posts.append(post)
+        self.db.add_all(posts)
+        self.db.commit()
+        return posts
+
+    def _summary(self):
+        return self.user_service.get_user_summary("author", db=self.db)
+
+    def test_profile_counts_score_and_latest_posts(self):
+        posts = self._posts(12)
+        comment = models.Comment(post_id=posts[0].id, commenter_id=self.author.id, body="Hi")
+        self.db.add(comment)
+        self.db.add(models.Review(post_id=posts[0].id, reviewer_id=self.reader.id, is_positive=True, body="Good"))
+        self.db.commit()
+        vote_service.vote_post(self.db, self.reader.id, posts[0].id, 1)
+        vote_service.vote_comment(self.db, self.reader.id, comment.id, 1)
+
+        summary = self._summary()
+
+        self.assertEqual(summary.profile.username, "author")
+        self.assertIsNone(summary.profile.email)
+        self.assertEqual((summary.post_count, summary.comment_count, summary.review_count), (12, 1, 0))
+        self.assertEqual(summary.score, 2)
+        self.assertEqual(len(summary.posts), self.user_service.SUMMARY_POST_LIMIT)
+        self.assertEqual(summary.posts[0].title, "Post 11")
+        self.assertEqual((summary.posts[0].tags, summary.posts[0].poster_username), (["ml"], "author"))
+
+    def test_fixed_query_count_and_cached_as_a_unit(self):
+        def queries() -> int:
+            self.db.expire_all()
+            with count_queries(self.engine) as statements:
+                self._summary()
+            return len(statements)
+
+        self._posts(2)
+        self.assertEqual(queries(), 4)
+        self.assertEqual(queries(), 0)
+        self._posts(8)
+        self.assertEqual(queries(), 4)
+
+    def test_votes_on_comments_refresh_the_cached_score(self):
+        post = self._posts(1)[0]
+        comment = models.Comment(post_id=post.id, commenter_id=self.author.id, body="Hi")
+        self.db.add(comment)
+        self.db.commit()
+        self.assertEqual(self._summary().score, 0)
+
+        vote_service.vote_comment(self.db, self.reader.id, comment.id, -1)
+        self.assertEqual(self._summary().score, -1)
+
+    def test_unknown_user_is_404(self):
+        with self.assertRaises(HTTPException) as raised:
+            self.user_service.get_user_summary("nobody", db=self.db)
+        self.assertEqual(raised.exception.status_code, 404)
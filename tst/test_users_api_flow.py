@@ -1,7 +1,6 @@
 import unittest
 from unittest.mock import patch
 
-import asyncio
 from fastapi import BackgroundTasks, HTTPException
 from passlib.context import CryptContext
 
@@ -45,24 +44,25 @@ class TestUsersApiFlow(unittest.TestCase):
         self.db.commit()
 
     def test_register_then_login_then_me(self):
-        with patch(
-            "src.backend.services.user_service.send_verification_email",
-            autospec=True,
-            side_effect=lambda *_args, **_kwargs: None,
-        ) as send_verification_email:
-            bg = BackgroundTasks()
-            created = self.user_service.register_user(
-                user_in=self.user_service.UserCreate(
-                    username="alice",
-                    password="password123",
-                    email="alice@example.com",
-                ),
-                background_tasks=bg,
-                db=self.db,
-            )
+        bg = BackgroundTasks()
+        created = self.user_service.register_user(
+            user_in=self.user_service.UserCreate(
+                username="alice",
+                password="password123",
+                email="alice@example.com",
+            ),
+            background_tasks=bg,
+            db=self.db,
+        )
 
         self.assertEqual(len(bg.tasks), 0)
-        send_verification_email.assert_called_once()
+        queued = self.db.query(models.OutboundEmail).one()
+        self.assertEqual(queued.recipient, "alice@example.com")
+        self.assertEqual(queued.status, models.EmailStatus.PENDING)
+        queued = self.db.query(models.OutboundEmail).one()
+        self.assertEqual(queued.recipient, "alice@example.com")
+        self.assertEqual(queued.status, models.EmailStatus.PENDING)
+        self.assertIn("/verify-email?token=", queued.body)
         self.assertEqual(created.username, "alice")
         self._mark_email_verified("alice")
 
@@ -75,31 +75,24 @@ class TestUsersApiFlow(unittest.TestCase):
         )
         token = self.user_service.login(form_data=form, db=self.db).access_token
 
-        current_user = asyncio.run(
-            self.user_service.get_current_user(token=token, db=self.db)
-        )
+        current_user = self.user_service.get_current_user(token=token, db=self.db)
         self.assertEqual(current_user.username, "alice")
 
-        asyncio.run(self.user_service.logout(token=token, current_user=current_user))
+        self.user_service.logout(token=token, current_user=current_user)
         with self.assertRaises(HTTPException) as ctx:
-            asyncio.run(self.user_service.get_current_user(token=token, db=self.db))
+            self.user_service.get_current_user(token=token, db=self.db)
         self.assertEqual(ctx.exception.status_code, 401)
 
     def test_login_requires_verified_email(self):
-        with patch(
-            "src.backend.services.user_service.send_verification_email",
-            autospec=True,
-            side_effect=lambda *_args, **_kwargs: None,
-        ):
-            self.user_service.register_user(
-                user_in=self.user_service.UserCreate(
-                    username="bob",
-                    password="password123",
-                    email="bob@example.com",
-                ),
-                background_tasks=BackgroundTasks(),
-                db=self.db,
-            )
+        self.user_service.register_user(
+            user_in=self.user_service.UserCreate(
+                username="bob",
+                password="password123",
+                email="bob@example.com",
+            ),
+            background_tasks=BackgroundTasks(),
+            db=self.db,
+        )
 
         form = self.user_service.OAuth2PasswordRequestForm(
             username="bob",
@@ -0,0 +1,183 @@
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import update
+
+from src.backend.services import revisions, vote_service
+from src.database import models
+
+from tst.test_support import import_backend_app_with_stubbed_db, make_sqlite_session_factory
+
+
+class TestVoteCounters(unittest.TestCase):
+    def setUp(self):
+        self.engine, self.SessionLocal = make_sqlite_session_factory()
+        models.Base.metadata.create_all(bind=self.engine)
+        self.db = self.SessionLocal()
+
+        self.users = [
+            models.User(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password_hash="x",
+                password_salt="x",
+                is_email_verified=True,
+            )
+            for i in range(3)
+        ]
+        self.db.add_all(self.users)
+        self.db.commit()
+
+        self.post = models.Post(
+            poster_id=self.users[0].id,
+            title="Post",
+            authors_text="Author",
+            abstract="Abstract",
+            body="Body",
+            phase=models.PostPhase.PUBLISHED,
+        )
+        self.db.add(self.post)
+        self.db.commit()
+
+        self.comment = models.Comment(post_id=self.post.id, commenter_id=self.users[0].id, body="Hi")
+        self.review = models.Review(
+            post_id=self.post.id,
+            reviewer_id=self.users[1].id,
+            is_positive=True,
+            body="Good",
+        )
+        self.db.add_all([self.comment, self.review])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _counters(self, row) -> tuple[int, int]:
+        self.db.refresh(row)
+        return row.upvotes, row.downvotes
+
+    def test_post_counters_follow_cast_switch_repeat_and_remove(self):
+        vote_service.vote_post(self.db, self.users[1].id, self.post.id, 1)
+        vote_service.vote_post(self.db, self.users[2].id, self.post.id, 1)
+        self.assertEqual(self._counters(self.post), (2, 0))
+
+        vote_service.vote_post(self.db, self.users[2].id, self.post.id, -1)
+        vote_service.vote_post(self.db, self.users[2].id, self.post.id, -1)
+        self.assertEqual(self._counters(self.post), (1, 1))
+
+        vote_service.remove_post_vote(self.db, self.users[1].id, self.post.id)
+        vote_service.remove_post_vote(self.db, self.users[1].id, self.post.id)
+        self.assertEqual(self._counters(self.post), (0, 1))
+        self.assertEqual(
+            vote_service.get_post_votes(self.db, self.post.id),
+            {"upvotes": 0, "downvotes": 1},
+        )
+
+    def test_comment_counters(self):
+        vote_service.vote_comment(self.db, self.users[1].id, self.comment.id, -1)
+        vote_service.vote_comment(self.db, self.users[1].id, self.comment.id, 1)
+        self.assertEqual(self._counters(self.comment), (1, 0))
+
+        vote_service.remove_comment_vote(self.db, self.users[1].id, self.comment.id)
+        self.assertEqual(self._counters(self.comment), (0, 0))
+
+    def test_repeating_a_review_vote_withdraws_it(self):
+        vote_service.vote_review(self.db, self.users[0].id, self.review.id, 1)
+        vote_service.vote_review(self.db, self.users[2].id, self.review.id, -1)
+        self.assertEqual(self._counters(self.review), (1, 1))
+
+        self.assertIsNone(vote_service.vote_review(self.db, self.users[0].id, self.review.id, 1))
+        self.assertEqual(self._counters(self.review), (0, 1))
+        self.assertEqual(self.db.query(models.ReviewVote).count(), 1)
+
+    def test_losing_a_concurrent_first_vote_switches_the_winner_instead(self):
+        with self.SessionLocal() as other:
+            vote_service.vote_post(other, self.users[1].id, self.post.id, 1)
+
+        # This request looked for the voter's row before the other one committed it.
+        lookup = vote_service._existing_vote
+        reads = []
+
+        def stale_first_read(*args, **kwargs):
+            reads.append(args)
+            return None if len(reads) == 1 else lookup(*args, **kwargs)
+
+        with patch.object(vote_service, "_existing_vote", side_effect=stale_first_read):
+            vote = vote_service.vote_post(self.db, self.users[1].id, self.post.id, -1)
+
+        self.assertEqual(len(reads), 2)
+
+        self.assertEqual(vote.value, -1)
+        self.assertEqual(self.db.query(models.PostVote).count(), 1)
+        self.assertEqual(self._counters(self.post), (0, 1))
+        self.db.refresh(self.users[0])
+        self.assertEqual(self.users[0].reputation, -1)
+
+    def test_reconcile_repairs_only_drifted_rows(self):
+        vote_service.vote_post(self.db, self.users[1].id, self.post.id, 1)
+        self.db.add(models.CommentVote(user_id=self.users[1].id, comment_id=self.comment.id, value=-1))
+        self.db.add(models.ReviewVote(user_id=self.users[2].id, review_id=self.review.id, value=1))
+        self.db.commit()
+
+        repaired = vote_service.reconcile_vote_counters(self.db)
+
+        # The review in setUp was inserted without adjust_review_count, so the post's review_count drifted.
+        self.assertEqual(repaired, {"posts": 1, "comments": 1, "reviews": 1})
+        self.assertEqual(self._counters(self.post), (1, 0))
+        self.assertEqual(self.post.review_count, 1)
+        self.assertEqual(self._counters(self.comment), (0, 1))
+        self.assertEqual(self._counters(self.review), (1, 0))
+        self.assertEqual(
+            vote_service.reconcile_vote_counters(self.db),
+            {"posts": 0, "comments": 0, "reviews": 0},
+        )
+
+    def test_reconcile_refreshes_cached_pages_and_post_etags(self):
+        post_service = import_backend_app_with_stubbed_db().post_service
+
+        def listed_upvotes() -> int:
+            return post_service.get_posts_by_username("user0", db=self.db)[0].upvotes
+
+        # Drift the counter the way a lost update would: behind the ORM hooks' back.
+        self.db.execute(update(models.Post).values(upvotes=5))
+        self.db.commit()
+        self.assertEqual(listed_upvotes(), 5)
+        revision = revisions.post_stamp(self.db, self.post.id)[0]
+
+        vote_service.reconcile_vote_counters(self.db)
+
+        self.assertEqual(listed_upvotes(), 0)
+        self.assertGreater(revisions.post_stamp(self.db, self.post.id)[0], revision)
+
+    def _reputations(self) -> list[int]:
+        self.db.expire_all()
+        return [user.reputation for user in self.users]
+
+    def test_votes_keep_author_reputation_current(self):
+        vote_service.vote_post(self.db, self.users[1].id, self.post.id, 1)
+        vote_service.vote_post(self.db, self.users[2].id, self.post.id, 1)
+        vote_service.vote_comment(self.db, self.users[1].id, self.comment.id, -1)
+        vote_service.vote_review(self.db, self.users[0].id, self.review.id, 1)
+        self.assertEqual(self._reputations(), [1, 1, 0])
+
+        vote_service.vote_post(self.db, self.users[2].id, self.post.id, -1)
+        vote_service.remove_comment_vote(self.db, self.users[1].id, self.comment.id)
+        vote_service.vote_review(self.db, self.users[0].id, self.review.id, 1)
+        self.assertEqual(self._reputations(), [0, 0, 0])
+        self.assertEqual(
+            [vote_service.aggregate_reputation(self.db, user.id) for user in self.users],
+            self._reputations(),
+        )
+
+    def test_retracting_deleted_content_and_recompute(self):
+        vote_service.vote_post(self.db, self.users[1].id, self.post.id, 1)
+        vote_service.vote_review(self.db, self.users[0].id, self.review.id, -1)
+        vote_service.retract_reputation(self.db, models.Review, models.Review.post_id == self.post.id)
+        self.db.commit()
+        self.assertEqual(self._reputations(), [1, 0, 0])
+
+        self.db.query(models.User).update({"reputation": 7})
+        self.db.commit()
+        self.assertEqual(vote_service.recompute_reputation(self.db), 3)
+        self.assertEqual(self._reputations(), [1, -1, 0])
+        self.assertEqual(vote_service.recompute_reputation(self.db), 0)